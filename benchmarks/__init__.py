@@ -0,0 +1,3 @@
+"""
+Benchmarks for the MCP JIRA tools, run against a local fake JIRA server.
+"""
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Benchmark every tool against a local fake JIRA server.
+
+For each tool the runner records wall time, the number of HTTP requests the
+tool made, request/response bytes and peak Python memory, and compares the
+request count with the tool's declared round-trip budget. The run fails if
+any tool goes over its budget.
+
+Usage:
+    python -m benchmarks.bench_tools --latency 0.05 --iterations 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from benchmarks.fake_jira import FakeJira, FakeJiraServer
+from src.cache import clear_all as clear_caches
+from src.http_hooks import RateLimiter
+from src.main import close_clients
+
+
+class Scenario:
+    """
+    A single benchmarked tool call.
+
+    Args:
+        name: Name of the scenario (usually the tool name)
+        tool: Dotted path of the tool function (e.g. "src.tools.issues.search_issues")
+        budget: Maximum number of HTTP round trips one call may make
+        kwargs: Callable building the tool arguments from the fake JIRA state;
+            called before every iteration, outside the measured section
+        setup: Optional callable run once after the caches are dropped, outside the
+            measured section, e.g. to measure the path with a warm catalog
+    """
+
+    def __init__(self, name: str, tool: str, budget: int, kwargs: Callable[[FakeJira], Dict[str, Any]],
+                 setup: Optional[Callable[[FakeJira], None]] = None):
+        self.name = name
+        self.tool = tool
+        self.budget = budget
+        self.kwargs = kwargs
+        self.setup = setup
+
+    def load(self) -> Callable[..., Any]:
+        module_name, function_name = self.tool.rsplit(".", 1)
+        module = __import__(module_name, fromlist=[function_name])
+        return getattr(module, function_name)
+
+
+def _first_issue(state: FakeJira, status: Optional[str] = None) -> str:
+    with state.lock:
+        return next(key for key, issue in state.issues.items() if status is None or issue["status"] == status)
+
+
+def _new_issue(state: FakeJira) -> str:
+    return state.add_issue("DEMO", summary="Scratch issue for benchmarks")["key"]
+
+
+def _new_issues(state: FakeJira, count: int) -> List[str]:
+    return [_new_issue(state) for _ in range(count)]
+
+
+def _warm_catalog(state: FakeJira) -> None:
+    """Load the shared client and DEMO's create metadata, as any earlier create in the process would have."""
+    from src.catalog import get_create_meta
+    from src.main import initialize_jira
+
+    get_create_meta(initialize_jira(), "DEMO")
+
+
+# Round-trip budgets are for a cold start and include the serverInfo request
+# made when the shared client is created. search_issues also loads the field list to
+# translate field names; it is cached afterwards, as are workflow transitions.
+# create_issue is measured with the project's create metadata already cached, so its
+# budget covers only the create and the reload of the new issue. update_issue pays a PUT plus a reload GET for
+# every changed field.
+SCENARIOS: List[Scenario] = [
+    Scenario("search_issues", "src.tools.issues.search_issues", 3,
+             lambda state: {"jql": "project = DEMO AND status != Done", "max_results": 10}),
+    # One search per query, run concurrently
+    Scenario("multi_search", "src.tools.issues.multi_search", 5,
+             lambda state: {"queries": [
+                 {"name": "open", "jql": "project = DEMO AND status = \"To Do\""},
+                 {"name": "bugs", "jql": "project = DEMO AND type = Bug", "fields": "summary,priority"},
+                 {"name": "done", "jql": "project = DEMO AND status = Done", "max_results": 5},
+             ]}),
+    Scenario("list_projects", "src.tools.projects.list_projects", 2,
+             lambda state: {"limit": 10}),
+    Scenario("list_projects_stats", "src.tools.projects.list_projects", 6,
+             lambda state: {"limit": 10, "include_stats": True}),
+    Scenario("create_issue", "src.tools.issues.create_issue", 3,
+             lambda state: {"project_key": "DEMO", "summary": "Benchmark issue", "issue_type": "Task", "priority": "High"},
+             setup=_warm_catalog),
+    Scenario("update_issue", "src.tools.issues.update_issue", 7,
+             lambda state: {"issue_key": _first_issue(state), "summary": "Renamed by benchmark", "priority": "Low"}),
+    Scenario("delete_issue", "src.tools.issues.delete_issue", 3,
+             lambda state: {"issue_key": _new_issue(state), "confirm": True}),
+    Scenario("add_comment", "src.tools.issues.add_comment", 3,
+             lambda state: {"issue_key": _first_issue(state), "comment": "Benchmark comment"}),
+    Scenario("transition_issue", "src.tools.issues.transition_issue", 4,
+             lambda state: {"issue_key": _new_issue(state), "status": "In Progress"}),
+    # Cold, the workflow is discovered from a search plus one transitions request
+    # per status; warm, only the three transitions are posted.
+    Scenario("transition_multi_hop", "src.tools.issues.transition_issue", 12,
+             lambda state: {"issue_key": _new_issue(state), "status": "Done", "multi_hop": True}),
+    # One search and one transitions request for the whole batch, then a POST per issue
+    Scenario("bulk_transition", "src.tools.bulk.bulk_transition", 24,
+             lambda state: {"issue_keys": _new_issues(state, 20), "status": "In Progress"}),
+    # On the fake (Cloud) server a label change is a single bulk edit task plus one status poll
+    Scenario("bulk_update_issues", "src.tools.bulk.bulk_update_issues", 5,
+             lambda state: {"issue_keys": _new_issues(state, 20), "add_labels": ["benchmark"]}),
+    Scenario("get_issue_details", "src.tools.issues.get_issue_details", 3,
+             lambda state: {"issue_key": _first_issue(state), "include_comments": True}),
+    # The first poll pages through the matching keys; later polls make one search for
+    # recent updates and one for the count
+    Scenario("poll_changes", "src.tools.polling.poll_changes", 4,
+             lambda state: {"name": "bench", "jql": "project = DEMO AND status != Done"}),
+    # Warm, one changelog page starting at the last cached entry
+    Scenario("get_issue_changelog", "src.tools.history.get_issue_changelog", 3,
+             lambda state: {"issue_key": _first_issue(state)}),
+    # One search for the issues' updated times, then a changelog request per stale issue
+    Scenario("get_issue_changelogs", "src.tools.history.get_issue_changelogs", 8,
+             lambda state: {"issue_keys": [f"DEMO-{n}" for n in range(1, 6)]}),
+    Scenario("get_comments", "src.tools.issues.get_comments", 2,
+             lambda state: {"issue_key": _first_issue(state), "max_results": 20}),
+    # Cold, the search, the status list and one changelog request per issue; warm, only
+    # the search, since no issue was updated
+    Scenario("flow_metrics", "src.tools.flow.flow_metrics", 24,
+             lambda state: {"jql": "project = DEMO", "max_issues": 20}),
+    # The worklogs updated and deleted since the stored watermark
+    Scenario("worklog_report", "src.tools.worklogs.worklog_report", 3,
+             lambda state: {"start_date": "2024-01-01"}),
+    # One search for the issue, then one per level for its children and linked issues
+    Scenario("get_issue_graph", "src.tools.graph.get_issue_graph", 5,
+             lambda state: {"issue_key": _first_issue(state), "depth": 2}),
+    Scenario("search_users", "src.tools.issues.search_users", 2,
+             lambda state: {"query": "user"}),
+    # Served from the process's own registry and journal, without asking JIRA
+    Scenario("server_stats", "src.tools.stats.server_stats", 0,
+             lambda state: {}),
+    Scenario("write_status", "src.tools.stats.write_status", 0,
+             lambda state: {}),
+]
+
+
+def _jira_environment(server: FakeJiraServer) -> Dict[str, str]:
+    return {
+        "JIRA_SERVER": server.url,
+        "JIRA_EMAIL": "bench@example.com",
+        "JIRA_API_TOKEN": "bench-token",
+    }
+
+
+def run_scenario(server: FakeJiraServer, scenario: Scenario, iterations: int = 3) -> Dict[str, Any]:
+    """
+    Run one scenario and return its measurements.
+
+    Wall time is measured without tracemalloc; one extra, untimed call is made
+    under tracemalloc to measure peak memory. Caches and the shared JIRA client
+    are dropped first, so the first iteration pays for loading them and later
+    ones show the warm path.
+    """
+    tool = scenario.load()
+    clear_caches()
+    close_clients()
+    if scenario.setup is not None:
+        scenario.setup(server.state)
+    timings, calls, bytes_in, bytes_out = [], [], [], []
+    endpoints: Dict[str, Dict[str, int]] = {}
+    errors = 0
+
+    for _ in range(iterations):
+        kwargs = scenario.kwargs(server.state)
+        server.reset_stats()
+        started = time.perf_counter()
+        try:
+            tool(**kwargs)
+        except Exception:
+            errors += 1
+        timings.append(time.perf_counter() - started)
+        endpoints = server.stats()
+        stats = endpoints.values()
+        calls.append(sum(entry["calls"] for entry in stats))
+        bytes_in.append(sum(entry["bytes_in"] for entry in stats))
+        bytes_out.append(sum(entry["bytes_out"] for entry in stats))
+
+    kwargs = scenario.kwargs(server.state)
+    tracemalloc.start()
+    try:
+        tool(**kwargs)
+    except Exception:
+        pass
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    max_calls = max(calls) if calls else 0
+    return {
+        "name": scenario.name,
+        "iterations": iterations,
+        "errors": errors,
+        "wall_time_ms": {
+            "median": round(statistics.median(timings) * 1000, 2),
+            "max": round(max(timings) * 1000, 2),
+        },
+        "http_calls": max_calls,
+        "http_calls_warm": calls[-1] if calls else 0,
+        "budget": scenario.budget,
+        "over_budget": max_calls > scenario.budget,
+        "bytes_sent": max(bytes_in) if bytes_in else 0,
+        "bytes_received": max(bytes_out) if bytes_out else 0,
+        "peak_memory_kb": round(peak_memory / 1024, 1),
+        "endpoints": {endpoint: entry["calls"] for endpoint, entry in sorted(endpoints.items())},
+    }
+
+
+def run_benchmarks(
+    latency: float = 0.0,
+    iterations: int = 3,
+    only: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run all (or the selected) scenarios against a fresh fake JIRA server.
+
+    Args:
+        latency: Seconds of latency injected into every fake JIRA response
+        iterations: Timed calls per scenario
+        only: Optional list of scenario names to run
+
+    Returns:
+        One result dictionary per scenario
+    """
+    results = []
+    # The fake server has no rate limit, so the client-side limit would only measure itself
+    with FakeJiraServer(latency=latency) as server, patch("src.http_hooks._limiter", RateLimiter(0)):
+        with patch.dict(os.environ, _jira_environment(server)):
+            for scenario in SCENARIOS:
+                if only and scenario.name not in only:
+                    continue
+                results.append(run_scenario(server, scenario, iterations))
+    return results
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    header = f"{'tool':<20} {'median ms':>10} {'max ms':>9} {'calls':>6} {'warm':>5} {'budget':>7} {'sent B':>8} {'recv B':>8} {'peak KB':>8}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        flag = "  OVER BUDGET" if result["over_budget"] else ""
+        flag += f"  ({result['errors']} errors)" if result["errors"] else ""
+        lines.append(
+            f"{result['name']:<20} {result['wall_time_ms']['median']:>10} {result['wall_time_ms']['max']:>9} "
+            f"{result['http_calls']:>6} {result['http_calls_warm']:>5} {result['budget']:>7} {result['bytes_sent']:>8} "
+            f"{result['bytes_received']:>8} {result['peak_memory_kb']:>8}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JIRA MCP tools against a fake JIRA server")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request in seconds (default: 0)")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed calls per tool (default: 3)")
+    parser.add_argument("--only", nargs="*", help="Only run the named tools")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(latency=args.latency, iterations=args.iterations, only=args.only)
+    print(format_report(results))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    over_budget = [result["name"] for result in results if result["over_budget"]]
+    if over_budget:
+        print(f"\nOver round-trip budget: {', '.join(over_budget)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
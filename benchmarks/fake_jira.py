@@ -0,0 +1,1309 @@
+"""
+A local stand-in for the JIRA Cloud REST API (v2).
+
+The fake server keeps its state in memory, speaks just enough of the REST API
+for the tools in src/tools to work against it unmodified, and records every
+request it serves (method, endpoint, request/response bytes) so benchmarks can
+count round trips. Latency and error responses can be injected per request.
+
+Example:
+    with FakeJiraServer(latency=0.05) as server:
+        os.environ["JIRA_SERVER"] = server.url
+        ...
+        print(server.total_calls())
+"""
+import json
+import random
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/rest/api/2/"
+
+STATUSES = {
+    "To Do": {"id": "10000", "category": ("new", "To Do")},
+    "In Progress": {"id": "3", "category": ("indeterminate", "In Progress")},
+    "In Review": {"id": "10001", "category": ("indeterminate", "In Progress")},
+    "Done": {"id": "10002", "category": ("done", "Done")},
+}
+
+# Transition name -> target status, available from each status
+WORKFLOW = {
+    "To Do": [("21", "In Progress")],
+    "In Progress": [("11", "To Do"), ("31", "In Review")],
+    "In Review": [("21", "In Progress"), ("41", "Done")],
+    "Done": [("11", "To Do")],
+}
+
+SYSTEM_FIELDS = [
+    ("summary", "Summary", {"type": "string", "system": "summary"}),
+    ("description", "Description", {"type": "string", "system": "description"}),
+    ("status", "Status", {"type": "status", "system": "status"}),
+    ("issuetype", "Issue Type", {"type": "issuetype", "system": "issuetype"}),
+    ("project", "Project", {"type": "project", "system": "project"}),
+    ("priority", "Priority", {"type": "priority", "system": "priority"}),
+    ("assignee", "Assignee", {"type": "user", "system": "assignee"}),
+    ("reporter", "Reporter", {"type": "user", "system": "reporter"}),
+    ("creator", "Creator", {"type": "user", "system": "creator"}),
+    ("labels", "Labels", {"type": "array", "items": "string", "system": "labels"}),
+    ("components", "Component/s", {"type": "array", "items": "component", "system": "components"}),
+    ("created", "Created", {"type": "datetime", "system": "created"}),
+    ("updated", "Updated", {"type": "datetime", "system": "updated"}),
+    ("comment", "Comment", {"type": "comments-page", "system": "comment"}),
+    ("issuelinks", "Linked Issues", {"type": "array", "items": "issuelinks", "system": "issuelinks"}),
+    ("subtasks", "Sub-tasks", {"type": "array", "items": "issuelinks", "system": "subtasks"}),
+    ("parent", "Parent", {"type": "issuelink", "system": "parent"}),
+]
+
+CUSTOM_FIELDS = [
+    ("customfield_10016", "Story Points", {"type": "number", "custom": "com.atlassian.jira.plugin.system.customfieldtypes:float", "customId": 10016}),
+    ("customfield_10020", "Sprint", {"type": "array", "items": "json", "custom": "com.pyxis.greenhopper.jira:gh-sprint", "customId": 10020}),
+    ("customfield_10030", "Team", {"type": "option", "custom": "com.atlassian.jira.plugin.system.customfieldtypes:select", "customId": 10030}),
+]
+
+PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+
+ISSUE_TYPES = {
+    "Epic": {"id": "10000", "subtask": False},
+    "Task": {"id": "10001", "subtask": False},
+    "Bug": {"id": "10002", "subtask": False},
+    "Story": {"id": "10003", "subtask": False},
+    "Sub-task": {"id": "10004", "subtask": True},
+}
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime the way JIRA does (e.g. 2024-03-21T10:00:00.000+0000)."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}+0000"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# --------------------------------------------------------------------------
+# JQL
+# --------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')'
+    r'|(?P<op>!=|>=|<=|!~|=|>|<|~)'
+    r'|(?P<punct>[(),])'
+    r'|(?P<word>[^\s()=!<>~,"\']+))'
+)
+
+
+def _tokenize(jql: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    jql = jql.strip()
+    while position < len(jql):
+        match = _TOKEN_RE.match(jql, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Error in the JQL Query: unexpected character at {position}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            value = value[1:-1]
+        tokens.append((kind, value))
+    return tokens
+
+
+class _JqlParser:
+    """Recursive-descent parser for the subset of JQL the fake server understands."""
+
+    def __init__(self, jql: str):
+        jql = re.split(r"\border\s+by\b", jql, flags=re.IGNORECASE)[0]
+        self.tokens = _tokenize(jql)
+        self.position = 0
+
+    def _peek(self, offset: int = 0) -> Optional[Tuple[str, str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Error in the JQL Query: unexpected end of query")
+        self.position += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        return token is not None and token[0] == "word" and token[1].upper() == word
+
+    def parse(self):
+        if not self.tokens:
+            return ("all",)
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Error in the JQL Query: unexpected '{self._peek()[1]}'")
+        return node
+
+    def _or(self):
+        node = self._and()
+        while self._keyword("OR"):
+            self._next()
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._keyword("AND"):
+            self._next()
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self):
+        if self._keyword("NOT"):
+            self._next()
+            return ("not", self._not())
+        if self._peek() == ("punct", "("):
+            self._next()
+            node = self._or()
+            self._next()
+            return node
+        return self._clause()
+
+    def _clause(self):
+        field = self._next()[1].lower()
+        token = self._next()
+        if token[0] == "op":
+            operator = token[1]
+        elif token[1].upper() == "IN":
+            operator = "in"
+        elif token[1].upper() == "NOT" and self._keyword("IN"):
+            self._next()
+            operator = "not in"
+        elif token[1].upper() == "IS":
+            operator = "is"
+            if self._keyword("NOT"):
+                self._next()
+                operator = "is not"
+        else:
+            raise ValueError(f"Error in the JQL Query: unsupported operator '{token[1]}'")
+        return ("clause", field, operator, self._value())
+
+    def _value(self):
+        if self._peek() == ("punct", "("):
+            self._next()
+            values = []
+            while self._peek() != ("punct", ")"):
+                values.append(self._value())
+                if self._peek() == ("punct", ","):
+                    self._next()
+            self._next()
+            return ("list", values)
+        kind, value = self._next()
+        if kind == "word" and self._peek() == ("punct", "("):
+            self._next()
+            args = []
+            while self._peek() != ("punct", ")"):
+                args.append(self._next()[1])
+                if self._peek() == ("punct", ","):
+                    self._next()
+            self._next()
+            return ("function", value, args)
+        return ("literal", value)
+
+
+def _parse_jql_date(value: str) -> datetime:
+    match = re.fullmatch(r"([-+]?)(\d+)([wdhm])", value.strip())
+    if match:
+        sign, amount, unit = match.groups()
+        delta = {
+            "w": timedelta(weeks=int(amount)),
+            "d": timedelta(days=int(amount)),
+            "h": timedelta(hours=int(amount)),
+            "m": timedelta(minutes=int(amount)),
+        }[unit]
+        return _utcnow() - delta if sign == "-" else _utcnow() + delta
+    for pattern in ("%Y/%m/%d %H:%M", "%Y-%m-%d %H:%M", "%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, pattern).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError(f"Error in the JQL Query: invalid date '{value}'")
+
+
+# --------------------------------------------------------------------------
+# State
+# --------------------------------------------------------------------------
+
+class FakeJira:
+    """In-memory JIRA state shared by all request handler threads."""
+
+    def __init__(self, projects: int = 2, issues_per_project: int = 25, users: int = 5):
+        self.lock = threading.RLock()
+        self.users: List[Dict[str, Any]] = []
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self._next_issue_id = 10000
+        self._next_comment_id = 20000
+        self._next_history_id = 30000
+        self._next_task_id = 40000
+        self._next_worklog_id = 50000
+        self._next_link_id = 60000
+        self.bulk_tasks: Dict[str, Dict[str, Any]] = {}
+        self.worklogs: Dict[str, Dict[str, Any]] = {}
+        self.deleted_worklogs: List[Tuple[str, datetime]] = []
+        self._project_counters: Dict[str, int] = {}
+        self.seed(projects, issues_per_project, users)
+
+    def seed(self, projects: int, issues_per_project: int, users: int) -> None:
+        with self.lock:
+            self.users = [
+                {
+                    "accountId": f"user-{index}",
+                    "displayName": f"User {index}",
+                    "emailAddress": f"user{index}@example.com",
+                    "active": index % 7 != 6,
+                    "timeZone": "UTC",
+                    "locale": "en_US",
+                }
+                for index in range(1, users + 1)
+            ]
+            for project_index in range(projects):
+                key = "DEMO" if project_index == 0 else f"PRJ{project_index}"
+                self.projects[key] = {
+                    "id": str(10000 + project_index),
+                    "key": key,
+                    "name": f"{key.title()} Project",
+                    "lead": self.users[0]["accountId"] if self.users else None,
+                }
+                self._project_counters[key] = 0
+                created = _utcnow() - timedelta(days=30)
+                for index in range(issues_per_project):
+                    status = list(STATUSES)[index % len(STATUSES)]
+                    self.add_issue(
+                        key,
+                        summary=f"Seeded issue {index + 1} in {key}",
+                        description=f"Description of seeded issue {index + 1}",
+                        issue_type=["Task", "Bug", "Story"][index % 3],
+                        priority=PRIORITIES[index % len(PRIORITIES)],
+                        assignee=self.users[index % len(self.users)]["accountId"] if self.users else None,
+                        status=status,
+                        labels=["seed"] + (["backend"] if index % 2 else []),
+                        created=created + timedelta(hours=index),
+                    )
+
+    def add_issue(
+        self,
+        project_key: str,
+        summary: str,
+        description: Optional[str] = None,
+        issue_type: str = "Task",
+        priority: Optional[str] = "Medium",
+        assignee: Optional[str] = None,
+        status: str = "To Do",
+        labels: Optional[List[str]] = None,
+        created: Optional[datetime] = None,
+        parent: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        with self.lock:
+            self._project_counters[project_key] += 1
+            self._next_issue_id += 1
+            key = f"{project_key}-{self._project_counters[project_key]}"
+            created = created or _utcnow()
+            issue = {
+                "id": str(self._next_issue_id),
+                "key": key,
+                "project": project_key,
+                "summary": summary,
+                "description": description,
+                "issuetype": issue_type,
+                "priority": priority,
+                "assignee": assignee,
+                "reporter": self.users[0]["accountId"] if self.users else None,
+                "status": status,
+                "labels": list(labels or []),
+                "components": [],
+                "created": created,
+                "updated": created,
+                "comments": [],
+                "parent": parent,
+                "links": [],
+                "changelog": [],
+                "custom": {},
+            }
+            self.issues[key] = issue
+            return issue
+
+    def find_issue(self, id_or_key: str) -> Optional[Dict[str, Any]]:
+        issue = self.issues.get(id_or_key.upper())
+        if issue is None:
+            issue = next((i for i in self.issues.values() if i["id"] == id_or_key), None)
+        return issue
+
+    def user(self, account_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if account_id is None:
+            return None
+        return next((u for u in self.users if account_id in (u["accountId"], u["displayName"], u["emailAddress"])), None)
+
+    def record_change(self, issue: Dict[str, Any], field: str, old: Any, new: Any) -> None:
+        """Record a field change in the issue's changelog and bump its updated time."""
+        self._next_history_id += 1
+        issue["updated"] = _utcnow()
+        issue["changelog"].append({
+            "id": str(self._next_history_id),
+            "author": self._user_json(self.users[0]["accountId"]) if self.users else None,
+            "created": format_timestamp(issue["updated"]),
+            "items": [{
+                "field": field,
+                "fieldtype": "jira",
+                "fromString": None if old is None else str(old),
+                "toString": None if new is None else str(new),
+            }],
+        })
+
+    def link_issues(self, outward_key: str, inward_key: str, link_type: str = "Blocks",
+                    outward: str = "blocks", inward: str = "is blocked by") -> None:
+        """Link two issues, e.g. DEMO-1 blocks DEMO-2."""
+        with self.lock:
+            self._next_link_id += 1
+            link = {"id": str(self._next_link_id), "type": link_type, "inward": inward, "outward": outward}
+            self.issues[outward_key]["links"].append(dict(link, direction="outwardIssue", other=inward_key))
+            self.issues[inward_key]["links"].append(dict(link, direction="inwardIssue", other=outward_key))
+
+    def add_worklog(self, issue_key: str, started: datetime, seconds: int,
+                    author: Optional[str] = None) -> Dict[str, Any]:
+        """Log work on an issue; the author defaults to the first user."""
+        with self.lock:
+            self._next_worklog_id += 1
+            worklog = {
+                "id": str(self._next_worklog_id),
+                "issue": self.issues[issue_key]["id"],
+                "author": author or (self.users[0]["accountId"] if self.users else None),
+                "started": started,
+                "seconds": seconds,
+                "updated": _utcnow(),
+            }
+            self.worklogs[worklog["id"]] = worklog
+            return worklog
+
+    def delete_worklog(self, worklog_id: str) -> None:
+        with self.lock:
+            del self.worklogs[worklog_id]
+            self.deleted_worklogs.append((worklog_id, _utcnow()))
+
+    def worklog_json(self, worklog: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": worklog["id"],
+            "issueId": worklog["issue"],
+            "author": self._user_json(worklog["author"]),
+            "started": format_timestamp(worklog["started"]),
+            "timeSpentSeconds": worklog["seconds"],
+            "updated": format_timestamp(worklog["updated"]),
+        }
+
+    # -- JSON rendering ----------------------------------------------------
+
+    def _user_json(self, account_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        user = self.user(account_id)
+        if user is None:
+            return None
+        return {
+            "accountId": user["accountId"],
+            "displayName": user["displayName"],
+            "emailAddress": user["emailAddress"],
+            "active": user["active"],
+        }
+
+    def status_json(self, name: str) -> Dict[str, Any]:
+        status = STATUSES[name]
+        key, category = status["category"]
+        return {"id": status["id"], "name": name, "statusCategory": {"key": key, "name": category}}
+
+    def comment_json(self, comment: Dict[str, Any], base: str, issue: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": comment["id"],
+            "self": f"{base}{API_PREFIX}issue/{issue['id']}/comment/{comment['id']}",
+            "body": comment["body"],
+            "author": self._user_json(comment["author"]),
+            "created": format_timestamp(comment["created"]),
+            "updated": format_timestamp(comment["updated"]),
+        }
+
+    def issue_json(self, issue: Dict[str, Any], base: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        project = self.projects[issue["project"]]
+        all_fields = {
+            "summary": issue["summary"],
+            "description": issue["description"],
+            "status": self.status_json(issue["status"]),
+            "issuetype": {
+                "id": ISSUE_TYPES[issue["issuetype"]]["id"],
+                "name": issue["issuetype"],
+                "subtask": ISSUE_TYPES[issue["issuetype"]]["subtask"],
+            },
+            "project": {"id": project["id"], "key": project["key"], "name": project["name"]},
+            "priority": {"id": str(PRIORITIES.index(issue["priority"]) + 1), "name": issue["priority"]} if issue["priority"] else None,
+            "assignee": self._user_json(issue["assignee"]),
+            "reporter": self._user_json(issue["reporter"]),
+            "creator": self._user_json(issue["reporter"]),
+            "labels": list(issue["labels"]),
+            "components": [{"name": name} for name in issue["components"]],
+            "created": format_timestamp(issue["created"]),
+            "updated": format_timestamp(issue["updated"]),
+            "comment": {
+                "comments": [self.comment_json(c, base, issue) for c in issue["comments"]],
+                "maxResults": len(issue["comments"]),
+                "total": len(issue["comments"]),
+                "startAt": 0,
+            },
+            "issuelinks": [
+                {
+                    "id": link["id"],
+                    "type": {"name": link["type"], "inward": link["inward"], "outward": link["outward"]},
+                    link["direction"]: {"key": link["other"], "id": self.issues[link["other"]]["id"]} if link["other"] in self.issues else {"key": link["other"]},
+                }
+                for link in issue["links"]
+            ],
+            "subtasks": [
+                {"key": other["key"], "id": other["id"]}
+                for other in self.issues.values()
+                if other["parent"] == issue["key"] and ISSUE_TYPES[other["issuetype"]]["subtask"]
+            ],
+        }
+        if issue["parent"]:
+            parent = self.issues.get(issue["parent"])
+            all_fields["parent"] = {
+                "key": issue["parent"], "id": parent["id"],
+                "fields": {"issuetype": {"name": parent["issuetype"], "subtask": ISSUE_TYPES[parent["issuetype"]]["subtask"]}},
+            } if parent else {"key": issue["parent"]}
+        all_fields.update(issue["custom"])
+        if fields and not any(f in ("*all", "*navigable") for f in fields):
+            wanted = set(fields)
+            all_fields = {name: value for name, value in all_fields.items() if name in wanted}
+        return {
+            "id": issue["id"],
+            "key": issue["key"],
+            "self": f"{base}{API_PREFIX}issue/{issue['id']}",
+            "fields": all_fields,
+        }
+
+    # -- JQL ---------------------------------------------------------------
+
+    def search(self, jql: str) -> List[Dict[str, Any]]:
+        tree = _JqlParser(jql or "").parse()
+        with self.lock:
+            matches = [issue for issue in self.issues.values() if self._matches(tree, issue)]
+        return sorted(matches, key=lambda issue: issue["created"], reverse=True)
+
+    def _resolve(self, value) -> List[str]:
+        kind = value[0]
+        if kind == "literal":
+            return [value[1]]
+        if kind == "list":
+            return [item for element in value[1] for item in self._resolve(element)]
+        name, args = value[1].lower(), value[2]
+        if name == "currentuser":
+            return [self.users[0]["accountId"]] if self.users else []
+        if name == "linkedissues":
+            issue = self.find_issue(args[0]) if args else None
+            return [link["other"] for link in issue["links"]] if issue else []
+        raise ValueError(f"Error in the JQL Query: unsupported function '{value[1]}'")
+
+    def _field_values(self, field: str, issue: Dict[str, Any]) -> List[Any]:
+        if field == "project":
+            project = self.projects[issue["project"]]
+            return [project["key"].lower(), project["name"].lower(), project["id"]]
+        if field in ("key", "issue", "issuekey", "id"):
+            return [issue["key"].lower(), issue["id"]]
+        if field == "status":
+            return [issue["status"].lower(), STATUSES[issue["status"]]["id"]]
+        if field == "statuscategory":
+            key, name = STATUSES[issue["status"]]["category"]
+            return [key, name.lower()]
+        if field in ("issuetype", "type"):
+            return [issue["issuetype"].lower()]
+        if field == "priority":
+            return [issue["priority"].lower()] if issue["priority"] else []
+        if field == "assignee":
+            user = self.user(issue["assignee"])
+            return [user["accountId"].lower(), user["displayName"].lower()] if user else []
+        if field == "labels":
+            return [label.lower() for label in issue["labels"]]
+        if field == "parent":
+            return [issue["parent"].lower()] if issue["parent"] else []
+        if field in ("summary", "text"):
+            return [(issue["summary"] or "") + " " + (issue["description"] or "" if field == "text" else "")]
+        return []
+
+    def _matches(self, node, issue: Dict[str, Any]) -> bool:
+        kind = node[0]
+        if kind == "all":
+            return True
+        if kind == "and":
+            return self._matches(node[1], issue) and self._matches(node[2], issue)
+        if kind == "or":
+            return self._matches(node[1], issue) or self._matches(node[2], issue)
+        if kind == "not":
+            return not self._matches(node[1], issue)
+        _, field, operator, value = node
+        if field in ("updated", "created"):
+            if value[0] == "literal" and value[1].upper() in ("EMPTY", "NULL"):
+                return operator == "is not"
+            when = _parse_jql_date(self._resolve(value)[0])
+            actual = issue[field]
+            return {
+                ">=": actual >= when, ">": actual > when,
+                "<=": actual <= when, "<": actual < when,
+                "=": actual == when, "!=": actual != when,
+            }.get(operator, True)
+        actual = self._field_values(field, issue)
+        if operator in ("is", "is not"):
+            empty = not actual
+            return empty if operator == "is" else not empty
+        expected = [item.lower() for item in self._resolve(value)]
+        if operator in ("~", "!~"):
+            found = any(e.strip("*").lower() in a.lower() for a in actual for e in expected)
+            return found if operator == "~" else not found
+        if field not in (
+            "project", "key", "issue", "issuekey", "id", "status", "statuscategory",
+            "issuetype", "type", "priority", "assignee", "labels", "parent",
+        ):
+            return True
+        found = any(e in actual for e in expected)
+        return not found if operator in ("!=", "not in") else found
+
+    # -- Transitions -------------------------------------------------------
+
+    def transitions_json(self, issue: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {"id": transition_id, "name": target, "to": self.status_json(target)}
+            for transition_id, target in WORKFLOW[issue["status"]]
+        ]
+
+
+# --------------------------------------------------------------------------
+# HTTP layer
+# --------------------------------------------------------------------------
+
+class ApiError(Exception):
+    """Raised by route handlers to produce a JIRA-style error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+Route = Tuple[str, re.Pattern, str, Callable]
+
+
+class _Routes:
+    """Route table mapping (method, path regex) to handler functions."""
+
+    def __init__(self):
+        self.routes: List[Route] = []
+
+    def add(self, method: str, template: str):
+        pattern = re.compile("^" + re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", template) + "$")
+
+        def decorator(fn):
+            self.routes.append((method, pattern, template, fn))
+            return fn
+
+        return decorator
+
+    def match(self, method: str, path: str):
+        for route_method, pattern, template, fn in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                return template, fn, match.groupdict()
+        return None
+
+
+routes = _Routes()
+
+
+def _require_issue(state: FakeJira, key: str) -> Dict[str, Any]:
+    issue = state.find_issue(key)
+    if issue is None:
+        raise ApiError(404, "Issue does not exist or you do not have permission to see it.")
+    return issue
+
+
+def _split_fields(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [f.strip() for f in value.split(",") if f.strip()]
+
+
+@routes.add("GET", "serverInfo")
+def _server_info(state, request):
+    return 200, {
+        "baseUrl": request.base,
+        "version": "1001.0.0-SNAPSHOT",
+        "versionNumbers": [1001, 0, 0],
+        "deploymentType": "Cloud",
+        "buildNumber": 100000,
+        "serverTitle": "Fake JIRA",
+    }
+
+
+@routes.add("GET", "myself")
+def _myself(state, request):
+    return 200, state._user_json(state.users[0]["accountId"])
+
+
+@routes.add("GET", "project")
+def _projects(state, request):
+    return 200, [
+        {"id": p["id"], "key": p["key"], "name": p["name"], "self": f"{request.base}{API_PREFIX}project/{p['id']}"}
+        for p in state.projects.values()
+    ]
+
+
+@routes.add("GET", "project/{key}")
+def _project(state, request, key):
+    project = state.projects.get(key.upper()) or next((p for p in state.projects.values() if p["id"] == key), None)
+    if project is None:
+        raise ApiError(404, f"No project could be found with key '{key}'.")
+    return 200, {"id": project["id"], "key": project["key"], "name": project["name"], "lead": state._user_json(project["lead"])}
+
+
+def _search(state, request, params):
+    try:
+        matches = state.search(params.get("jql", ""))
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    start_at = int(params.get("startAt", 0) or 0)
+    max_results = min(int(params.get("maxResults", 50) if params.get("maxResults") is not None else 50), 100)
+    fields = params.get("fields")
+    if isinstance(fields, str):
+        fields = _split_fields(fields)
+    page = matches[start_at:start_at + max_results]
+    return 200, {
+        "startAt": start_at,
+        "maxResults": max_results,
+        "total": len(matches),
+        "issues": [state.issue_json(issue, request.base, fields) for issue in page],
+    }
+
+
+@routes.add("GET", "search")
+def _search_get(state, request):
+    return _search(state, request, request.query)
+
+
+@routes.add("POST", "search")
+def _search_post(state, request):
+    return _search(state, request, request.json or {})
+
+
+def _custom_value(field_id: str, value: Any) -> Any:
+    """Store a custom field value the way JIRA returns it: sprints are set by id but read as objects."""
+    if field_id == "customfield_10020" and value is not None:
+        ids = value if isinstance(value, list) else [value]
+        return [{"id": int(sprint_id), "name": f"Sprint {sprint_id}", "state": "active", "boardId": 1} for sprint_id in ids]
+    return value
+
+
+def _field_meta(field_id: str, required: bool = False, has_default: bool = False,
+                allowed: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    name, schema = next((n, sch) for fid, n, sch in SYSTEM_FIELDS + CUSTOM_FIELDS if fid == field_id)
+    meta = {"fieldId": field_id, "key": field_id, "name": name, "required": required,
+            "hasDefaultValue": has_default, "schema": schema, "operations": ["set"]}
+    if allowed is not None:
+        meta["allowedValues"] = allowed
+    return meta
+
+
+def _priority_values() -> List[Dict[str, Any]]:
+    return [{"id": str(index + 1), "name": name} for index, name in enumerate(PRIORITIES)]
+
+
+def _create_fields(issue_type: str) -> Dict[str, Dict[str, Any]]:
+    """Create-screen fields of an issue type: Sub-tasks need a parent, Epics have no priority."""
+    fields = [
+        _field_meta("project", required=True),
+        _field_meta("issuetype", required=True),
+        _field_meta("summary", required=True),
+        _field_meta("reporter", required=True, has_default=True),
+        _field_meta("description"),
+        _field_meta("assignee"),
+        _field_meta("labels"),
+    ]
+    if issue_type != "Epic":
+        fields.append(_field_meta("priority", has_default=True, allowed=_priority_values()))
+    if issue_type == "Story":
+        fields.append(_field_meta("customfield_10016"))
+    if ISSUE_TYPES[issue_type]["subtask"]:
+        fields.append(_field_meta("parent", required=True))
+    return {field["fieldId"]: field for field in fields}
+
+
+@routes.add("GET", "issue/createmeta")
+def _create_meta(state, request):
+    keys = set(_split_fields(request.query.get("projectKeys")) or state.projects)
+    expand_fields = "projects.issuetypes.fields" in (request.query.get("expand") or "")
+    projects = []
+    for project in state.projects.values():
+        if project["key"] not in keys:
+            continue
+        issue_types = []
+        for name, issue_type in ISSUE_TYPES.items():
+            entry = {"id": issue_type["id"], "name": name, "subtask": issue_type["subtask"]}
+            if expand_fields:
+                entry["fields"] = _create_fields(name)
+            issue_types.append(entry)
+        projects.append({"id": project["id"], "key": project["key"], "name": project["name"], "issuetypes": issue_types})
+    return 200, {"expand": "projects", "projects": projects}
+
+
+@routes.add("GET", "issue/{key}")
+def _get_issue(state, request, key):
+    issue = _require_issue(state, key)
+    payload = state.issue_json(issue, request.base, _split_fields(request.query.get("fields")))
+    if "editmeta" in (request.query.get("expand") or ""):
+        fields = [
+            _field_meta("summary", required=True),
+            _field_meta("description"),
+            _field_meta("assignee"),
+            _field_meta("labels"),
+            _field_meta("components"),
+        ] + [_field_meta(field_id) for field_id, _, _ in CUSTOM_FIELDS]
+        if issue["issuetype"] != "Epic":
+            fields.append(_field_meta("priority", allowed=_priority_values()))
+        payload["editmeta"] = {"fields": {field["fieldId"]: field for field in fields}}
+    return 200, payload
+
+
+@routes.add("POST", "issue")
+def _create_issue(state, request):
+    body = request.json or {}
+    fields = body.get("fields", {})
+    project = fields.get("project", {})
+    project_key = project.get("key") or next(
+        (p["key"] for p in state.projects.values() if p["id"] == project.get("id")), None
+    )
+    if project_key not in state.projects:
+        raise ApiError(400, "project: valid project is required")
+    issue_type = fields.get("issuetype", {}).get("name") or next(
+        (name for name, t in ISSUE_TYPES.items() if t["id"] == fields.get("issuetype", {}).get("id")), None
+    )
+    if issue_type not in ISSUE_TYPES:
+        raise ApiError(400, "issuetype: Specify a valid issue type")
+    if fields.get("priority") and "priority" not in _create_fields(issue_type):
+        raise ApiError(400, "priority: Field 'priority' cannot be set. It is not on the appropriate screen, or unknown.")
+    priority = (fields.get("priority") or {}).get("name", "Medium")
+    if priority not in PRIORITIES:
+        raise ApiError(400, "priority: Specify a valid priority")
+    if not fields.get("summary"):
+        raise ApiError(400, "summary: You must specify a summary of the issue.")
+    if ISSUE_TYPES[issue_type]["subtask"] and not (fields.get("parent") or {}).get("key"):
+        raise ApiError(400, "parent: Parent is required for sub-tasks.")
+    assignee = fields.get("assignee") or {}
+    issue = state.add_issue(
+        project_key,
+        summary=fields["summary"],
+        description=fields.get("description"),
+        issue_type=issue_type,
+        priority=priority,
+        assignee=assignee.get("accountId") or assignee.get("name"),
+        labels=fields.get("labels"),
+        parent=(fields.get("parent") or {}).get("key"),
+    )
+    with state.lock:
+        issue["custom"].update({
+            name: _custom_value(name, value) for name, value in fields.items() if name.startswith("customfield_")
+        })
+        issue["properties"] = {prop["key"]: prop["value"] for prop in body.get("properties") or []}
+    return 201, {"id": issue["id"], "key": issue["key"], "self": f"{request.base}{API_PREFIX}issue/{issue['id']}"}
+
+
+@routes.add("PUT", "issue/{key}")
+def _update_issue(state, request, key):
+    issue = _require_issue(state, key)
+    body = request.json or {}
+    with state.lock:
+        for name, value in (body.get("fields") or {}).items():
+            old = issue.get(name)
+            if name in ("summary", "description"):
+                issue[name] = value
+            elif name == "priority":
+                if value["name"] not in PRIORITIES:
+                    raise ApiError(400, "priority: Specify a valid priority")
+                issue["priority"] = value["name"]
+            elif name == "assignee":
+                issue["assignee"] = None if value is None else (value.get("accountId") or value.get("name"))
+            elif name == "labels":
+                issue["labels"] = list(value)
+            elif name == "components":
+                issue["components"] = [c.get("name") for c in value]
+            else:
+                old = issue["custom"].get(name)
+                issue["custom"][name] = _custom_value(name, value)
+            state.record_change(issue, name, old, value)
+        for name, operations in (body.get("update") or {}).items():
+            for operation in operations:
+                for verb, value in operation.items():
+                    if name == "comment" and verb == "add":
+                        _append_comment(state, issue, value["body"])
+                        continue
+                    target = issue["labels"] if name == "labels" else issue["components"]
+                    if name == "components":
+                        value = value.get("name")
+                    if verb == "add" and value not in target:
+                        target.append(value)
+                    elif verb == "remove" and value in target:
+                        target.remove(value)
+                    elif verb == "set":
+                        target[:] = value
+                    state.record_change(issue, name, None, value)
+    return 204, None
+
+
+@routes.add("DELETE", "issue/{key}")
+def _delete_issue(state, request, key):
+    issue = _require_issue(state, key)
+    with state.lock:
+        del state.issues[issue["key"]]
+    return 204, None
+
+
+@routes.add("GET", "issue/{key}/properties/{name}")
+def _get_issue_property(state, request, key, name):
+    issue = _require_issue(state, key)
+    properties = issue.get("properties") or {}
+    if name not in properties:
+        raise ApiError(404, f"The property with key '{name}' does not exist.")
+    return 200, {"key": name, "value": properties[name]}
+
+
+@routes.add("GET", "issue/{key}/changelog")
+def _get_changelog(state, request, key):
+    issue = _require_issue(state, key)
+    start = int(request.query.get("startAt", 0))
+    limit = int(request.query.get("maxResults", 100))
+    with state.lock:
+        histories = list(issue["changelog"])
+    page = histories[start:start + limit]
+    return 200, {
+        "self": f"{request.base}{API_PREFIX}issue/{issue['key']}/changelog?startAt={start}&maxResults={limit}",
+        "startAt": start,
+        "maxResults": limit,
+        "total": len(histories),
+        "isLast": start + len(page) >= len(histories),
+        "values": page,
+    }
+
+
+@routes.add("GET", "issue/{key}/transitions")
+def _get_transitions(state, request, key):
+    issue = _require_issue(state, key)
+    return 200, {"expand": "transitions", "transitions": state.transitions_json(issue)}
+
+
+@routes.add("POST", "issue/{key}/transitions")
+def _do_transition(state, request, key):
+    issue = _require_issue(state, key)
+    body = request.json or {}
+    transition_id = str((body.get("transition") or {}).get("id"))
+    with state.lock:
+        target = next((t for tid, t in WORKFLOW[issue["status"]] if tid == transition_id), None)
+        if target is None:
+            raise ApiError(400, f"Transition id '{transition_id}' is not valid for this issue.")
+        old = issue["status"]
+        issue["status"] = target
+        state.record_change(issue, "status", old, target)
+        for operation in (body.get("update") or {}).get("comment", []):
+            _append_comment(state, issue, operation["add"]["body"])
+    return 204, None
+
+
+def _append_comment(state: FakeJira, issue: Dict[str, Any], body: str) -> Dict[str, Any]:
+    state._next_comment_id += 1
+    now = _utcnow()
+    comment = {
+        "id": str(state._next_comment_id),
+        "body": body,
+        "author": state.users[0]["accountId"] if state.users else None,
+        "created": now,
+        "updated": now,
+    }
+    issue["comments"].append(comment)
+    issue["updated"] = now
+    return comment
+
+
+@routes.add("GET", "issue/{key}/comment")
+def _get_comments(state, request, key):
+    issue = _require_issue(state, key)
+    start = int(request.query.get("startAt", 0))
+    limit = int(request.query.get("maxResults", 5000))
+    with state.lock:
+        comments = sorted(issue["comments"], key=lambda c: (c["created"], int(c["id"])))
+    if (request.query.get("orderBy") or "").startswith("-"):
+        comments.reverse()
+    page = comments[start:start + limit]
+    return 200, {
+        "startAt": start,
+        "maxResults": limit,
+        "total": len(comments),
+        "comments": [state.comment_json(c, request.base, issue) for c in page],
+    }
+
+
+@routes.add("POST", "issue/{key}/comment")
+def _add_comment(state, request, key):
+    issue = _require_issue(state, key)
+    body = (request.json or {}).get("body")
+    if not body:
+        raise ApiError(400, "body: Comment body can not be empty!")
+    with state.lock:
+        comment = _append_comment(state, issue, body)
+    return 201, state.comment_json(comment, request.base, issue)
+
+
+@routes.add("GET", "field")
+def _fields(state, request):
+    return 200, [
+        {"id": field_id, "key": field_id, "name": name, "custom": field_id.startswith("customfield_"),
+         "navigable": True, "searchable": True, "clauseNames": [field_id, name.lower()], "schema": schema}
+        for field_id, name, schema in SYSTEM_FIELDS + CUSTOM_FIELDS
+    ]
+
+
+@routes.add("GET", "priority")
+def _priorities(state, request):
+    return 200, _priority_values()
+
+
+# Worklog ids returned per page of worklog/updated and worklog/deleted
+WORKLOG_PAGE_SIZE = 1000
+
+
+def _worklog_changes(entries: List[Tuple[str, datetime]], since: int) -> Dict[str, Any]:
+    changed = sorted(
+        (int(when.timestamp() * 1000), worklog_id) for worklog_id, when in entries
+        if int(when.timestamp() * 1000) > since
+    )
+    page = changed[:WORKLOG_PAGE_SIZE]
+    return {
+        "values": [{"worklogId": int(worklog_id), "updatedTime": when, "properties": []} for when, worklog_id in page],
+        "since": since,
+        "until": page[-1][0] if page else since,
+        "lastPage": len(changed) <= WORKLOG_PAGE_SIZE,
+    }
+
+
+@routes.add("GET", "worklog/updated")
+def _worklogs_updated(state, request):
+    with state.lock:
+        entries = [(w["id"], w["updated"]) for w in state.worklogs.values()]
+    return 200, _worklog_changes(entries, int(request.query.get("since", 0)))
+
+
+@routes.add("GET", "worklog/deleted")
+def _worklogs_deleted(state, request):
+    with state.lock:
+        entries = list(state.deleted_worklogs)
+    return 200, _worklog_changes(entries, int(request.query.get("since", 0)))
+
+
+@routes.add("POST", "worklog/list")
+def _worklog_list(state, request):
+    ids = [str(worklog_id) for worklog_id in (request.json or {}).get("ids", [])]
+    if len(ids) > 1000:
+        raise ApiError(400, "The number of worklog ids must not exceed 1000.")
+    with state.lock:
+        return 200, [state.worklog_json(state.worklogs[i]) for i in ids if i in state.worklogs]
+
+
+@routes.add("GET", "status")
+def _statuses(state, request):
+    return 200, [state.status_json(name) for name in STATUSES]
+
+
+@routes.add("POST", "bulk/issues/fields")
+def _bulk_edit(state, request):
+    body = request.json or {}
+    edited = body.get("editedFieldsInput") or {}
+    keys = body.get("selectedIssueIdsOrKeys") or []
+    if not keys or len(keys) > 1000:
+        raise ApiError(400, "selectedIssueIdsOrKeys: Select between 1 and 1000 issues")
+    priority = None
+    if "priority" in body.get("selectedActions", []):
+        priority = next((p["name"] for p in _priority_values() if p["id"] == edited["priority"]["priorityId"]), None)
+        if priority is None:
+            raise ApiError(400, "priority: Specify a valid priority")
+    # The edit is applied at once; the task only reports the outcome
+    processed, failed = [], {}
+    with state.lock:
+        for key in keys:
+            issue = state.find_issue(key)
+            if issue is None:
+                continue
+            if priority is not None and issue["issuetype"] == "Epic":
+                failed[issue["id"]] = ["Field 'priority' cannot be set. It is not on the appropriate screen, or unknown."]
+                continue
+            for labels in edited.get("labelsFields", []):
+                names = [label["name"] for label in labels["labels"]]
+                old = list(issue["labels"])
+                if labels["bulkEditMultiSelectFieldOption"] == "ADD":
+                    issue["labels"] += [name for name in names if name not in issue["labels"]]
+                elif labels["bulkEditMultiSelectFieldOption"] == "REMOVE":
+                    issue["labels"] = [name for name in issue["labels"] if name not in names]
+                else:
+                    issue["labels"] = names
+                state.record_change(issue, "labels", old, issue["labels"])
+            if priority is not None:
+                state.record_change(issue, "priority", issue["priority"], priority)
+                issue["priority"] = priority
+            processed.append(issue["id"])
+        state._next_task_id += 1
+        task_id = str(state._next_task_id)
+        state.bulk_tasks[task_id] = {
+            "taskId": task_id,
+            "status": "COMPLETE",
+            "progressPercent": 100,
+            "totalIssueCount": len(keys),
+            "processedAccessibleIssues": processed,
+            "failedAccessibleIssues": failed,
+            "invalidOrInaccessibleIssueCount": len(keys) - len(processed) - len(failed),
+        }
+    return 201, {"taskId": task_id}
+
+
+@routes.add("GET", "bulk/queue/{task_id}")
+def _bulk_task(state, request, task_id):
+    task = state.bulk_tasks.get(task_id)
+    if task is None:
+        raise ApiError(404, f"Task {task_id} not found")
+    return 200, task
+
+
+@routes.add("GET", "user/search")
+def _user_search(state, request):
+    query = (request.query.get("query") or "").lower()
+    include_active = request.query.get("includeActive", "True").lower() == "true"
+    include_inactive = request.query.get("includeInactive", "False").lower() == "true"
+    max_results = int(request.query.get("maxResults", 50))
+    users = [
+        dict(user, avatarUrls={"48x48": f"{request.base}/avatar/{user['accountId']}.png"})
+        for user in state.users
+        if (query in user["displayName"].lower() or query in user["emailAddress"].lower())
+        and ((user["active"] and include_active) or (not user["active"] and include_inactive))
+    ]
+    return 200, users[:max_results]
+
+
+class _Request:
+    """The parts of an incoming request a route handler needs."""
+
+    def __init__(self, base: str, query: Dict[str, str], body: bytes):
+        self.base = base
+        self.query = query
+        self.body = body
+        self.json = json.loads(body) if body else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_ThreadingServer"
+
+    def setup(self):
+        super().setup()
+        # Responses are written in two parts (headers, body); without TCP_NODELAY
+        # delayed ACKs add ~40ms to every round trip.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):  # noqa: A002 - signature from BaseHTTPRequestHandler
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        fake: FakeJiraServer = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        parsed = urlparse(self.path)
+        path = parsed.path[len(API_PREFIX):] if parsed.path.startswith(API_PREFIX) else parsed.path.lstrip("/")
+        # Repeated parameters (e.g. fields=a&fields=b) are joined like a comma-separated list
+        query = {name: ",".join(values) for name, values in parse_qs(parsed.query).items()}
+
+        entered = fake.enter()
+        try:
+            if fake.latency:
+                time.sleep(fake.latency)
+
+            matched = routes.match(method, path)
+            endpoint = f"{method} {matched[0] if matched else path}"
+            status, payload = 404, {"errorMessages": [f"No route for {method} {path}"], "errors": {}}
+            if matched and fake.should_fail():
+                status, payload = fake.error_status, {"errorMessages": ["Injected failure"], "errors": {}}
+            elif matched:
+                status, payload = self._handle(fake, matched, query, body)
+        finally:
+            fake.leave(entered)
+
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        # Record before responding so the client never observes a response
+        # whose request is not yet counted.
+        fake.record(endpoint, status, len(body), len(data))
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        if data:
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _handle(self, fake: "FakeJiraServer", matched, query: Dict[str, str], body: bytes):
+        _, handler, params = matched
+        try:
+            request = _Request(f"http://{self.headers.get('Host')}", query, body)
+            return handler(fake.state, request, **params)
+        except ApiError as e:
+            return e.status, {"errorMessages": [e.message], "errors": {}}
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeJiraServer"
+
+
+class FakeJiraServer:
+    """
+    Runs a FakeJira instance behind a threaded HTTP server on localhost.
+
+    Args:
+        latency: Seconds of latency injected before every response (default: 0)
+        error_rate: Fraction of requests answered with error_status instead (default: 0)
+        error_status: HTTP status used for injected failures (default: 503)
+        seed: Seed for the error injection random generator (default: None)
+        state: Pre-built FakeJira state (default: a freshly seeded instance)
+        host: Interface to bind (default: 127.0.0.1)
+        port: Port to bind; 0 picks a free port (default: 0)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        state: Optional[FakeJira] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.state = state or FakeJira()
+        self._random = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.busy_seconds = 0.0
+        self._httpd = _ThreadingServer((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeJiraServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-jira", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeJiraServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def record(self, endpoint: str, status: int, bytes_in: int, bytes_out: int) -> None:
+        with self._stats_lock:
+            entry = self._stats.setdefault(endpoint, {"calls": 0, "errors": 0, "bytes_in": 0, "bytes_out": 0})
+            entry["calls"] += 1
+            entry["errors"] += status >= 400
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._stats_lock:
+            return self._random.random() < self.error_rate
+
+    def enter(self) -> float:
+        """Mark a request as in flight and return its start time."""
+        with self._stats_lock:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        return time.perf_counter()
+
+    def leave(self, entered: float) -> None:
+        elapsed = time.perf_counter() - entered
+        with self._stats_lock:
+            self._in_flight -= 1
+            self.busy_seconds += elapsed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return a copy of the per-endpoint request counters."""
+        with self._stats_lock:
+            return {endpoint: dict(entry) for endpoint, entry in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+            self.peak_in_flight = self._in_flight
+            self.busy_seconds = 0.0
+
+    def total_calls(self) -> int:
+        return sum(entry["calls"] for entry in self.stats().values())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake JIRA server for local development")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for injected failures")
+    args = parser.parse_args()
+
+    server = FakeJiraServer(
+        latency=args.latency, error_rate=args.error_rate, error_status=args.error_status, port=args.port
+    )
+    print(f"Fake JIRA listening on {server.url}")
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Soak/load harness that drives the MCP server over stdio.
+
+The harness starts a fake JIRA server (with optional latency and error
+injection), launches one or more `run.py` server processes against it, and
+has N simulated MCP clients issue a weighted mix of tool calls for a fixed
+duration. Clients are spread round-robin over the server processes and their
+requests are multiplexed on each process's stdio pipe, the same way a single
+agent session issues concurrent tool calls.
+
+The report contains per-tool and overall p50/p95/p99 latency, throughput and
+error rates, the RSS of every server process sampled over time, and how many
+JIRA requests were actually in flight concurrently. When several clients
+share one server process but JIRA never sees more than one request per
+process at a time, the stdio loop is serializing tool calls (head-of-line
+blocking).
+
+Usage:
+    python -m benchmarks.load_test --clients 8 --duration 60 --latency 0.05
+    python -m benchmarks.load_test --mix search_issues=3,get_issue_details=1 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.fake_jira import WORKFLOW, FakeJira, FakeJiraServer
+
+RUN_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run.py")
+
+PROTOCOL_VERSION = "2024-11-05"
+
+DEFAULT_MIX = "search_issues=4,get_issue_details=3,list_projects=1,add_comment=1,transition_issue=1,search_users=1"
+
+
+def _random_issue(state: FakeJira, rng: random.Random) -> str:
+    with state.lock:
+        return rng.choice(list(state.issues))
+
+
+def _next_status(state: FakeJira, key: str) -> str:
+    with state.lock:
+        issue = state.issues.get(key)
+        status = issue["status"] if issue else "To Do"
+    return WORKFLOW[status][-1][1]
+
+
+# Tool name -> builder of the tool arguments
+ARGUMENT_BUILDERS: Dict[str, Callable[[FakeJira, random.Random], Dict[str, Any]]] = {
+    "search_issues": lambda state, rng: {"jql": rng.choice(["project = DEMO", "status = 'In Progress'", "labels = backend"]), "max_results": 20},
+    "get_issue_details": lambda state, rng: {"issue_key": _random_issue(state, rng), "include_comments": rng.random() < 0.5},
+    "list_projects": lambda state, rng: {"limit": 10},
+    "add_comment": lambda state, rng: {"issue_key": _random_issue(state, rng), "comment": "Load test comment"},
+    "transition_issue": lambda state, rng: (lambda key: {"issue_key": key, "status": _next_status(state, key)})(_random_issue(state, rng)),
+    "search_users": lambda state, rng: {"query": "user"},
+    "create_issue": lambda state, rng: {"project_key": "DEMO", "summary": "Load test issue", "issue_type": "Task"},
+    "server_stats": lambda state, rng: {},
+}
+
+
+def parse_mix(mix: str) -> List[Tuple[str, float]]:
+    """Parse a "tool=weight,tool=weight" mix specification."""
+    weights = []
+    for part in mix.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ARGUMENT_BUILDERS:
+            raise ValueError(f"Unknown tool '{name}' in mix. Available tools: {', '.join(ARGUMENT_BUILDERS)}")
+        weights.append((name, float(weight or 1)))
+    return weights
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    """Resident set size of a process in KB, read from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class StdioServer:
+    """One `run.py` process and the JSON-RPC plumbing to talk to it over stdio."""
+
+    def __init__(self, index: int, env: Dict[str, str]):
+        self.index = index
+        self.env = env
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, RUN_PY,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=self.env,
+            limit=64 * 1024 * 1024,
+        )
+        self._reader = asyncio.create_task(self._read_loop())
+        await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "mcp-jira-load-test", "version": "0.1"},
+        })
+        await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def stop(self) -> None:
+        if self.process and self.process.returncode is None:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        if self._reader:
+            self._reader.cancel()
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        async with self._write_lock:
+            self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+            await self.process.stdin.drain()
+
+    async def _read_loop(self) -> None:
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("MCP server closed its stdout"))
+
+    async def request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return await future
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> bool:
+        """Call a tool and return True if it succeeded."""
+        response = await self.request("tools/call", {"name": name, "arguments": arguments})
+        if "error" in response:
+            return False
+        return not response.get("result", {}).get("isError", False)
+
+
+async def _client(
+    client_id: int,
+    server: StdioServer,
+    jira: FakeJira,
+    mix: List[Tuple[str, float]],
+    deadline: float,
+    warmup_until: float,
+    samples: List[Tuple[str, float, bool, float]],
+    seed: int,
+) -> None:
+    rng = random.Random(seed + client_id)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    while time.monotonic() < deadline:
+        tool = rng.choices(names, weights)[0]
+        arguments = ARGUMENT_BUILDERS[tool](jira, rng)
+        started = time.monotonic()
+        try:
+            ok = await server.call_tool(tool, arguments)
+        except ConnectionError:
+            ok = False
+        finished = time.monotonic()
+        if started >= warmup_until:
+            samples.append((tool, finished - started, ok, finished))
+
+
+async def _sample_rss(
+    servers: List[StdioServer],
+    interval: float,
+    deadline: float,
+    started: float,
+    rss_samples: Dict[int, List[Tuple[float, int]]],
+) -> None:
+    while True:
+        now = time.monotonic()
+        for server in servers:
+            rss = read_rss_kb(server.process.pid)
+            if rss is not None:
+                rss_samples[server.index].append((round(now - started, 2), rss))
+        if now >= deadline:
+            break
+        await asyncio.sleep(min(interval, max(0.0, deadline - now)))
+
+
+def _slope_kb_per_minute(points: List[Tuple[float, int]]) -> float:
+    """Least-squares slope of RSS over time, in KB per minute."""
+    if len(points) < 2:
+        return 0.0
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if not denominator:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator * 60
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+def build_report(
+    samples: List[Tuple[str, float, bool, float]],
+    measured_seconds: float,
+    clients: int,
+    rss_samples: Dict[int, List[Tuple[float, int]]],
+    jira: FakeJiraServer,
+    leak_threshold_kb_per_minute: float,
+    leak_min_growth_kb: int,
+) -> Dict[str, Any]:
+    """Summarize raw call samples and RSS samples into the load test report."""
+    per_tool: Dict[str, Dict[str, Any]] = {}
+    for tool in sorted({sample[0] for sample in samples}):
+        tool_samples = [sample for sample in samples if sample[0] == tool]
+        latencies = [sample[1] for sample in tool_samples]
+        failures = sum(1 for sample in tool_samples if not sample[2])
+        per_tool[tool] = dict(
+            calls=len(tool_samples),
+            errors=failures,
+            error_rate=round(failures / len(tool_samples), 4),
+            **_latency_summary(latencies),
+        )
+
+    latencies = [sample[1] for sample in samples]
+    failures = sum(1 for sample in samples if not sample[2])
+    servers = len(rss_samples)
+    # Average number of JIRA requests in flight: time JIRA spent serving
+    # requests over wall time. At most 1 per server process when tool calls
+    # are serialized, regardless of the number of clients.
+    jira_average_in_flight = jira.busy_seconds / measured_seconds if measured_seconds else 0.0
+
+    memory = {}
+    for index, points in rss_samples.items():
+        slope = _slope_kb_per_minute(points)
+        growth = points[-1][1] - points[0][1] if points else 0
+        memory[f"server-{index}"] = {
+            "rss_start_kb": points[0][1] if points else None,
+            "rss_end_kb": points[-1][1] if points else None,
+            "rss_peak_kb": max(rss for _, rss in points) if points else None,
+            "growth_kb_per_minute": round(slope, 1),
+            "suspected_leak": slope > leak_threshold_kb_per_minute and growth > leak_min_growth_kb,
+            "samples": points,
+        }
+
+    return {
+        "overall": dict(
+            calls=len(samples),
+            errors=failures,
+            error_rate=round(failures / len(samples), 4) if samples else 0.0,
+            throughput_per_second=round(len(samples) / measured_seconds, 2) if measured_seconds else 0.0,
+            **_latency_summary(latencies),
+        ),
+        "tools": per_tool,
+        "concurrency": {
+            "clients": clients,
+            "servers": servers,
+            "jira_average_in_flight": round(jira_average_in_flight, 2),
+            "jira_peak_in_flight": jira.peak_in_flight,
+            "head_of_line_blocking": clients > servers and jira.peak_in_flight <= servers,
+        },
+        "memory": memory,
+        "jira_endpoints": jira.stats(),
+    }
+
+
+async def run_load_test(
+    clients: int = 4,
+    servers: int = 1,
+    duration: float = 30.0,
+    warmup: float = 2.0,
+    mix: str = DEFAULT_MIX,
+    latency: float = 0.05,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    sample_interval: float = 1.0,
+    leak_threshold_kb_per_minute: float = 1024.0,
+    leak_min_growth_kb: int = 8192,
+    seed: int = 1,
+) -> Dict[str, Any]:
+    """
+    Run the load test and return the report.
+
+    Args:
+        clients: Number of simulated MCP clients issuing calls back to back
+        servers: Number of run.py processes the clients are spread across
+        duration: Seconds to generate load for, excluding warmup
+        warmup: Seconds of load at the start that are excluded from the report
+        mix: Weighted tool mix ("tool=weight,...")
+        latency: Seconds of latency injected into every fake JIRA response
+        error_rate: Fraction of fake JIRA responses replaced by error_status
+        error_status: HTTP status of injected failures (e.g. 503 or 429)
+        sample_interval: Seconds between RSS samples
+        leak_threshold_kb_per_minute: RSS growth rate reported as a suspected leak
+        leak_min_growth_kb: Total RSS growth required before a leak is reported,
+            so short runs are not flagged on allocator noise
+        seed: Seed for tool selection, arguments and error injection
+    """
+    parsed_mix = parse_mix(mix)
+    jira = FakeJiraServer(latency=latency, error_rate=error_rate, error_status=error_status, seed=seed)
+    jira.start()
+    env = dict(
+        os.environ,
+        JIRA_SERVER=jira.url,
+        JIRA_EMAIL="load@example.com",
+        JIRA_API_TOKEN="load-token",
+    )
+    stdio_servers = [StdioServer(index, env) for index in range(servers)]
+    try:
+        await asyncio.gather(*(server.start() for server in stdio_servers))
+        jira.reset_stats()
+
+        started = time.monotonic()
+        warmup_until = started + warmup
+        deadline = warmup_until + duration
+        samples: List[Tuple[str, float, bool, float]] = []
+        rss_samples: Dict[int, List[Tuple[float, int]]] = {server.index: [] for server in stdio_servers}
+
+        sampler = asyncio.create_task(_sample_rss(stdio_servers, sample_interval, deadline, started, rss_samples))
+        await asyncio.gather(*(
+            _client(client_id, stdio_servers[client_id % servers], jira.state, parsed_mix, deadline, warmup_until, samples, seed)
+            for client_id in range(clients)
+        ))
+        await sampler
+        measured = max(time.monotonic() - warmup_until, 1e-9)
+        return build_report(
+            samples, measured, clients, rss_samples, jira, leak_threshold_kb_per_minute, leak_min_growth_kb
+        )
+    finally:
+        await asyncio.gather(*(server.stop() for server in stdio_servers), return_exceptions=True)
+        jira.stop()
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    header = f"{'tool':<20} {'calls':>7} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    lines = [header, "-" * len(header)]
+    rows = list(report["tools"].items()) + [("TOTAL", report["overall"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:<20} {row['calls']:>7} {row['error_rate'] * 100:>6.1f} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}"
+        )
+    concurrency = report["concurrency"]
+    lines.append("")
+    lines.append(f"Throughput: {report['overall']['throughput_per_second']} calls/s")
+    lines.append(
+        f"JIRA requests in flight: {concurrency['jira_average_in_flight']} average, "
+        f"{concurrency['jira_peak_in_flight']} peak ({concurrency['clients']} clients on {concurrency['servers']} servers)"
+    )
+    if concurrency["head_of_line_blocking"]:
+        lines.append("Head-of-line blocking: concurrent tool calls are serialized by the server")
+    for name, memory in report["memory"].items():
+        leak = "  SUSPECTED LEAK" if memory["suspected_leak"] else ""
+        lines.append(
+            f"{name}: RSS {memory['rss_start_kb']} -> {memory['rss_end_kb']} KB "
+            f"(peak {memory['rss_peak_kb']} KB, {memory['growth_kb_per_minute']} KB/min){leak}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Drive run.py over stdio with concurrent simulated MCP clients")
+    parser.add_argument("--clients", type=int, default=4, help="Number of simulated MCP clients (default: 4)")
+    parser.add_argument("--servers", type=int, default=1, help="Number of run.py processes (default: 1)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of measured load (default: 30)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured warmup (default: 2)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted tool mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected JIRA latency in seconds (default: 0.05)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of JIRA requests that fail (default: 0)")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for injected failures (default: 503)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between RSS samples (default: 1)")
+    parser.add_argument("--leak-threshold", type=float, default=1024.0,
+                        help="RSS growth in KB/min reported as a suspected leak (default: 1024)")
+    parser.add_argument("--leak-min-growth", type=int, default=8192,
+                        help="Total RSS growth in KB required to report a leak (default: 8192)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load_test(
+        clients=args.clients,
+        servers=args.servers,
+        duration=args.duration,
+        warmup=args.warmup,
+        mix=args.mix,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        sample_interval=args.sample_interval,
+        leak_threshold_kb_per_minute=args.leak_threshold,
+        leak_min_growth_kb=args.leak_min_growth,
+        seed=args.seed,
+    ))
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    leaking = [name for name, memory in report["memory"].items() if memory["suspected_leak"]]
+    return 1 if leaking or report["concurrency"]["head_of_line_blocking"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Circuit breakers for JIRA requests.
+
+JIRA requests fall into three endpoint classes: search, issue (reads and
+writes of single issues) and metadata (projects, users, fields, server
+info...). Each class has a breaker that opens when too many of its recent
+requests failed or were slow. While a breaker is open, requests of its class
+are refused at once with CircuitOpen instead of waiting on JIRA; after
+JIRA_MCP_BREAKER_OPEN_SECONDS one request is let through as a probe, and
+its outcome closes or reopens the breaker. The probe is identified by the
+token `before` returns, so a request sent before the breaker opened that
+only completes now cannot be mistaken for it.
+"""
+import logging
+import os
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_CLASSES = ("search", "issue", "metadata")
+
+
+class CircuitOpen(Exception):
+    """A JIRA request was refused because the breaker of its endpoint class is open."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Breaker over the outcomes of the last `window` requests of one endpoint class.
+
+    Args:
+        name: Endpoint class the breaker guards
+        window: Number of recent requests considered
+        min_calls: Requests needed in the window before the breaker may open
+        error_rate: Share of failed requests (errors, timeouts, 5xx) that opens the breaker
+        slow_seconds: Requests taking longer than this count as slow
+        slow_rate: Share of slow requests that opens the breaker
+        open_seconds: Seconds the breaker stays open before letting a probe through
+    """
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 10, error_rate: float = 0.5,
+                 slow_seconds: float = 5.0, slow_rate: float = 0.5, open_seconds: float = 30.0):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._probe: Optional[int] = None
+        self._probe_ids = itertools.count(1)
+        self._reason = ""
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at < self.open_seconds:
+            return "open"
+        return "half_open"
+
+    def before(self, method: str, endpoint: str) -> Optional[int]:
+        """
+        Raise CircuitOpen unless a request of this class may be sent now.
+
+        Returns:
+            The probe token to pass to `record` when the request is the probe, else None
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return None
+            if state == "half_open" and (self._probe_started is None
+                                         or now - self._probe_started > self.open_seconds):
+                # A probe that has not answered within the open period is replaced
+                self._probe_started = now
+                self._probe = next(self._probe_ids)
+                return self._probe
+            retry_after = max(self._opened_at + self.open_seconds - now, 1.0)
+            reason = self._reason
+        kind = "read" if method.upper() == "GET" else "write"
+        raise CircuitOpen(
+            f"JIRA {self.name} requests are failing or slow ({reason}); "
+            f"{kind} {endpoint} was not sent. Try again in {retry_after:.0f} seconds.",
+            retry_after
+        )
+
+    def record(self, duration: float, failed: bool, probe: Optional[int] = None) -> None:
+        """Account for the outcome of one request of this class, given the token `before` returned for it."""
+        slow = duration > self.slow_seconds
+        with self._lock:
+            now = time.monotonic()
+            if self._opened_at is not None:
+                if probe is None or probe != self._probe:
+                    # A request sent before the breaker opened, or a probe that was replaced
+                    return
+                self._probe_started = None
+                self._probe = None
+                if failed or slow:
+                    self._open(now, "the probe request " + ("failed" if failed else "was slow"))
+                else:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                    logger.info("Circuit for JIRA %s requests closed", self.name)
+                return
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if failures >= self.error_rate * len(self._outcomes):
+                self._open(now, f"{failures} of the last {len(self._outcomes)} failed")
+            elif slow_calls >= self.slow_rate * len(self._outcomes):
+                self._open(now, f"{slow_calls} of the last {len(self._outcomes)} took over {self.slow_seconds:g}s")
+
+    def release(self, probe: Optional[int]) -> None:
+        """Forget a request whose outcome says nothing about JIRA, letting another probe through if it was the probe."""
+        with self._lock:
+            if probe is not None and probe == self._probe:
+                self._probe_started = None
+                self._probe = None
+
+    def _open(self, now: float, reason: str) -> None:
+        self._opened_at = now
+        self._reason = reason
+        self._outcomes.clear()
+        self.times_opened += 1
+        logger.warning("Circuit for JIRA %s requests opened: %s", self.name, reason)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state(time.monotonic()), "reason": self._reason or None,
+                    "times_opened": self.times_opened}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._outcomes.clear()
+            self._opened_at = None
+            self._probe_started = None
+            self._probe = None
+            self._reason = ""
+            self.times_opened = 0
+
+
+def _breaker_from_env(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        window=int(os.getenv("JIRA_MCP_BREAKER_WINDOW", "20")),
+        min_calls=int(os.getenv("JIRA_MCP_BREAKER_MIN_CALLS", "10")),
+        error_rate=float(os.getenv("JIRA_MCP_BREAKER_ERROR_RATE", "0.5")),
+        slow_seconds=float(os.getenv("JIRA_MCP_BREAKER_SLOW_SECONDS", "5")),
+        slow_rate=float(os.getenv("JIRA_MCP_BREAKER_SLOW_RATE", "0.5")),
+        open_seconds=float(os.getenv("JIRA_MCP_BREAKER_OPEN_SECONDS", "30")),
+    )
+
+
+breakers: Dict[str, CircuitBreaker] = {name: _breaker_from_env(name) for name in ENDPOINT_CLASSES}
+
+
+def endpoint_class(endpoint: str) -> str:
+    """Endpoint class of a normalized endpoint such as "GET issue/{key}/transitions"."""
+    path = endpoint.partition(" ")[2]
+    head = path.split("/", 1)[0]
+    if head == "search":
+        return "search"
+    if head in ("issue", "bulk") and not path.startswith("issue/createmeta"):
+        return "issue"
+    return "metadata"
+
+
+def breaker_for(endpoint: str) -> CircuitBreaker:
+    return breakers[endpoint_class(endpoint)]
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker, for server_stats."""
+    return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+
+def reset_breakers() -> None:
+    """Close every breaker and forget recent outcomes (used by tests)."""
+    for breaker in breakers.values():
+        breaker.reset()
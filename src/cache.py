@@ -0,0 +1,73 @@
+"""Small in-process caches shared by the tools."""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.metrics import registry
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire `ttl` seconds after they were stored.
+
+    Every lookup is recorded in the metrics registry under the cache's name,
+    so hit ratios show up in server_stats.
+
+    Args:
+        name: Name reported in metrics
+        ttl: Default lifetime of an entry in seconds
+        max_entries: Oldest entries are evicted beyond this size
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        _caches.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+        registry.record_cache(self.name, hit=entry is not None)
+        return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, value)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, or call `loader` and cache its result unless it is None."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_caches: List[TTLCache] = []
+
+
+def clear_all() -> None:
+    """Empty every cache created in this process (used by tests)."""
+    for cache in list(_caches):
+        cache.clear()
@@ -0,0 +1,327 @@
+"""
+Cached JIRA metadata used to validate tool input before it is sent.
+
+The catalog holds, per JIRA server:
+
+- the create metadata of each project (issue types, their fields, which of
+  them are required and the allowed values such as priorities), and
+- the field list from /field,
+- the priority list from /priority, and
+- the status categories from /status.
+
+Entries expire after JIRA_MCP_CATALOG_TTL seconds (default: 3600) and a
+project's entry is refreshed early when input does not match it, since the
+project configuration may have changed. When the metadata cannot be loaded
+validation is skipped and JIRA remains the judge of the input.
+"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from jira.exceptions import JIRAError
+
+from src.cache import TTLCache
+
+CATALOG_TTL = float(os.getenv("JIRA_MCP_CATALOG_TTL", "3600"))
+
+# Fields every create_issue call sets itself
+_ALWAYS_PROVIDED = {"project", "issuetype", "summary"}
+
+_create_meta = TTLCache("createmeta", CATALOG_TTL)
+_fields = TTLCache("fields", CATALOG_TTL)
+_priorities = TTLCache("priorities", CATALOG_TTL)
+_statuses = TTLCache("statuses", CATALOG_TTL)
+
+
+def server_key(jira) -> Optional[str]:
+    """Cache namespace of a client: its server URL, or None if it has none."""
+    options = getattr(jira, "_options", None)
+    server = options.get("server") if isinstance(options, dict) else None
+    return server if isinstance(server, str) else None
+
+
+def _parse_field(field: Dict[str, Any]) -> Dict[str, Any]:
+    allowed = field.get("allowedValues")
+    return {
+        "name": field.get("name", ""),
+        "required": bool(field.get("required")),
+        "has_default": bool(field.get("hasDefaultValue")),
+        "allowed": [value.get("name") or value.get("value") for value in allowed if isinstance(value, dict)]
+        if isinstance(allowed, list) else None,
+    }
+
+
+def _parse_issue_type(issue_type: Dict[str, Any], fields: Any) -> Dict[str, Any]:
+    return {
+        "id": str(issue_type.get("id")),
+        "name": issue_type.get("name", ""),
+        "subtask": bool(issue_type.get("subtask")),
+        "fields": {field_id: _parse_field(field) for field_id, field in fields.items() if isinstance(field, dict)}
+        if isinstance(fields, dict) else None,
+    }
+
+
+def _load_create_meta(jira, project_key: str) -> Optional[Dict[str, Any]]:
+    """Fetch the create metadata of one project, or None if it is unavailable."""
+    try:
+        data = jira.createmeta(projectKeys=project_key, expand="projects.issuetypes.fields")
+    except JIRAError as e:
+        if e.status_code not in (None, 400, 404, 405, 410):
+            return None
+        # JIRA Server/DC 9+ removed createmeta; list the issue types and load fields lazily
+        try:
+            data = jira.createmeta_issuetypes(project_key)
+        except Exception:
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("values"), list):
+            return None
+        issue_types = [_parse_issue_type(t, None) for t in data["values"] if isinstance(t, dict)]
+        return {"project": project_key, "issue_types": {t["name"].lower(): t for t in issue_types}}
+    except Exception:
+        return None
+
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        return None
+    project = next(
+        (p for p in data["projects"] if isinstance(p, dict) and str(p.get("key", "")).upper() == project_key.upper()),
+        None,
+    )
+    issue_types = [
+        _parse_issue_type(t, t.get("fields"))
+        for t in (project or {}).get("issuetypes", []) if isinstance(t, dict)
+    ]
+    return {"project": project_key, "issue_types": {t["name"].lower(): t for t in issue_types}}
+
+
+def get_create_meta(jira, project_key: str, refresh: bool = False) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Return the create metadata of a project and whether it came from the cache.
+
+    Returns (None, False) when the metadata cannot be loaded.
+    """
+    server = server_key(jira)
+    if server is None:
+        return None, False
+    key = (server, project_key.upper())
+    if not refresh:
+        meta = _create_meta.get(key)
+        if meta is not None:
+            return meta, True
+    meta = _load_create_meta(jira, project_key)
+    if meta is not None:
+        _create_meta.set(key, meta)
+    return meta, False
+
+
+def invalidate_project(jira, project_key: str) -> None:
+    """Drop a project's create metadata, e.g. after JIRA rejected input the catalog accepted."""
+    server = server_key(jira)
+    if server is not None:
+        _create_meta.invalidate((server, project_key.upper()))
+
+
+def _issue_type_fields(jira, project_key: str, issue_type: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Field metadata of an issue type, loading it on first use when createmeta was unavailable."""
+    if issue_type["fields"] is None:
+        try:
+            data = jira.createmeta_fieldtypes(project_key, issue_type["id"])
+        except Exception:
+            return None
+        values = data.get("values") if isinstance(data, dict) else None
+        if not isinstance(values, list):
+            return None
+        issue_type["fields"] = {
+            field.get("fieldId"): _parse_field(field) for field in values if isinstance(field, dict)
+        }
+    return issue_type["fields"]
+
+
+def match_name(value: str, allowed: Iterable[str]) -> Optional[str]:
+    """Return the allowed name matching `value` case-insensitively, or None."""
+    wanted = value.strip().lower()
+    return next((name for name in allowed if name and name.lower() == wanted), None)
+
+
+class CatalogMismatch(ValueError):
+    """Input does not match the project's metadata."""
+
+
+def _check_create(jira, meta: Dict[str, Any], project_key: str, issue_type: str,
+                  priority: Optional[str], provided: Iterable[str]) -> Tuple[str, Optional[str]]:
+    if not meta["issue_types"]:
+        raise CatalogMismatch(
+            f"Project '{project_key}' does not exist or you do not have permission to create issues in it"
+        )
+    type_meta = meta["issue_types"].get(issue_type.strip().lower())
+    if type_meta is None:
+        available = sorted(t["name"] for t in meta["issue_types"].values())
+        raise CatalogMismatch(
+            f"Issue type '{issue_type}' is not available in project {project_key}. "
+            f"Available issue types: {', '.join(available)}"
+        )
+
+    fields = _issue_type_fields(jira, project_key, type_meta)
+    if fields is None:
+        return type_meta["name"], priority
+
+    if priority:
+        priority_meta = fields.get("priority")
+        if priority_meta is None:
+            raise CatalogMismatch(
+                f"Priority cannot be set when creating a {type_meta['name']} in project {project_key}"
+            )
+        if priority_meta["allowed"] is not None:
+            matched = match_name(priority, priority_meta["allowed"])
+            if matched is None:
+                raise CatalogMismatch(
+                    f"Priority '{priority}' is not valid for {type_meta['name']} issues in project {project_key}. "
+                    f"Allowed priorities: {', '.join(priority_meta['allowed'])}"
+                )
+            priority = matched
+
+    provided = _ALWAYS_PROVIDED | set(provided)
+    not_on_screen = sorted(f for f in provided if f.startswith("customfield_") and f not in fields)
+    if not_on_screen:
+        raise CatalogMismatch(
+            f"These fields cannot be set when creating a {type_meta['name']} in project {project_key}: "
+            f"{', '.join(not_on_screen)}"
+        )
+    missing = [
+        field["name"] or field_id for field_id, field in fields.items()
+        if field["required"] and not field["has_default"] and field_id not in provided
+    ]
+    if missing:
+        raise CatalogMismatch(
+            f"Creating a {type_meta['name']} in project {project_key} requires these fields: {', '.join(sorted(missing))}"
+        )
+    return type_meta["name"], priority
+
+
+def validate_create(jira, project_key: str, issue_type: str, priority: Optional[str] = None,
+                    provided: Iterable[str] = ()) -> Tuple[str, Optional[str]]:
+    """
+    Validate create_issue input against the project's create metadata.
+
+    Args:
+        jira: JIRA client
+        project_key: Project the issue is created in
+        issue_type: Requested issue type name (matched case-insensitively)
+        priority: Requested priority name (matched case-insensitively)
+        provided: Ids of the other fields the request sets
+
+    Returns:
+        The issue type and priority names as JIRA spells them
+
+    Raises:
+        ValueError: If the input does not match the project's metadata, even after refreshing it
+    """
+    provided = list(provided)
+    meta, cached = get_create_meta(jira, project_key)
+    if meta is None:
+        return issue_type, priority
+    try:
+        return _check_create(jira, meta, project_key, issue_type, priority, provided)
+    except CatalogMismatch:
+        if not cached:
+            raise
+    # The cached metadata may be out of date; check once more against a fresh copy
+    meta, _ = get_create_meta(jira, project_key, refresh=True)
+    if meta is None:
+        return issue_type, priority
+    return _check_create(jira, meta, project_key, issue_type, priority, provided)
+
+
+def editable_values(issue, field_id: str) -> Tuple[bool, Optional[List[str]]]:
+    """
+    Read a field's edit metadata from an issue fetched with expand="editmeta".
+
+    Returns:
+        (known, allowed): known is False when the issue carries no edit
+        metadata; otherwise allowed is None if the field cannot be edited,
+        else the list of allowed value names ([] when any value is accepted)
+    """
+    raw = getattr(issue, "raw", None)
+    editmeta = raw.get("editmeta") if isinstance(raw, dict) else None
+    fields = editmeta.get("fields") if isinstance(editmeta, dict) else None
+    if not isinstance(fields, dict):
+        return False, None
+    field = fields.get(field_id)
+    if not isinstance(field, dict):
+        return True, None
+    return True, _parse_field(field)["allowed"] or []
+
+
+def get_fields(jira) -> Optional[List[Dict[str, Any]]]:
+    """Return the server's field list (GET /field), cached per server."""
+    server = server_key(jira)
+    if server is None:
+        return None
+
+    def load():
+        try:
+            fields = jira.fields()
+        except Exception:
+            return None
+        return fields if isinstance(fields, list) else None
+
+    return _fields.get_or_load(server, load)
+
+
+def prime_field_cache(jira) -> None:
+    """
+    Fill the client's JQL-name-to-field-id map from the cached field list.
+
+    The JIRA client otherwise fetches /field again for every new client
+    the first time it searches.
+    """
+    fields = get_fields(jira)
+    if not fields or getattr(jira, "_fields_cache_value", None):
+        return
+    index = {}
+    for field in fields:
+        for name in field.get("clauseNames", []):
+            index[name] = field["id"]
+    jira._fields_cache_value = index
+
+
+def get_priorities(jira) -> Optional[List[Dict[str, Any]]]:
+    """Return the server's priorities as {"id", "name"} dicts (GET /priority), cached per server."""
+    server = server_key(jira)
+    if server is None:
+        return None
+
+    def load():
+        try:
+            priorities = jira.priorities()
+        except Exception:
+            return None
+        if not isinstance(priorities, list):
+            return None
+        raws = [getattr(priority, "raw", None) for priority in priorities]
+        return [{"id": str(raw.get("id")), "name": raw.get("name", "")} for raw in raws if isinstance(raw, dict)]
+
+    return _priorities.get_or_load(server, load)
+
+
+def get_status_categories(jira) -> Optional[Dict[str, str]]:
+    """
+    Return the category key ("new", "indeterminate" or "done") of every status by name
+    (GET /status), cached per server.
+    """
+    server = server_key(jira)
+    if server is None:
+        return None
+
+    def load():
+        try:
+            statuses = jira.statuses()
+        except Exception:
+            return None
+        if not isinstance(statuses, list):
+            return None
+        raws = [getattr(status, "raw", None) for status in statuses]
+        return {
+            raw.get("name", ""): (raw.get("statusCategory") or {}).get("key", "indeterminate")
+            for raw in raws if isinstance(raw, dict)
+        }
+
+    return _statuses.get_or_load(server, load)
@@ -0,0 +1,57 @@
+"""Running blocking JIRA calls concurrently from inside a tool."""
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Worker threads per bulk operation; requests are still bounded by the shared rate limit
+BULK_WORKERS = int(os.getenv("JIRA_MCP_BULK_WORKERS", "8"))
+
+
+def run_concurrently(
+    fn: Callable[[T], Any],
+    items: Iterable[T],
+    max_workers: Optional[int] = None,
+    on_done: Optional[Callable[[int, T, Any, Optional[BaseException]], None]] = None,
+) -> List[Tuple[T, Any, Optional[BaseException]]]:
+    """
+    Call `fn` for every item on a thread pool.
+
+    Each call runs in a copy of the caller's context, so the metrics and
+    tracing of the calling tool also see the requests made by the workers.
+
+    Args:
+        fn: Function called with one item
+        items: Items to process
+        max_workers: Thread count (default: JIRA_MCP_BULK_WORKERS)
+        on_done: Optional callback invoked from the calling thread as each call completes,
+            in completion order, with the item's index, the item, its result and its error
+
+    Returns:
+        (item, result, error) for every item, in input order; error is the
+        exception raised by `fn`, if any
+    """
+    items = list(items)
+    if not items:
+        return []
+    workers = max(1, min(max_workers or BULK_WORKERS, len(items)))
+
+    def call(item):
+        try:
+            return fn(item), None
+        except Exception as e:
+            return None, e
+
+    outcomes: List[Optional[Tuple[Any, Optional[BaseException]]]] = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jira-mcp-bulk") as pool:
+        futures = {
+            pool.submit(contextvars.copy_context().run, call, item): index for index, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            outcomes[index] = result, error = future.result()
+            if on_done is not None:
+                on_done(index, items[index], result, error)
+    return [(item, *outcome) for item, outcome in zip(items, outcomes)]
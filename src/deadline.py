@@ -0,0 +1,157 @@
+"""
+Per-call deadlines and cancellation for tool calls.
+
+Every registered tool accepts a `timeout_seconds` argument; without it the
+tool's default from JIRA_MCP_TOOL_TIMEOUTS (e.g. "search_issues=20,
+bulk_transition=300") or JIRA_MCP_TOOL_TIMEOUT (default: 60) applies. The
+deadline is carried in a context variable, so the HTTP hooks see it for
+every JIRA request the call makes, including requests made by worker
+threads of bulk tools. Each request is sent with a timeout no longer than
+the time left, and no request is started once the deadline has passed or
+the call was cancelled.
+"""
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Seconds a tool call may take when neither the caller nor JIRA_MCP_TOOL_TIMEOUTS say otherwise
+DEFAULT_TIMEOUT = 60.0
+
+# Defaults for tools that are expected to take longer than one or two round trips
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "bulk_transition": 300.0,
+    "bulk_update_issues": 300.0,
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """The tool call ran out of time."""
+
+
+class CallCancelled(Exception):
+    """The client cancelled the tool call."""
+
+
+class CallBudget:
+    """The deadline and cancellation flag of one tool call."""
+
+    __slots__ = ("tool", "timeout", "deadline", "_cancelled")
+
+    def __init__(self, tool: str, timeout: float):
+        self.tool = tool
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def cancel(self) -> None:
+        """Stop the call from starting further JIRA requests."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        """Raise if the call was cancelled or its deadline has passed."""
+        if self._cancelled.is_set():
+            raise CallCancelled(f"{self.tool} was cancelled")
+        if self.remaining() <= 0:
+            raise self.exceeded()
+
+    def exceeded(self) -> DeadlineExceeded:
+        return DeadlineExceeded(f"{self.tool} did not finish within {self.timeout:g} seconds")
+
+
+_current: contextvars.ContextVar[Optional[CallBudget]] = contextvars.ContextVar("jira_mcp_call_budget", default=None)
+
+
+def current_budget() -> Optional[CallBudget]:
+    """The budget of the tool call running in this context, if any."""
+    return _current.get()
+
+
+def tool_timeout(tool: str) -> float:
+    """Default timeout of a tool, from JIRA_MCP_TOOL_TIMEOUTS, TOOL_TIMEOUTS or JIRA_MCP_TOOL_TIMEOUT."""
+    for entry in os.getenv("JIRA_MCP_TOOL_TIMEOUTS", "").split(","):
+        name, _, value = entry.partition("=")
+        if name.strip() == tool and value.strip():
+            return float(value)
+    if tool in TOOL_TIMEOUTS:
+        return TOOL_TIMEOUTS[tool]
+    return float(os.getenv("JIRA_MCP_TOOL_TIMEOUT", str(DEFAULT_TIMEOUT)))
+
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+def request_timeout(timeout: Timeout) -> Tuple[Timeout, bool]:
+    """
+    Clamp a requests timeout to the time left in the current call.
+
+    Returns:
+        (timeout, limited): limited is True when the deadline, not the
+        original timeout, decides when the request gives up
+    """
+    budget = _current.get()
+    if budget is None:
+        return timeout, False
+    budget.check()
+    left = max(budget.remaining(), 0.001)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        limited = connect is None or read is None or connect > left or read > left
+        return (min(connect, left) if connect is not None else left,
+                min(read, left) if read is not None else left), limited
+    if timeout is None or timeout > left:
+        return left, True
+    return timeout, False
+
+
+def start_call(tool: str, timeout_seconds: Optional[float] = None) -> CallBudget:
+    """Budget for a new call of `tool`, lasting timeout_seconds or the tool's default."""
+    timeout = timeout_seconds if timeout_seconds and timeout_seconds > 0 else tool_timeout(tool)
+    return CallBudget(tool, timeout)
+
+
+def use_budget(budget: CallBudget) -> contextvars.Token:
+    """Make `budget` the current call's budget; reset the returned token to undo it."""
+    return _current.set(budget)
+
+
+def with_deadline(fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Wrap a tool function so it accepts `timeout_seconds` and runs under a deadline.
+
+    The wrapper's signature is the tool's plus the optional timeout_seconds
+    parameter, so FastMCP includes it in the tool's argument schema. When the
+    call already runs under a budget for the same tool, e.g. one started when
+    the call was queued for a worker thread, that budget is kept.
+    """
+    tool_name = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, timeout_seconds: Optional[float] = None, **kwargs):
+        budget = _current.get()
+        if budget is None or budget.tool != tool_name:
+            budget = start_call(tool_name, timeout_seconds)
+        token = _current.set(budget)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    signature = inspect.signature(fn)
+    parameters = list(signature.parameters.values())
+    if "timeout_seconds" not in signature.parameters:
+        parameters.append(inspect.Parameter(
+            "timeout_seconds", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[float]
+        ))
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
@@ -0,0 +1,274 @@
+"""
+Field name resolution and type-aware value rendering.
+
+Callers can name fields by id ("customfield_10016"), display name
+("Story Points") or JQL clause name ("cf[10016]"), case-insensitively. The
+index is built from the cached field list (see src.catalog), and each
+requested field set is compiled once into a projection: a tuple of
+(output name, field id, extractor) entries applied to raw issue JSON.
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.cache import TTLCache
+from src.catalog import CATALOG_TTL, get_fields, server_key
+
+Extractor = Callable[[Any], Any]
+Projection = Tuple[Tuple[str, str, Extractor], ...]
+
+# Fields whose JSON is not described by a schema in the field list
+_SPECIAL_FIELDS = {"key"}
+
+_indexes = TTLCache("field_index", CATALOG_TTL)
+_projections = TTLCache("field_projections", CATALOG_TTL)
+
+_SPRINT_NAME = re.compile(r"name=([^,\]]*)")
+
+
+def _name(value: Any) -> Any:
+    if isinstance(value, dict):
+        return value.get("name", value.get("value", value.get("key")))
+    return value
+
+
+def _user(value: Any) -> Any:
+    if isinstance(value, dict):
+        return value.get("displayName") or value.get("name") or value.get("accountId")
+    return value
+
+
+def _option(value: Any) -> Any:
+    if isinstance(value, dict):
+        rendered = value.get("value", value.get("name"))
+        child = value.get("child")
+        return f"{rendered} - {_option(child)}" if isinstance(child, dict) else rendered
+    return value
+
+
+def _sprint(value: Any) -> Any:
+    # Cloud returns sprint objects; older servers return serialized strings
+    if isinstance(value, dict):
+        return value.get("name")
+    if isinstance(value, str):
+        match = _SPRINT_NAME.search(value)
+        return match.group(1) if match else value
+    return value
+
+
+def _issue_key(value: Any) -> Any:
+    if isinstance(value, dict):
+        return value.get("key")
+    return value
+
+
+def _issue_link(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    linked = value.get("outwardIssue") or value.get("inwardIssue") or {}
+    direction = "outward" if "outwardIssue" in value else "inward"
+    return {"type": (value.get("type") or {}).get(direction), "key": linked.get("key")}
+
+
+def _comments(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    return [
+        {"author": _user(comment.get("author")), "created": comment.get("created"), "body": comment.get("body")}
+        for comment in value.get("comments", [])
+    ]
+
+
+def _progress(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: value.get(key) for key in ("progress", "total", "percent") if key in value}
+    return value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _each(extractor: Extractor) -> Extractor:
+    def extract(values: Any) -> Any:
+        if not isinstance(values, list):
+            return extractor(values)
+        return [extractor(value) for value in values]
+    return extract
+
+
+# Extractors by schema "type" (or "items" for arrays)
+_EXTRACTORS: Dict[str, Extractor] = {
+    "user": _user,
+    "status": _name,
+    "priority": _name,
+    "issuetype": _name,
+    "resolution": _name,
+    "securitylevel": _name,
+    "version": _name,
+    "component": _name,
+    "project": _issue_key,
+    "option": _option,
+    "option-with-child": _option,
+    "issuelink": _issue_key,
+    "issuelinks": _issue_link,
+    "comments-page": _comments,
+    "progress": _progress,
+}
+
+
+def extractor_for(schema: Optional[Dict[str, Any]]) -> Extractor:
+    """Pick the value extractor for a field schema from the field list."""
+    if not isinstance(schema, dict):
+        return _identity
+    custom = schema.get("custom") or ""
+    if custom.endswith(":gh-sprint"):
+        return _each(_sprint)
+    if schema.get("type") == "array":
+        if schema.get("system") == "subtasks":
+            return _each(_issue_key)
+        return _each(_EXTRACTORS.get(schema.get("items"), _identity))
+    return _EXTRACTORS.get(schema.get("type"), _identity)
+
+
+def field_index(jira) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Map lower-cased ids, names and clause names to field descriptions.
+
+    Returns None when the field list is unavailable. When two fields share a
+    name, ids and system fields win over custom fields.
+    """
+    server = server_key(jira)
+    if server is None:
+        return None
+    index = _indexes.get(server)
+    if index is not None:
+        return index
+    fields = get_fields(jira)
+    if not fields:
+        return None
+    index = {}
+    # Custom fields first, so system fields and ids overwrite ambiguous names
+    for field in sorted(fields, key=lambda f: not f.get("custom", False)):
+        entry = {"id": field["id"], "name": field.get("name", field["id"]), "schema": field.get("schema")}
+        for alias in [field.get("name")] + list(field.get("clauseNames", [])):
+            if alias:
+                index[alias.lower()] = entry
+    for field in fields:
+        index[field["id"].lower()] = {"id": field["id"], "name": field.get("name", field["id"]), "schema": field.get("schema")}
+    _indexes.set(server, index)
+    return index
+
+
+def resolve_field(jira, name: str) -> Optional[Dict[str, Any]]:
+    """Look up one field by id, name or clause name; None if unknown or the index is unavailable."""
+    index = field_index(jira)
+    return index.get(name.strip().lower()) if index else None
+
+
+def compile_projection(jira, requested: Sequence[str]) -> Projection:
+    """
+    Compile a requested field list into a projection, cached per server and field set.
+
+    Raises:
+        ValueError: If a requested field is not known to the server
+    """
+    requested = tuple(name.strip() for name in requested if name.strip())
+    server = server_key(jira)
+    cache_key = (server, requested)
+    if server is not None:
+        projection = _projections.get(cache_key)
+        if projection is not None:
+            return projection
+
+    index = field_index(jira)
+    entries = []
+    unknown = []
+    for name in requested:
+        if name.lower() in _SPECIAL_FIELDS:
+            continue
+        if index is None:
+            # Without the field list, pass names through and return raw values
+            entries.append((name, name, _identity))
+            continue
+        field = index.get(name.lower())
+        if field is None:
+            unknown.append(name)
+            continue
+        entries.append((name, field["id"], extractor_for(field["schema"])))
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Use a field id (e.g. customfield_10016), "
+            f"its name (e.g. \"Story Points\") or its JQL clause name."
+        )
+
+    projection = tuple(entries)
+    if server is not None and index is not None:
+        _projections.set(cache_key, projection)
+    return projection
+
+
+def project_issue(raw: Dict[str, Any], projection: Projection) -> Dict[str, Any]:
+    """Render one raw issue with only the projected fields."""
+    fields = raw.get("fields") or {}
+    result = {"key": raw.get("key")}
+    for output, field_id, extract in projection:
+        value = fields.get(field_id)
+        result[output] = None if value is None else extract(value)
+    return result
+
+
+def encode_value(schema: Optional[Dict[str, Any]], value: Any) -> Any:
+    """Convert a plain value into the JSON JIRA expects for a field of this schema."""
+    if isinstance(value, dict) or not isinstance(schema, dict):
+        return value
+    field_type = schema.get("type")
+    custom = schema.get("custom") or ""
+    if custom.endswith(":gh-sprint"):
+        return int(value)
+    if field_type == "number":
+        return float(value)
+    if field_type in ("option", "option-with-child"):
+        return {"value": value}
+    if field_type in ("user",):
+        return {"name": value}
+    if field_type in ("priority", "version", "component", "securitylevel", "resolution"):
+        return {"name": value}
+    if field_type == "array":
+        values = value if isinstance(value, list) else [value]
+        items = schema.get("items")
+        if items == "option":
+            return [v if isinstance(v, dict) else {"value": v} for v in values]
+        if items in ("user", "version", "component"):
+            return [v if isinstance(v, dict) else {"name": v} for v in values]
+        return values
+    return value
+
+
+def encode_fields(jira, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve field names to ids and encode their values for a create or update request.
+
+    Raises:
+        ValueError: If a field is not known to the server
+    """
+    index = field_index(jira)
+    encoded = {}
+    unknown = []
+    for name, value in values.items():
+        if index is None:
+            encoded[name] = value
+            continue
+        field = index.get(name.strip().lower())
+        if field is None:
+            unknown.append(name)
+            continue
+        encoded[field["id"]] = encode_value(field["schema"], value)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return encoded
+
+
+def field_names(jira, field_ids: List[str]) -> List[str]:
+    """Display names of field ids, for messages."""
+    index = field_index(jira) or {}
+    return [index.get(field_id.lower(), {}).get("name", field_id) for field_id in field_ids]
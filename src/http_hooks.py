@@ -0,0 +1,285 @@
+"""Hooks around every HTTP request the JIRA client makes."""
+import contextvars
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from requests import Session
+from requests.exceptions import Timeout
+
+from src.breaker import breaker_for
+from src.deadline import CallBudget, current_budget, request_timeout
+
+# Path prefixes stripped from endpoint names, e.g. "/rest/api/2/issue/X" -> "issue/{key}"
+_API_PREFIX = re.compile(r"^/rest/(?:api/\d+|agile/[\d.]+)/")
+_ISSUE_KEY = re.compile(r"^[A-Za-z][A-Za-z0-9_]*-\d+$")
+_NUMERIC_ID = re.compile(r"^\d+$")
+
+
+class RequestRecord:
+    """One HTTP attempt made by the JIRA client."""
+
+    __slots__ = (
+        "method", "url", "endpoint", "status", "duration", "bytes_sent",
+        "bytes_received", "attempt", "error", "started",
+    )
+
+    def __init__(self, method: str, url: str, started: float):
+        self.method = method
+        self.url = url
+        self.endpoint = normalize_endpoint(method, url)
+        self.started = started
+        self.status: Optional[int] = None
+        self.duration = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.attempt = 1
+        self.error: Optional[BaseException] = None
+
+    @property
+    def is_retry(self) -> bool:
+        return self.attempt > 1
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every JIRA request of the process.
+
+    Args:
+        rate: Requests per second (0 disables limiting)
+        burst: Requests that may be made at once after an idle period
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, budget: Optional[CallBudget] = None) -> float:
+        """
+        Block until a request may be sent; returns the seconds waited.
+
+        With a call budget, raises instead of waiting past its deadline.
+        """
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                delay = self._paused_until - now
+                if delay <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                if delay <= 0:
+                    delay = (1 - self._tokens) / self.rate
+            if budget is not None:
+                budget.check()
+                if delay >= budget.remaining():
+                    raise budget.exceeded()
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for `seconds`, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _limiter_from_env() -> RateLimiter:
+    rate = float(os.getenv("JIRA_MCP_RATE_LIMIT", "50"))
+    burst = os.getenv("JIRA_MCP_RATE_BURST")
+    return RateLimiter(rate, float(burst) if burst else None)
+
+
+_limiter = _limiter_from_env()
+
+
+_observers: List[Callable[[RequestRecord], None]] = []
+_local = threading.local()
+
+
+def add_observer(observer: Callable[[RequestRecord], None]) -> None:
+    """Register a callable invoked with a RequestRecord after every HTTP attempt."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer: Callable[[RequestRecord], None]) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def normalize_endpoint(method: str, url: str) -> str:
+    """
+    Turn a request URL into a low-cardinality endpoint name.
+
+    Issue keys and numeric ids in the path are replaced by placeholders, so
+    "GET /rest/api/2/issue/PROJ-1/transitions" becomes "GET issue/{key}/transitions".
+    """
+    path = _API_PREFIX.sub("", urlparse(url).path)
+    segments = []
+    previous = None
+    for segment in path.strip("/").split("/"):
+        if _ISSUE_KEY.match(segment):
+            segment = "{key}"
+        elif _NUMERIC_ID.match(segment):
+            segment = "{id}"
+        elif previous == "project":
+            segment = "{key}"
+        segments.append(segment)
+        previous = segment
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+def _body_length(body: Any) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return 0
+
+
+def _retry_after(response) -> float:
+    try:
+        return min(float(response.headers.get("Retry-After", "1")), 60.0)
+    except ValueError:
+        return 1.0
+
+
+def _notify(record: RequestRecord) -> None:
+    for observer in list(_observers):
+        try:
+            observer(record)
+        except Exception:
+            # Observers must never break the request path
+            pass
+
+
+# Overrides the client's max_retries for the requests of the current context
+_max_retries: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("jira_mcp_max_retries", default=None)
+
+
+@contextmanager
+def single_attempt() -> Iterator[None]:
+    """Within the block, the JIRA client does not resend this context's failed requests itself."""
+    token = _max_retries.set(0)
+    try:
+        yield
+    finally:
+        _max_retries.reset(token)
+
+
+class _CallRetries:
+    """
+    max_retries of a session shared by concurrent calls.
+
+    ResilientSession reads max_retries before every retry; reading it through
+    this descriptor lets one call turn retries off without affecting others.
+    """
+
+    def __get__(self, session, owner=None):
+        if session is None:
+            return self
+        override = _max_retries.get()
+        return session.__dict__["_mcp_max_retries"] if override is None else override
+
+    def __set__(self, session, value):
+        session.__dict__["_mcp_max_retries"] = value
+
+
+_retry_classes: Dict[type, type] = {}
+
+
+def _with_call_retries(session: Session) -> None:
+    if "max_retries" not in vars(session):
+        return
+    retries = vars(session).pop("max_retries")
+    cls = type(session)
+    if cls not in _retry_classes:
+        _retry_classes[cls] = type(cls.__name__, (cls,), {"max_retries": _CallRetries()})
+    session.__class__ = _retry_classes[cls]
+    session.max_retries = retries
+
+
+def instrument_session(session: Session) -> Session:
+    """
+    Wrap a requests Session so every HTTP attempt is reported to the observers.
+
+    Both `request` (one logical call, possibly retried by the JIRA client's
+    ResilientSession) and `send` (one attempt on the wire) are wrapped, so
+    retries show up as records with attempt > 1. Every attempt first takes a
+    token from the shared rate limiter, and a 429 response pauses the
+    limiter for the server's Retry-After time. Within a tool call, attempts
+    are not started after the call's deadline or cancellation, and their
+    timeout is cut to the time left. Attempts are refused while the circuit
+    breaker of their endpoint class is open, and their outcome is recorded
+    by it otherwise, except for timeouts cut short by the call's deadline. The session's max_retries can be overridden per call
+    with single_attempt.
+    """
+    if getattr(session, "_mcp_instrumented", False):
+        return session
+    _with_call_retries(session)
+
+    original_request = session.request
+    original_send = session.send
+
+    def request(*args, **kwargs):
+        outer = getattr(_local, "attempt", None)
+        _local.attempt = 0
+        try:
+            return original_request(*args, **kwargs)
+        finally:
+            _local.attempt = outer
+
+    def send(prepared, **kwargs):
+        budget = current_budget()
+        _limiter.acquire(budget)
+        kwargs["timeout"], limited = request_timeout(kwargs.get("timeout"))
+        record = RequestRecord(prepared.method or "GET", prepared.url or "", time.perf_counter())
+        breaker = breaker_for(record.endpoint)
+        probe = breaker.before(record.method, record.endpoint)
+        attempt = getattr(_local, "attempt", None)
+        if attempt is not None:
+            _local.attempt = attempt + 1
+            record.attempt = attempt + 1
+        record.bytes_sent = _body_length(prepared.body)
+        try:
+            response = original_send(prepared, **kwargs)
+        except BaseException as e:
+            record.error = e
+            record.duration = time.perf_counter() - record.started
+            if limited and isinstance(e, Timeout):
+                # Cut short by the call's deadline, not a timeout of JIRA's own
+                breaker.release(probe)
+            else:
+                breaker.record(record.duration, failed=True, probe=probe)
+            _notify(record)
+            if limited and budget is not None and isinstance(e, Timeout):
+                raise budget.exceeded() from e
+            raise
+        record.duration = time.perf_counter() - record.started
+        record.status = response.status_code
+        breaker.record(record.duration, failed=response.status_code >= 500, probe=probe)
+        if response.status_code == 429:
+            _limiter.pause(_retry_after(response))
+        if kwargs.get("stream"):
+            record.bytes_received = int(response.headers.get("Content-Length") or 0)
+        else:
+            record.bytes_received = len(response.content or b"")
+        _notify(record)
+        return response
+
+    session.request = request
+    session.send = send
+    session._mcp_instrumented = True
+    return session
@@ -0,0 +1,341 @@
+"""
+Write-behind journal for low-risk JIRA writes.
+
+Deferred writes (e.g. add_comment with deferred=True) are recorded in a
+local SQLite journal and acknowledged with a receipt straight away. A
+background worker drains the journal: each round it claims up to
+JIRA_MCP_JOURNAL_BATCH due writes, performs them concurrently across issues
+and in journal order within an issue, and retries transient failures with
+exponential backoff. Writes still pending when the server stops are picked
+up again on the next start.
+
+Delivery is at-least-once: a write interrupted after JIRA accepted it but
+before the journal recorded that is performed again after a restart.
+
+The journal is a store like those of src.stores, kept in the state directory
+unless JIRA_MCP_JOURNAL names another file.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.breaker import CircuitOpen
+from src.concurrency import run_concurrently
+from src.retry import backoff, is_transient
+from src.sessions import remember_receipt
+from src.stores import SQLiteStore, state_dir
+
+JOURNAL_BATCH = int(os.getenv("JIRA_MCP_JOURNAL_BATCH", "20"))
+
+# Attempts before a transiently failing write is marked as failed
+MAX_ATTEMPTS = int(os.getenv("JIRA_MCP_JOURNAL_MAX_ATTEMPTS", "8"))
+
+# Seconds completed writes are kept for write_status before they are pruned
+DONE_RETENTION = 24 * 3600.0
+
+# Seconds a claimed write belongs to the journal that claimed it; another process
+# sharing the file may only take it back once the lease has expired
+LEASE_SECONDS = float(os.getenv("JIRA_MCP_JOURNAL_LEASE", "600"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    receipt TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    issue_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    next_attempt REAL NOT NULL,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS writes_due ON writes (state, next_attempt);
+CREATE INDEX IF NOT EXISTS writes_issue ON writes (issue_key, id);
+"""
+
+
+def journal_path() -> str:
+    """Journal file from JIRA_MCP_JOURNAL (default: writes.sqlite3 in the state directory)."""
+    return os.getenv("JIRA_MCP_JOURNAL") or os.path.join(state_dir(), "writes.sqlite3")
+
+
+def _write_comment(jira, issue_key: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    comment = jira.add_comment(issue_key, payload["body"])
+    return {"comment_id": str(getattr(comment, "id", ""))}
+
+
+# Functions performing each kind of deferred write; they return a JSON-serializable result
+_WRITERS: Dict[str, Callable[[Any, str, Dict[str, Any]], Dict[str, Any]]] = {
+    "comment": _write_comment,
+}
+
+
+class WriteJournal(SQLiteStore):
+    """
+    SQLite journal of deferred writes, safe to share between threads and processes.
+
+    Each journal claims writes under its own owner id with a lease of
+    LEASE_SECONDS. Claiming is one immediate transaction, so two processes on
+    the same file never claim the same write, and a write in flight is only
+    taken back once its lease has expired, e.g. because its process died.
+    """
+
+    schema = _SCHEMA
+
+    def __init__(self, path: str):
+        self.owner = uuid.uuid4().hex
+        super().__init__(path)
+
+    def prepare(self) -> None:
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(writes)")}
+        # Journals written before writes had owners
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE writes ADD COLUMN {column} {kind}")
+        self._expire_leases(self._db, time.time())
+        self._db.execute(
+            "DELETE FROM writes WHERE state = 'done' AND updated < ?", (time.time() - DONE_RETENTION,)
+        )
+
+    def enqueue(self, kind: str, issue_key: str, payload: Dict[str, Any]) -> str:
+        """Record a write and return its receipt."""
+        if kind not in _WRITERS:
+            raise ValueError(f"Unknown write kind '{kind}'")
+        receipt = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO writes (receipt, kind, issue_key, payload, created, updated, next_attempt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (receipt, kind, issue_key.upper(), json.dumps(payload), now, now, now),
+            )
+        return receipt
+
+    @staticmethod
+    def _expire_leases(db, now: float) -> None:
+        # Writes claimed by a worker that did not finish in time are due again
+        db.execute(
+            "UPDATE writes SET state = 'pending', owner = NULL, lease_until = NULL "
+            "WHERE state = 'in_flight' AND COALESCE(lease_until, 0) < ?",
+            (now,),
+        )
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Mark up to `limit` due writes as in flight and return them in journal order.
+
+        A write is only due when no earlier write of the same issue is still
+        pending or in flight, so the writes of an issue keep their order.
+        """
+        now = time.time()
+        with self.transaction(immediate=True) as db:
+            self._expire_leases(db, now)
+            rows = db.execute(
+                "SELECT * FROM writes w WHERE state = 'pending' AND next_attempt <= ? AND NOT EXISTS ("
+                "  SELECT 1 FROM writes e WHERE e.issue_key = w.issue_key AND e.id < w.id"
+                "  AND (e.state = 'in_flight' OR (e.state = 'pending' AND e.next_attempt > ?))"
+                ") ORDER BY id LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            if rows:
+                db.execute(
+                    "UPDATE writes SET state = 'in_flight', owner = ?, lease_until = ?, updated = ? "
+                    f"WHERE id IN ({','.join('?' * len(rows))})",
+                    [self.owner, now + LEASE_SECONDS, now] + [row["id"] for row in rows],
+                )
+        return [dict(row) for row in rows]
+
+    def complete(self, write_id: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE writes SET state = 'done', result = ?, last_error = NULL, owner = NULL, lease_until = NULL, "
+                "updated = ? WHERE id = ?",
+                (json.dumps(result), time.time(), write_id),
+            )
+
+    def fail(self, write_id: int, attempts: int, error: BaseException) -> None:
+        """Schedule a retry for a transient failure, or mark the write as failed."""
+        now = time.time()
+        message = getattr(error, "text", None) or str(error) or type(error).__name__
+        retry = is_transient(error) and attempts < MAX_ATTEMPTS
+        delay = backoff(attempts, base=1.0, cap=300.0) if retry else 0.0
+        if isinstance(error, CircuitOpen):
+            # The write never reached JIRA: wait for the breaker without using up an attempt
+            attempts, retry, delay = attempts - 1, True, error.retry_after
+        with self._lock:
+            self._db.execute(
+                "UPDATE writes SET state = ?, attempts = ?, last_error = ?, updated = ?, next_attempt = ?, "
+                "owner = NULL, lease_until = NULL WHERE id = ? AND state = 'in_flight' AND owner = ?",
+                ("pending" if retry else "failed", attempts, message, now, now + delay, write_id, self.owner),
+            )
+
+    def release(self, write_id: int) -> None:
+        """Return a claimed write that was not attempted to the pending state."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE writes SET state = 'pending', owner = NULL, lease_until = NULL "
+                "WHERE id = ? AND state = 'in_flight' AND owner = ?",
+                (write_id, self.owner),
+            )
+
+    def retry_failed(self, receipts: Optional[List[str]] = None) -> int:
+        """Make every failed write (of the given receipts) pending again; returns how many were requeued."""
+        now = time.time()
+        where, params = _receipt_filter(receipts)
+        with self._lock:
+            return self._db.execute(
+                "UPDATE writes SET state = 'pending', attempts = 0, next_attempt = ?, updated = ? "
+                f"WHERE state = 'failed'{where}",
+                [now, now] + params,
+            ).rowcount
+
+    def counts(self, receipts: Optional[List[str]] = None) -> Dict[str, int]:
+        where, params = _receipt_filter(receipts)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT state, COUNT(*) FROM writes WHERE 1 = 1{where} GROUP BY state", params
+            ).fetchall()
+        counts = {"pending": 0, "in_flight": 0, "done": 0, "failed": 0}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+    def items(self, states: List[str], limit: int, receipts: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        where, params = _receipt_filter(receipts)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM writes WHERE state IN ({','.join('?' * len(states))}){where} ORDER BY id LIMIT ?",
+                list(states) + params + [limit],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def item(self, receipt: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM writes WHERE receipt = ?", (receipt,)).fetchone()
+        return dict(row) if row else None
+
+
+def _receipt_filter(receipts: Optional[List[str]]) -> Tuple[str, List[str]]:
+    """SQL condition restricting a query to the given receipts (None: no restriction)."""
+    if receipts is None:
+        return "", []
+    return f" AND receipt IN ({','.join('?' * len(receipts))})", list(receipts)
+
+
+def drain_once(journal: WriteJournal, jira, batch: int = JOURNAL_BATCH) -> int:
+    """
+    Perform one batch of due writes.
+
+    Writes of different issues run concurrently; the writes of one issue run
+    in order and stop at the first failure, so a retried write is never
+    overtaken by a later one.
+
+    Returns:
+        Number of writes claimed
+    """
+    claimed = journal.claim(batch)
+    by_issue: Dict[str, List[Dict[str, Any]]] = {}
+    for write in claimed:
+        by_issue.setdefault(write["issue_key"], []).append(write)
+
+    def perform(writes: List[Dict[str, Any]]) -> None:
+        for index, write in enumerate(writes):
+            try:
+                result = _WRITERS[write["kind"]](jira, write["issue_key"], json.loads(write["payload"]))
+            except Exception as e:
+                journal.fail(write["id"], write["attempts"] + 1, e)
+                for later in writes[index + 1:]:
+                    journal.release(later["id"])
+                return
+            journal.complete(write["id"], result)
+
+    run_concurrently(perform, list(by_issue.values()))
+    return len(claimed)
+
+
+class WriteBehindWorker:
+    """Daemon thread draining a journal whenever writes are due."""
+
+    def __init__(self, journal: WriteJournal, client_factory: Callable[[], Any], poll_interval: float = 5.0):
+        self.journal = journal
+        self.client_factory = client_factory
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._jira = None
+        self._thread = threading.Thread(target=self._run, name="jira-mcp-write-behind", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake the worker because a write was enqueued."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            claimed = 0
+            try:
+                if self._jira is None:
+                    self._jira = self.client_factory()
+                claimed = drain_once(self.journal, self._jira)
+            except Exception:
+                # E.g. JIRA unreachable while creating the client; try again on the next round
+                self._jira = None
+            if claimed < JOURNAL_BATCH:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+_journal: Optional[WriteJournal] = None
+_worker: Optional[WriteBehindWorker] = None
+_state_lock = threading.Lock()
+
+
+def get_journal() -> WriteJournal:
+    """Return the process's journal, opening it on first use."""
+    global _journal
+    with _state_lock:
+        if _journal is None:
+            _journal = WriteJournal(journal_path())
+        return _journal
+
+
+def ensure_worker() -> WriteBehindWorker:
+    """Start the background worker if it is not running yet."""
+    global _worker
+    journal = get_journal()
+    with _state_lock:
+        if _worker is None:
+            from src.main import initialize_jira
+            _worker = WriteBehindWorker(journal, initialize_jira)
+            _worker.start()
+        return _worker
+
+
+def submit(kind: str, issue_key: str, payload: Dict[str, Any]) -> str:
+    """Journal a write, wake the worker and return the receipt."""
+    receipt = get_journal().enqueue(kind, issue_key, payload)
+    remember_receipt(receipt)
+    ensure_worker().notify()
+    return receipt
+
+
+def resume_pending() -> None:
+    """Start the worker at server start when writes from a previous run are still pending."""
+    if os.path.exists(journal_path()):
+        counts = get_journal().counts()
+        if counts["pending"] or counts["in_flight"]:
+            ensure_worker()
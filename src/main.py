@@ -1,14 +1,34 @@
 #!/usr/bin/env python3
 import os
+import threading
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 from jira import JIRA
+from requests.adapters import HTTPAdapter
+
+from src.deadline import with_deadline
+from src.http_hooks import instrument_session
+from src.metrics import instrument_tool, start_prometheus_exporter
+from src.offload import offload_tool
+from src.profiling import profile_tool
+from src.sessions import enable_isolation
+from src.tracing import configure_from_env as configure_tracing, install_log_correlation, trace_tool
 
 # Load environment variables from .env file
 load_dotenv()
 
+# JIRA clients shared by every tool call, keyed by server, credentials and timeout
+_clients = {}
+_clients_lock = threading.Lock()
+
 def initialize_jira():
-    """Initialize and return JIRA client connection using environment variables."""
+    """
+    Return the JIRA client for the server configured in the environment.
+    
+    The client is created on first use and shared by all tool calls, including
+    those of different MCP clients, so its connection pool and server check are
+    reused instead of being set up for every call.
+    """
     jira_server = os.getenv("JIRA_SERVER")
     jira_email = os.getenv("JIRA_EMAIL")
     jira_api_token = os.getenv("JIRA_API_TOKEN")
@@ -16,83 +36,240 @@ def initialize_jira():
     if not all([jira_server, jira_email, jira_api_token]):
         raise ValueError("Missing required JIRA environment variables")
     
+    # Optional per-request timeout in seconds, e.g. to fail fast and let tools retry
+    timeout = os.getenv("JIRA_MCP_TIMEOUT")
+    
+    key = (jira_server, jira_email, jira_api_token, timeout)
+    with _clients_lock:
+        jira = _clients.get(key)
+    if jira is None:
+        jira = _connect(jira_server, jira_email, jira_api_token, float(timeout) if timeout else None)
+        with _clients_lock:
+            jira = _clients.setdefault(key, jira)
+    return jira
+
+def _connect(server, email, api_token, timeout):
+    """Create a JIRA client and check the server."""
     jira = JIRA(
-        server=jira_server,
-        basic_auth=(jira_email, jira_api_token)
+        server=server,
+        basic_auth=(email, api_token),
+        timeout=timeout,
+        get_server_info=False
     )
+    
+    # Keep enough pooled connections for concurrent tool calls and bulk workers
+    pool_size = int(os.getenv("JIRA_MCP_POOL_SIZE", "32"))
+    for prefix in ("https://", "http://"):
+        jira._session.mount(prefix, HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+    
+    # Report every HTTP request to the metrics registry, and subject it to the
+    # call's deadline and the circuit breakers, starting with the server check
+    instrument_session(jira._session)
+    server_info = jira.server_info()
+    jira._version = tuple(server_info["versionNumbers"])
+    jira.deploymentType = server_info.get("deploymentType")
     return jira
 
+def close_clients():
+    """Close and forget the shared JIRA clients (used at shutdown and by tests)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for jira in clients:
+        jira.close()
+
 def main():
     # Initialize JIRA connection
     jira_client = initialize_jira()
     
+    # "stdio" serves one client per process; "sse" serves many clients over HTTP from one process
+    transport = os.getenv("JIRA_MCP_TRANSPORT", "stdio")
+    if transport not in ("stdio", "sse"):
+        raise ValueError(f"Unknown transport '{transport}'; use 'stdio' or 'sse'")
+    if transport == "sse":
+        enable_isolation()
+    
     # Initialize FastMCP
-    app = FastMCP(name="jira-tools")
+    app = FastMCP(
+        name="jira-tools",
+        host=os.getenv("JIRA_MCP_HOST", "127.0.0.1"),
+        port=int(os.getenv("JIRA_MCP_PORT", "8000"))
+    )
+    
+    # Optionally export metrics to a Prometheus text file
+    metrics_file = os.getenv("JIRA_MCP_METRICS_FILE")
+    if metrics_file:
+        start_prometheus_exporter(metrics_file, float(os.getenv("JIRA_MCP_METRICS_INTERVAL", "15")))
+    
+    # Add trace ids to log records and optionally write spans to a rotating file
+    install_log_correlation()
+    configure_tracing()
     
     # Import tools
     from src.tools.issues import (
-        search_issues, create_issue, update_issue, delete_issue,
-        add_comment, transition_issue, get_issue_details, search_users
+        search_issues, multi_search, create_issue, update_issue, delete_issue,
+        add_comment, transition_issue, get_issue_details, get_comments, search_users
     )
+    from src.tools.bulk import bulk_transition, bulk_update_issues
+    from src.tools.flow import flow_metrics
+    from src.tools.graph import get_issue_graph
+    from src.tools.history import get_issue_changelog, get_issue_changelogs
+    from src.tools.polling import poll_changes
     from src.tools.projects import list_projects
+    from src.tools.stats import server_stats, write_status
+    from src.tools.worklogs import worklog_report
+    
+    def add_tool(fn, name, description):
+        """
+        Register a tool with a deadline, metrics, tracing and (when JIRA_MCP_PROFILE selects it) profiling.
+        
+        The tool runs on the worker thread pool, so a slow call does not block the event loop.
+        """
+        app.add_tool(
+            offload_tool(instrument_tool(trace_tool(profile_tool(with_deadline(fn, name), name), name), name), name),
+            name=name, description=description
+        )
     
     # Register tools using the add_tool method
-    app.add_tool(
+    add_tool(
         search_issues,
         name="search_issues",
         description="Search for JIRA issues using JQL (JIRA Query Language)"
     )
     
-    app.add_tool(
+    add_tool(
+        multi_search,
+        name="multi_search",
+        description="Run several named JQL searches concurrently and return each issue once"
+    )
+    
+    add_tool(
         list_projects,
         name="list_projects",
-        description="List JIRA projects for the authenticated user"
+        description="List JIRA projects for the authenticated user, optionally with their open issue counts"
     )
     
-    app.add_tool(
+    add_tool(
         create_issue,
         name="create_issue",
         description="Create a new JIRA issue in a specified project"
     )
     
-    app.add_tool(
+    add_tool(
         update_issue,
         name="update_issue",
         description="Update an existing JIRA issue with new values"
     )
     
-    app.add_tool(
+    add_tool(
         delete_issue,
         name="delete_issue",
         description="Delete a JIRA issue (requires explicit confirmation)"
     )
 
-    app.add_tool(
+    add_tool(
         add_comment,
         name="add_comment",
         description="Add a comment to an existing JIRA issue"
     )
 
-    app.add_tool(
+    add_tool(
         transition_issue,
         name="transition_issue",
         description="Transition a JIRA issue to a new status"
     )
 
-    app.add_tool(
+    add_tool(
+        bulk_transition,
+        name="bulk_transition",
+        description="Transition every issue matching a JQL query (or a list of keys) to a status"
+    )
+
+    add_tool(
+        bulk_update_issues,
+        name="bulk_update_issues",
+        description="Apply one set of field changes to every issue matching a JQL query (or a list of keys)"
+    )
+
+    add_tool(
         get_issue_details,
         name="get_issue_details",
         description="Get detailed information about a JIRA issue"
     )
 
-    app.add_tool(
+    add_tool(
+        get_comments,
+        name="get_comments",
+        description="Get the comments of a JIRA issue a page at a time, or only those after a cursor"
+    )
+
+    add_tool(
         search_users,
         name="search_users",
         description="Search for JIRA users by name, email, or username"
     )
+
+    add_tool(
+        get_issue_graph,
+        name="get_issue_graph",
+        description="Get the tree of child issues and sub-tasks below an issue and the issues linked to them"
+    )
+
+    add_tool(
+        get_issue_changelog,
+        name="get_issue_changelog",
+        description="Get the change history of a JIRA issue"
+    )
+
+    add_tool(
+        get_issue_changelogs,
+        name="get_issue_changelogs",
+        description="Get the change history of several JIRA issues at once"
+    )
+
+    add_tool(
+        flow_metrics,
+        name="flow_metrics",
+        description="Compute lead time, cycle time, time in status and weekly throughput for the issues matching a JQL query"
+    )
+
+    add_tool(
+        worklog_report,
+        name="worklog_report",
+        description="Report hours logged per user, project, epic or issue and per day, week or month"
+    )
+
+    add_tool(
+        poll_changes,
+        name="poll_changes",
+        description="Report issues matching a JQL query that were added, changed or removed since the last poll of a named watermark"
+    )
+
+    add_tool(
+        server_stats,
+        name="server_stats",
+        description="Report per-tool latency, JIRA request and cache statistics for this server"
+    )
+
+    add_tool(
+        write_status,
+        name="write_status",
+        description="Report deferred writes (such as deferred comments) that are pending or failed"
+    )
+    
+    # Serve issues and JQL views as resources clients can subscribe to
+    from src.resources import register_resources
+    register_resources(app)
+    
+    # Post deferred writes left over from a previous run
+    from src.journal import resume_pending
+    resume_pending()
     
     # Start the FastMCP application
-    app.run()
+    try:
+        app.run(transport=transport)
+    finally:
+        close_clients()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
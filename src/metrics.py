@@ -0,0 +1,322 @@
+"""In-process metrics for tool calls and JIRA HTTP requests."""
+import contextvars
+import functools
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.http_hooks import RequestRecord, add_observer
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# HTTP time spent inside the current tool call: {"seconds": float, "calls": int}
+_current_call: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "jira_mcp_current_call", default=None
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram. Not thread-safe; guarded by the registry lock."""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside the matching bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * ((rank - cumulative) / bucket_count)
+            cumulative += bucket_count
+        return LATENCY_BUCKETS[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 2),
+            "p95_ms": round(self.quantile(0.95) * 1000, 2),
+            "p99_ms": round(self.quantile(0.99) * 1000, 2),
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of per-tool, per-endpoint and per-cache metrics.
+
+    Recording is a dictionary lookup and a few additions under a lock, so it
+    is cheap enough to run on every tool call and every HTTP request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started = time.time()
+            self._tools: Dict[str, Dict[str, Any]] = {}
+            self._endpoints: Dict[str, Dict[str, Any]] = {}
+            self._caches: Dict[str, Dict[str, int]] = {}
+
+    def observe_tool(self, tool: str, seconds: float, error: bool = False,
+                     jira_seconds: float = 0.0, jira_calls: int = 0) -> None:
+        """Record one tool call, including the time it spent waiting on JIRA."""
+        with self._lock:
+            entry = self._tool_entry(tool)
+            entry["latency"].observe(seconds)
+            entry["errors"] += error
+            entry["jira_seconds"] += jira_seconds
+            entry["jira_calls"] += jira_calls
+
+    def observe_queue(self, tool: str, seconds: float, rejected: bool = False) -> None:
+        """Record the time a tool call waited for a free slot, or that it was turned away."""
+        with self._lock:
+            entry = self._tool_entry(tool)
+            if rejected:
+                entry["rejected"] += 1
+            else:
+                entry["queue_wait"].observe(seconds)
+
+    def _tool_entry(self, tool: str) -> Dict[str, Any]:
+        entry = self._tools.get(tool)
+        if entry is None:
+            entry = self._tools[tool] = {
+                "latency": Histogram(), "errors": 0, "jira_seconds": 0.0, "jira_calls": 0,
+                "queue_wait": Histogram(), "rejected": 0,
+            }
+        return entry
+
+    def observe_http(self, record: RequestRecord) -> None:
+        """Record one HTTP attempt made by the JIRA client."""
+        with self._lock:
+            entry = self._endpoints.get(record.endpoint)
+            if entry is None:
+                entry = self._endpoints[record.endpoint] = {
+                    "latency": Histogram(), "statuses": {}, "errors": 0, "retries": 0,
+                    "rate_limited": 0, "bytes_sent": 0, "bytes_received": 0,
+                }
+            entry["latency"].observe(record.duration)
+            status = str(record.status) if record.status is not None else "error"
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            entry["errors"] += record.error is not None or (record.status or 0) >= 400
+            entry["retries"] += record.is_retry
+            entry["rate_limited"] += record.status == 429
+            entry["bytes_sent"] += record.bytes_sent
+            entry["bytes_received"] += record.bytes_received
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Record a cache lookup."""
+        with self._lock:
+            entry = self._caches.get(cache)
+            if entry is None:
+                entry = self._caches[cache] = {"hits": 0, "misses": 0}
+            entry["hits" if hit else "misses"] += 1
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record a retry performed above the HTTP layer (e.g. by a tool)."""
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = {
+                    "latency": Histogram(), "statuses": {}, "errors": 0, "retries": 0,
+                    "rate_limited": 0, "bytes_sent": 0, "bytes_received": 0,
+                }
+            entry["retries"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as plain JSON-serializable data."""
+        with self._lock:
+            tools = {}
+            for name, entry in sorted(self._tools.items()):
+                latency = entry["latency"]
+                tools[name] = dict(
+                    latency.summary(),
+                    errors=entry["errors"],
+                    jira_calls=entry["jira_calls"],
+                    jira_time_ms=round(entry["jira_seconds"] * 1000, 2),
+                    jira_time_ratio=round(entry["jira_seconds"] / latency.total, 3) if latency.total else 0.0,
+                    queue_wait=entry["queue_wait"].summary(),
+                    rejected=entry["rejected"],
+                )
+            endpoints = {
+                name: dict(
+                    entry["latency"].summary(),
+                    statuses=dict(entry["statuses"]),
+                    errors=entry["errors"],
+                    retries=entry["retries"],
+                    rate_limited=entry["rate_limited"],
+                    bytes_sent=entry["bytes_sent"],
+                    bytes_received=entry["bytes_received"],
+                )
+                for name, entry in sorted(self._endpoints.items())
+            }
+            caches = {
+                name: dict(
+                    entry,
+                    hit_ratio=round(entry["hits"] / (entry["hits"] + entry["misses"]), 3)
+                    if entry["hits"] + entry["misses"] else 0.0,
+                )
+                for name, entry in sorted(self._caches.items())
+            }
+            return {
+                "uptime_seconds": round(time.time() - self._started, 1),
+                "tools": tools,
+                "http": {
+                    "requests": sum(e["count"] for e in endpoints.values()),
+                    "retries": sum(e["retries"] for e in endpoints.values()),
+                    "rate_limited": sum(e["rate_limited"] for e in endpoints.values()),
+                    "endpoints": endpoints,
+                },
+                "caches": caches,
+            }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, label: str, entries: List[Tuple[str, Histogram]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for value, hist in entries:
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS + (float("inf"),), hist.counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{label}="{_escape(value)}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{_escape(value)}"}} {hist.total}')
+                lines.append(f'{name}_count{{{label}="{_escape(value)}"}} {hist.count}')
+
+        def counter(name: str, help_text: str, samples: List[Tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in samples:
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        with self._lock:
+            tools = sorted(self._tools.items())
+            endpoints = sorted(self._endpoints.items())
+            caches = sorted(self._caches.items())
+            histogram("jira_mcp_tool_duration_seconds", "Tool call latency.", "tool",
+                      [(name, entry["latency"]) for name, entry in tools])
+            counter("jira_mcp_tool_errors_total", "Tool calls that raised an error.",
+                    [(f'tool="{_escape(name)}"', entry["errors"]) for name, entry in tools])
+            counter("jira_mcp_tool_jira_seconds_total", "Time tool calls spent waiting on JIRA.",
+                    [(f'tool="{_escape(name)}"', entry["jira_seconds"]) for name, entry in tools])
+            histogram("jira_mcp_tool_queue_seconds", "Time tool calls waited for a free slot.", "tool",
+                      [(name, entry["queue_wait"]) for name, entry in tools])
+            counter("jira_mcp_tool_rejected_total", "Tool calls turned away because their queue was full.",
+                    [(f'tool="{_escape(name)}"', entry["rejected"]) for name, entry in tools])
+            histogram("jira_mcp_http_request_duration_seconds", "JIRA HTTP request latency.", "endpoint",
+                      [(name, entry["latency"]) for name, entry in endpoints])
+            counter("jira_mcp_http_requests_total", "JIRA HTTP requests by status.", [
+                (f'endpoint="{_escape(name)}",status="{status}"', count)
+                for name, entry in endpoints for status, count in sorted(entry["statuses"].items())
+            ])
+            counter("jira_mcp_http_retries_total", "Retried JIRA HTTP requests.",
+                    [(f'endpoint="{_escape(name)}"', entry["retries"]) for name, entry in endpoints])
+            counter("jira_mcp_http_rate_limited_total", "JIRA responses with status 429.",
+                    [(f'endpoint="{_escape(name)}"', entry["rate_limited"]) for name, entry in endpoints])
+            counter("jira_mcp_http_received_bytes_total", "Response bytes received from JIRA.",
+                    [(f'endpoint="{_escape(name)}"', entry["bytes_received"]) for name, entry in endpoints])
+            counter("jira_mcp_cache_requests_total", "Cache lookups by result.", [
+                (f'cache="{_escape(name)}",result="{result}"', entry[key])
+                for name, entry in caches for result, key in (("hit", "hits"), ("miss", "misses"))
+            ])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the Prometheus text format to a file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".jira-mcp-metrics-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+def _observe_request(record: RequestRecord) -> None:
+    registry.observe_http(record)
+    call = _current_call.get()
+    if call is not None:
+        call["seconds"] += record.duration
+        call["calls"] += 1
+
+
+add_observer(_observe_request)
+
+
+def instrument_tool(fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Wrap a tool function so every call is recorded in the registry.
+
+    The wrapper keeps the original signature (via functools.wraps), so FastMCP
+    builds the same argument schema as for the unwrapped function.
+    """
+    tool_name = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        call = {"seconds": 0.0, "calls": 0}
+        token = _current_call.set(call)
+        started = time.perf_counter()
+        error = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            _current_call.reset(token)
+            registry.observe_tool(
+                tool_name, time.perf_counter() - started, error,
+                jira_seconds=call["seconds"], jira_calls=int(call["calls"]),
+            )
+
+    return wrapper
+
+
+def start_prometheus_exporter(path: str, interval: float = 15.0) -> threading.Thread:
+    """Write the Prometheus text format to `path` every `interval` seconds from a daemon thread."""
+
+    def export_loop():
+        while True:
+            try:
+                registry.write_prometheus(path)
+            except OSError:
+                pass
+            time.sleep(interval)
+
+    thread = threading.Thread(target=export_loop, name="jira-mcp-metrics-exporter", daemon=True)
+    thread.start()
+    return thread
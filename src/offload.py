@@ -0,0 +1,200 @@
+"""
+Running blocking tools on a worker thread pool with per-tool concurrency limits.
+
+The tool functions are synchronous; called directly by FastMCP they would
+block the event loop, so one slow search would hold up every other request.
+`offload_tool` turns a tool into a coroutine that runs it on a shared pool
+of JIRA_MCP_TOOL_WORKERS threads (default: 16).
+
+At most a tool's concurrency limit of its calls run at once; further calls
+wait in a first-in, first-out queue. Limits come from JIRA_MCP_TOOL_CONCURRENCY
+(e.g. "search_issues=4,bulk_transition=1"), then TOOL_CONCURRENCY, then the
+pool size. A call waits at most until its deadline, and a call finding
+JIRA_MCP_TOOL_QUEUE calls (default: 32) already waiting is turned away at
+once with ToolBusy. Time spent waiting is recorded as the tool's queue wait,
+apart from its execution time.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from src.deadline import DeadlineExceeded, start_call, use_budget
+from src.metrics import registry
+from src.progress import capture_progress, use_reporter
+
+TOOL_WORKERS = int(os.getenv("JIRA_MCP_TOOL_WORKERS", "16"))
+
+# Calls a tool may have waiting for a slot before further calls are turned away
+TOOL_QUEUE = int(os.getenv("JIRA_MCP_TOOL_QUEUE", "32"))
+
+# Defaults for tools that put a heavy load on JIRA per call
+TOOL_CONCURRENCY: Dict[str, int] = {
+    "search_issues": 4,
+    "multi_search": 2,
+    "bulk_transition": 1,
+    "bulk_update_issues": 1,
+}
+
+
+class ToolBusy(Exception):
+    """Too many calls of a tool are already waiting for a slot."""
+
+
+def tool_concurrency(tool: str) -> int:
+    """Concurrent calls allowed for a tool, from JIRA_MCP_TOOL_CONCURRENCY, TOOL_CONCURRENCY or the pool size."""
+    for entry in os.getenv("JIRA_MCP_TOOL_CONCURRENCY", "").split(","):
+        name, _, value = entry.partition("=")
+        if name.strip() == tool and value.strip():
+            return max(1, int(value))
+    return TOOL_CONCURRENCY.get(tool, TOOL_WORKERS)
+
+
+class ToolSlots:
+    """
+    Concurrency limit of one tool with a bounded FIFO queue of waiting calls.
+
+    Waiters are futures of the event loop that created them; a freed slot is
+    handed to the first waiter still waiting, from whichever thread frees it.
+
+    Args:
+        tool: Tool name used in messages
+        limit: Calls that may run at once
+        max_queued: Calls that may wait for a slot
+    """
+
+    def __init__(self, tool: str, limit: int, max_queued: int = TOOL_QUEUE):
+        self.tool = tool
+        self.limit = limit
+        self.max_queued = max_queued
+        self.running = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> float:
+        """
+        Take a slot, waiting at most `timeout` seconds; returns the seconds waited.
+
+        Raises:
+            ToolBusy: If the queue is full
+            DeadlineExceeded: If no slot became free in time
+        """
+        with self._lock:
+            if self.running < self.limit and not self._waiters:
+                self.running += 1
+                return 0.0
+            if len(self._waiters) >= self.max_queued:
+                raise ToolBusy(
+                    f"{self.tool} has {self.running} calls running and {len(self._waiters)} waiting; try again later"
+                )
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, max(timeout, 0.0))
+        except BaseException as e:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, waiter))
+                except ValueError:
+                    pass
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                raise DeadlineExceeded(
+                    f"{self.tool} did not get a free slot within {timeout:g} seconds "
+                    f"({self.limit} calls may run at once)"
+                ) from None
+            raise
+        return time.monotonic() - started
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiting call if there is one."""
+        with self._lock:
+            if not self._waiters:
+                self.running -= 1
+                return
+            loop, waiter = self._waiters.popleft()
+        try:
+            loop.call_soon_threadsafe(self._grant, waiter)
+        except RuntimeError:
+            # The waiter's event loop is closed
+            self.release()
+
+    def _grant(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            self.release()
+        else:
+            waiter.set_result(None)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots: Dict[str, ToolSlots] = {}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="jira-mcp-tool")
+        return _pool
+
+
+def slots_for(tool: str) -> ToolSlots:
+    with _pool_lock:
+        slots = _slots.get(tool)
+        if slots is None:
+            slots = _slots[tool] = ToolSlots(tool, tool_concurrency(tool))
+        return slots
+
+
+def offload_tool(fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Wrap a blocking tool function in a coroutine that runs it on the tool pool.
+
+    The call's deadline starts when it is queued, so time spent waiting for
+    a slot counts against timeout_seconds. If the coroutine is cancelled
+    while the tool runs, the call is cancelled cooperatively: it starts no
+    further JIRA requests, and its slot is freed once the thread returns.
+    Progress the tool reports reaches the client if it sent a progressToken.
+    """
+    tool_name = name or fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        budget = start_call(tool_name, kwargs.get("timeout_seconds"))
+        slots = slots_for(tool_name)
+        try:
+            waited = await slots.acquire(budget.remaining())
+        except ToolBusy:
+            registry.observe_queue(tool_name, 0.0, rejected=True)
+            raise
+        registry.observe_queue(tool_name, waited)
+
+        context = contextvars.copy_context()
+        context.run(use_budget, budget)
+        context.run(use_reporter, capture_progress())
+        try:
+            future = _get_pool().submit(context.run, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            budget.cancel()
+            raise
+
+    return wrapper
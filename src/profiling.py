@@ -0,0 +1,187 @@
+"""Opt-in profiling of individual tool calls.
+
+Profiling is switched on with environment variables:
+
+    JIRA_MCP_PROFILE       "all" (or "1") to profile every tool, or a comma-separated
+                           list of tool names (e.g. "get_issue_details,search_issues")
+    JIRA_MCP_PROFILE_MODE  "deterministic" (cProfile, written as .prof pstats files) or
+                           "sampling" (stack sampler, written as .folded collapsed stacks)
+    JIRA_MCP_PROFILE_DIR   Directory the profiles are written to
+                           (default: <tmp>/jira-mcp-profiles)
+
+Each profiled call writes one file named "<tool>-<call id>" and adds a
+breakdown of where the time went (network, decode, format, other) to the
+`_meta.profile` key of dictionary results.
+"""
+import cProfile
+import functools
+import itertools
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Set
+
+# Path fragments used to attribute time to a span. Checked in order.
+_SPAN_PATTERNS = (
+    ("network", ("socket", "ssl", os.path.join("http", "client"), "urllib3", os.path.join("requests", ""))),
+    ("decode", (os.path.join("json", ""), "_json", os.path.join("jira", "resources"), os.path.join("jira", "utils"), "simplejson")),
+    ("format", (os.path.join("src", "tools"),)),
+)
+
+_call_ids = itertools.count(1)
+
+
+def profiled_tools() -> Optional[Set[str]]:
+    """Return the set of tool names to profile, {"*"} for all, or None if profiling is off."""
+    value = os.getenv("JIRA_MCP_PROFILE", "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "all", "*"):
+        return {"*"}
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def profile_directory() -> str:
+    return os.getenv("JIRA_MCP_PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "jira-mcp-profiles")
+
+
+def classify(filename: str) -> str:
+    """Attribute a source file to the network, decode, format or other span."""
+    for span, fragments in _SPAN_PATTERNS:
+        if any(fragment in filename for fragment in fragments):
+            return span
+    return "other"
+
+
+def _new_call_id() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(_call_ids)}"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread at a fixed interval from a background thread.
+
+    The result is kept as collapsed stacks ("outer;inner;leaf count"), the
+    input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.leaf_files: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="jira-mcp-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.leaf_files[frame.f_code.co_filename] += 1
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def spans(self, total_seconds: float) -> Dict[str, float]:
+        """Split the wall time of the call across spans in proportion to the samples."""
+        samples = sum(self.leaf_files.values())
+        spans = {"network": 0.0, "decode": 0.0, "format": 0.0, "other": 0.0}
+        if not samples:
+            spans["other"] = total_seconds
+            return spans
+        for filename, count in self.leaf_files.items():
+            spans[classify(filename)] += total_seconds * count / samples
+        return spans
+
+
+def _pstats_spans(profiler: cProfile.Profile, total_seconds: float) -> Dict[str, float]:
+    """Sum the exclusive (tottime) time of every profiled function by span."""
+    stats = pstats.Stats(profiler)
+    spans = {"network": 0.0, "decode": 0.0, "format": 0.0, "other": 0.0}
+    for (filename, _, name), (_, _, tottime, _, _) in stats.stats.items():
+        # Builtins have no file ("~"); their name names the C module, e.g. "<method 'recv_into' of '_socket.socket' objects>"
+        spans[classify(name if filename == "~" else filename)] += tottime
+    # Time outside Python functions (e.g. profiler overhead) is attributed to "other"
+    spans["other"] += max(0.0, total_seconds - sum(spans.values()))
+    return spans
+
+
+def profile_tool(fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Wrap a tool function so calls are profiled when JIRA_MCP_PROFILE selects the tool.
+
+    The environment is read on every call, so profiling can be enabled for a
+    running server by anything that changes its environment (e.g. a test).
+    Only the thread running the tool is profiled.
+    """
+    tool_name = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        selected = profiled_tools()
+        if not selected or ("*" not in selected and tool_name not in selected):
+            return fn(*args, **kwargs)
+
+        directory = profile_directory()
+        os.makedirs(directory, exist_ok=True)
+        call_id = _new_call_id()
+        mode = os.getenv("JIRA_MCP_PROFILE_MODE", "deterministic").lower()
+
+        started = time.perf_counter()
+        if mode == "sampling":
+            sampler = SamplingProfiler(threading.get_ident())
+            sampler.start()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                sampler.stop()
+                elapsed = time.perf_counter() - started
+                path = os.path.join(directory, f"{tool_name}-{call_id}.folded")
+                sampler.write(path)
+                spans = sampler.spans(elapsed)
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - started
+                path = os.path.join(directory, f"{tool_name}-{call_id}.prof")
+                profiler.dump_stats(path)
+                spans = _pstats_spans(profiler, elapsed)
+
+        if isinstance(result, dict):
+            meta = result.setdefault('_meta', {})
+            meta['profile'] = {
+                'call_id': call_id,
+                'mode': 'sampling' if mode == "sampling" else 'deterministic',
+                'path': path,
+                'total_ms': round(elapsed * 1000, 2),
+                'spans_ms': {span: round(seconds * 1000, 2) for span, seconds in spans.items()},
+            }
+        return result
+
+    return wrapper
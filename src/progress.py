@@ -0,0 +1,64 @@
+"""
+MCP progress notifications from tools running on worker threads.
+
+A client asks for progress by sending a progressToken with its tool call.
+`offload_tool` captures the call's session and token on the event loop,
+before the tool starts on a worker thread, and carries them in a context
+variable. `report_progress` then sends notifications/progress to that
+client from any thread of the call, including bulk workers. Without a
+token (or outside an MCP request) reporting does nothing.
+"""
+import asyncio
+import contextvars
+import logging
+from typing import Any, Optional, Union
+
+from mcp.server.lowlevel.server import request_ctx
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Sends the progress of one tool call to the client that made it."""
+
+    def __init__(self, session: Any, token: Union[str, int], loop: asyncio.AbstractEventLoop):
+        self.session = session
+        self.token = token
+        self.loop = loop
+
+    def report(self, progress: float, total: Optional[float] = None) -> None:
+        coroutine = self.session.send_progress_notification(progress_token=self.token, progress=progress, total=total)
+        try:
+            asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        except RuntimeError:
+            # The event loop is closed; the client is gone
+            coroutine.close()
+
+
+_current: contextvars.ContextVar[Optional[ProgressReporter]] = contextvars.ContextVar("progress", default=None)
+
+
+def capture_progress() -> Optional[ProgressReporter]:
+    """The reporter of the MCP request being handled, if its client asked for progress; call on the event loop."""
+    context = request_ctx.get(None)
+    meta = getattr(context, "meta", None)
+    token = getattr(meta, "progressToken", None)
+    if context is None or token is None:
+        return None
+    return ProgressReporter(context.session, token, asyncio.get_running_loop())
+
+
+def use_reporter(reporter: Optional[ProgressReporter]) -> None:
+    """Make `reporter` the current call's reporter (in a context copied for a worker thread)."""
+    _current.set(reporter)
+
+
+def report_progress(progress: float, total: Optional[float] = None) -> None:
+    """Tell the client of the current tool call how far it has got."""
+    reporter = _current.get()
+    if reporter is None:
+        return
+    try:
+        reporter.report(progress, total)
+    except Exception as e:
+        logger.debug("Sending progress failed: %s", e)
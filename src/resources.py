@@ -0,0 +1,336 @@
+"""
+JIRA issues and saved JQL views as MCP resources, with subscriptions.
+
+`jira://issue/{key}` reads an issue as get_issue_details returns it, and
+`jira://search/{name}` the issues matching a view configured in JIRA_MCP_VIEWS
+(a JSON object of view names to JQL). Reads are cached for
+JIRA_MCP_RESOURCE_TTL seconds (default: 60).
+
+Clients may subscribe to these URIs instead of polling. One background
+ChangePoller serves the subscriptions of every client: each
+JIRA_MCP_SUBSCRIPTION_INTERVAL seconds (default: 30) it checks all subscribed
+issues with a few `key in (...)` searches of their updated time, and every
+subscribed view for issues added, changed or removed as poll_changes does.
+Changed resources are dropped from the cache and each subscriber is sent a
+resource updated notification, so the polling cost does not grow with the
+number of watching clients.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import AnyUrl, Field
+
+from src.cache import TTLCache
+from src.concurrency import run_concurrently
+from src.deadline import with_deadline
+from src.main import initialize_jira
+
+logger = logging.getLogger(__name__)
+
+# Seconds a resource read is reused; subscribed resources are dropped as soon as they change
+RESOURCE_TTL = float(os.getenv("JIRA_MCP_RESOURCE_TTL", "60"))
+
+# Seconds between two rounds of the change poller
+SUBSCRIPTION_INTERVAL = float(os.getenv("JIRA_MCP_SUBSCRIPTION_INTERVAL", "30"))
+
+# Issues returned by a view resource
+VIEW_MAX_RESULTS = int(os.getenv("JIRA_MCP_VIEW_MAX_RESULTS", "50"))
+
+# Issue keys per `key in (...)` search of the change poller
+SUBSCRIPTION_CHUNK_SIZE = 100
+
+ISSUE_URI = "jira://issue/{key}"
+VIEW_URI = "jira://search/{name}"
+
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$", re.IGNORECASE)
+_VIEW_NAME = re.compile(r"^[\w.-]+$")
+
+_contents = TTLCache("resources", RESOURCE_TTL)
+
+# Updated time of recently read issues, the baseline of a subscription made after reading
+_read_versions = TTLCache("resource_versions", 3600, max_entries=4096)
+
+
+def configured_views() -> Dict[str, str]:
+    """View names and their JQL from JIRA_MCP_VIEWS, e.g. '{"my-open": "assignee = currentUser()"}'."""
+    raw = os.getenv("JIRA_MCP_VIEWS", "").strip()
+    if not raw:
+        return {}
+    try:
+        views = json.loads(raw)
+    except ValueError:
+        views = None
+    if not isinstance(views, dict) or not all(isinstance(jql, str) and jql.strip() for jql in views.values()):
+        raise ValueError("JIRA_MCP_VIEWS must be a JSON object of view names to JQL queries")
+    invalid = [name for name in views if not _VIEW_NAME.match(name)]
+    if invalid:
+        raise ValueError(f"View names may only contain letters, digits, '_', '.' and '-': {', '.join(invalid)}")
+    return views
+
+
+def parse_uri(uri: str) -> Tuple[str, str]:
+    """
+    ("issue", issue key) or ("view", view name) of a resource URI.
+
+    Raises:
+        ValueError: If the URI is not an issue or a configured view
+    """
+    scheme, _, rest = str(uri).partition("://")
+    kind, _, name = rest.partition("/")
+    if scheme == "jira" and kind == "issue" and _ISSUE_KEY.match(name):
+        return "issue", name.upper()
+    if scheme == "jira" and kind == "search" and name in configured_views():
+        return "view", name
+    raise ValueError(f"Unknown resource: {uri}")
+
+
+def read_resource(uri: str) -> str:
+    """The JSON text of a resource, from the cache when it was read recently."""
+    from src.tools.issues import get_issue_details, search_issues
+
+    kind, name = parse_uri(uri)
+    text = _contents.get(uri)
+    if text is not None:
+        return text
+    if kind == "issue":
+        result = get_issue_details(name)
+        _read_versions.set(name, result['details'].get('updated'))
+    else:
+        result = dict(search_issues(configured_views()[name], max_results=VIEW_MAX_RESULTS), view=name)
+    text = json.dumps(result, default=str)
+    # A result served from the last good copy is not cached, so the next read tries JIRA again
+    if not result.get('stale'):
+        _contents.set(uri, text)
+    return text
+
+
+class ChangePoller:
+    """
+    The background loop notifying subscribers of the resources that changed.
+
+    Subscribers (normally MCP sessions) are weakly referenced, so a client
+    that disconnects is no longer polled for. Each subscription has a
+    callback, called as callback(subscriber, uri) from the poller thread.
+
+    Args:
+        interval: Seconds between two rounds
+    """
+
+    def __init__(self, interval: float = SUBSCRIPTION_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._subscriptions: "weakref.WeakKeyDictionary[Any, Tuple[Callable[[Any, str], None], Set[str]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Last updated time seen per subscribed issue (None once it is gone)
+        self._issues: Dict[str, Optional[str]] = {}
+        # Query, watermark and matching issues per subscribed view
+        self._views: Dict[str, Tuple[str, float, Dict[str, str]]] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, subscriber: Any, uri: str, callback: Callable[[Any, str], None]) -> None:
+        """Notify `subscriber` through `callback` when the resource at `uri` changes."""
+        kind, name = parse_uri(uri)
+        with self._lock:
+            entry = self._subscriptions.get(subscriber)
+            if entry is None:
+                entry = self._subscriptions[subscriber] = (callback, set())
+            entry[1].add(uri)
+            if kind == "issue" and name not in self._issues:
+                version = _read_versions.get(name)
+                if version is not None:
+                    self._issues[name] = version
+        # Take the baseline of a new subscription now rather than at the next round
+        self._wake.set()
+
+    def unsubscribe(self, subscriber: Any, uri: str) -> None:
+        with self._lock:
+            entry = self._subscriptions.get(subscriber)
+            if entry is not None:
+                entry[1].discard(uri)
+
+    def start(self) -> None:
+        """Start the poller thread, once."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="jira-mcp-change-poller", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                with_deadline(self.poll_once, "subscription_poll")()
+            except Exception as e:
+                logger.warning("Checking subscribed resources failed: %s", e)
+
+    def _check_issues(self, jira, keys: List[str]) -> List[str]:
+        """Keys among `keys` whose updated time changed (or that are gone) since the last round."""
+        page = jira.search_issues(
+            jql_str=f"key in ({', '.join(keys)})",
+            maxResults=len(keys),
+            fields=['updated'],
+            validate_query=False,
+            json_result=True
+        )
+        current = {issue['key']: issue['fields']['updated'] for issue in page.get('issues', [])}
+        changed = []
+        with self._lock:
+            for key in keys:
+                version = current.get(key)
+                if key in self._issues and self._issues[key] != version:
+                    changed.append(key)
+                self._issues[key] = version
+        return changed
+
+    def _check_view(self, jira, name: str) -> bool:
+        """Whether issues were added to, changed in or removed from a view since the last round."""
+        from src.tools.polling import changes_since, updated_issues, without_order_by
+
+        jql = without_order_by(configured_views()[name])
+        with self._lock:
+            state = self._views.get(name)
+        started = time.time()
+        if state is None or state[0] != jql:
+            known, changed = updated_issues(jira, jql), False
+        else:
+            known = dict(state[2])
+            changed = any(changes_since(jira, jql, known, state[1]))
+        with self._lock:
+            self._views[name] = (jql, started, known)
+        return changed
+
+    def poll_once(self) -> List[str]:
+        """
+        Check every subscribed resource once and notify the subscribers of those that changed.
+
+        Returns:
+            The URIs that changed
+        """
+        watchers: Dict[str, List[Tuple[Any, Callable[[Any, str], None]]]] = {}
+        with self._lock:
+            for subscriber, (callback, uris) in list(self._subscriptions.items()):
+                for uri in uris:
+                    watchers.setdefault(uri, []).append((subscriber, callback))
+
+        uris_of: Dict[Tuple[str, str], List[str]] = {}
+        for uri in watchers:
+            try:
+                uris_of.setdefault(parse_uri(uri), []).append(uri)
+            except ValueError:
+                # The view was removed from the configuration
+                continue
+        issues = sorted(name for kind, name in uris_of if kind == "issue")
+        views = sorted(name for kind, name in uris_of if kind == "view")
+
+        # Forget resources nobody watches any more
+        with self._lock:
+            self._issues = {key: version for key, version in self._issues.items() if ("issue", key) in uris_of}
+            self._views = {name: state for name, state in self._views.items() if ("view", name) in uris_of}
+        if not uris_of:
+            return []
+
+        jira = initialize_jira()
+        checks = [
+            ("issue", issues[start:start + SUBSCRIPTION_CHUNK_SIZE])
+            for start in range(0, len(issues), SUBSCRIPTION_CHUNK_SIZE)
+        ] + [("view", name) for name in views]
+
+        def check(item):
+            kind, target = item
+            if kind == "issue":
+                return [("issue", key) for key in self._check_issues(jira, target)]
+            return [("view", target)] if self._check_view(jira, target) else []
+
+        changed: List[str] = []
+        for item, found, error in run_concurrently(check, checks):
+            if error is not None:
+                logger.warning("Checking subscribed %s %s failed: %s", item[0], item[1], error)
+                continue
+            for resource in found:
+                changed.extend(uris_of[resource])
+
+        for uri in changed:
+            _contents.invalidate(uri)
+            for subscriber, callback in watchers[uri]:
+                try:
+                    callback(subscriber, uri)
+                except Exception as e:
+                    logger.debug("Notifying a subscriber of %s failed: %s", uri, e)
+        return sorted(changed)
+
+
+_poller = ChangePoller()
+
+
+def register_resources(app) -> None:
+    """
+    Serve issues and configured views as resources of a FastMCP app, with subscriptions.
+
+    FastMCP registers no subscription handlers and advertises resources
+    without `subscribe`, so both are added on its low-level MCP server.
+    """
+    from fastmcp.resources import Resource
+
+    from src.metrics import instrument_tool
+    from src.offload import offload_tool
+
+    # Reads run on the tool pool, under a deadline and with metrics, like tool calls
+    read = offload_tool(instrument_tool(with_deadline(read_resource, "read_resource"), "read_resource"), "read_resource")
+
+    async def read_issue(key: str) -> str:
+        return await read(ISSUE_URI.format(key=key))
+
+    app.resource(
+        ISSUE_URI, name="issue", mime_type="application/json",
+        description="A JIRA issue as get_issue_details returns it"
+    )(read_issue)
+
+    class ViewResource(Resource):
+        read_view: Callable[[str], Any] = Field(exclude=True)
+
+        async def read(self) -> str:
+            return await self.read_view(str(self.uri))
+
+    for name, jql in configured_views().items():
+        app.add_resource(ViewResource(
+            uri=AnyUrl(VIEW_URI.format(name=name)), name=name, mime_type="application/json",
+            description=f"Issues matching: {jql}", read_view=read
+        ))
+
+    server = app._mcp_server
+    server.list_resource_templates()(app.list_resource_templates)
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        loop = asyncio.get_running_loop()
+
+        def notify(session, changed: str) -> None:
+            asyncio.run_coroutine_threadsafe(session.send_resource_updated(AnyUrl(changed)), loop)
+
+        _poller.subscribe(server.request_context.session, str(uri), notify)
+        _poller.start()
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        _poller.unsubscribe(server.request_context.session, str(uri))
+
+    get_capabilities = server.get_capabilities
+
+    def capabilities(*args, **kwargs):
+        result = get_capabilities(*args, **kwargs)
+        if result.resources is not None:
+            result.resources.subscribe = True
+        return result
+
+    server.get_capabilities = capabilities
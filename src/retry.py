@@ -0,0 +1,23 @@
+"""Deciding whether and when a failed JIRA request may be tried again."""
+import random
+
+from jira.exceptions import JIRAError
+from requests.exceptions import ConnectionError, Timeout
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a failed request may succeed when retried later.
+
+    Connection errors, timeouts, 429 and 5xx responses are transient; other
+    HTTP errors mean JIRA rejected the request and would reject it again.
+    """
+    if isinstance(error, JIRAError):
+        return error.status_code is None or error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (ConnectionError, Timeout))
+
+
+def backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Seconds to wait before retry number `attempt` (1-based): exponential, half of it jittered."""
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
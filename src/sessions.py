@@ -0,0 +1,85 @@
+"""
+Per-client state when one server process serves several MCP clients.
+
+Over the SSE transport every connected client has its own MCP session, while
+the JIRA client, caches, rate limiter and circuit breakers are shared. State
+that belongs to one client, such as the receipts of its deferred writes, is
+kept per session so clients do not see each other's. Over stdio the process
+serves a single client and nothing is isolated.
+"""
+import os
+import threading
+import uuid
+import weakref
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from mcp.server.lowlevel.server import request_ctx
+
+# Receipts remembered per session for listing its deferred writes
+MAX_RECEIPTS = 500
+
+_isolated = False
+_lock = threading.Lock()
+_state: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def enable_isolation() -> None:
+    """Keep per-client state apart; called when serving several clients from one process."""
+    global _isolated
+    _isolated = True
+
+
+def current_session() -> Optional[Any]:
+    """The MCP session of the request being handled, if isolation is on and there is one."""
+    if not _isolated:
+        return None
+    context = request_ctx.get(None)
+    return context.session if context is not None else None
+
+
+def session_state() -> Optional[Dict[str, Any]]:
+    """Mutable state of the current client; dropped when its session ends."""
+    session = current_session()
+    if session is None:
+        return None
+    with _lock:
+        state = _state.get(session)
+        if state is None:
+            state = _state[session] = {"id": uuid.uuid4().hex, "receipts": deque(maxlen=MAX_RECEIPTS)}
+        return state
+
+
+def session_id() -> Optional[str]:
+    """A unique id of the current client's session, or None when clients are not isolated."""
+    state = session_state()
+    return state["id"] if state is not None else None
+
+
+def client_scope() -> str:
+    """
+    Whom per-client state kept across calls belongs to: the calling MCP
+    session when clients are isolated ("session:<id>"), else the JIRA
+    account ("user:<email>").
+    """
+    session = session_id()
+    if session is not None:
+        return f"session:{session}"
+    return f"user:{os.getenv('JIRA_EMAIL', '')}"
+
+
+def remember_receipt(receipt: str) -> None:
+    """Record a deferred write as made by the current client."""
+    state = session_state()
+    if state is not None:
+        with _lock:
+            state["receipts"].append(receipt)
+
+
+def session_receipts() -> Optional[List[str]]:
+    """Receipts of the current client's deferred writes, or None when writes are not isolated."""
+    state = session_state()
+    if state is None:
+        return None
+    with _lock:
+        return list(state["receipts"])
@@ -0,0 +1,81 @@
+"""
+Serving the last good result of a read while JIRA is degraded.
+
+Tools that read issues, projects, transitions or users go through
+`read_through`, which remembers their last good result. While the circuit
+breaker of the read's endpoint class is not closed, or when the read fails
+transiently, that result is returned marked stale and refreshed in the
+background.
+"""
+import logging
+import os
+import threading
+from typing import Any, Callable, Hashable, Set, Tuple
+
+from src.breaker import CircuitOpen, breakers
+from src.cache import TTLCache
+from src.deadline import DeadlineExceeded, with_deadline
+from src.retry import is_transient
+
+logger = logging.getLogger(__name__)
+
+# Seconds the last good result of a read is kept for serving while JIRA is degraded
+STALE_TTL = float(os.getenv("JIRA_MCP_STALE_TTL", "3600"))
+
+_last_good = TTLCache("last_good", STALE_TTL, max_entries=4096)
+_refreshing: Set[Hashable] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh(key: Hashable, load: Callable[[], Any]) -> None:
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            value = with_deadline(load, "stale_refresh")()
+            if value is not None:
+                _last_good.set(key, value)
+        except Exception as e:
+            logger.debug("Background refresh of %s failed: %s", key, e)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, name="jira-mcp-refresh", daemon=True).start()
+
+
+def read_through(kind: str, key: Tuple, load: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Load a read result, falling back to its last good value while JIRA is degraded.
+
+    Args:
+        kind: Endpoint class of the read ("search", "issue" or "metadata")
+        key: Identifies the read; combined with JIRA_SERVER
+        load: Performs the read; called in a background thread when refreshing
+
+    Returns:
+        (value, stale): stale is True when the value is a remembered result
+    """
+    key = (os.getenv("JIRA_SERVER"), kind) + tuple(key)
+    if breakers[kind].state != "closed":
+        cached = _last_good.get(key)
+        if cached is not None:
+            _refresh(key, load)
+            return cached, True
+    try:
+        value = load()
+    except Exception as e:
+        if not isinstance(e, (CircuitOpen, DeadlineExceeded)) and not is_transient(e):
+            raise
+        cached = _last_good.get(key)
+        if cached is None:
+            raise
+        logger.warning("Serving a stale result after %s", e)
+        _refresh(key, load)
+        return cached, True
+    if value is not None:
+        _last_good.set(key, value)
+    return value, False
@@ -0,0 +1,105 @@
+"""
+Local SQLite stores of state kept across restarts.
+
+Each store is one SQLite file in the per-user state directory:
+JIRA_MCP_STATE_DIR, else jira-mcp in $XDG_STATE_HOME (default: ~/.local/state).
+The directory is created readable by its owner only (0700) and every store
+file is created 0600, since they hold issue data and write payloads.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, Type, TypeVar
+
+
+def state_dir() -> str:
+    """The directory of the local stores, created 0700 if missing."""
+    path = os.getenv("JIRA_MCP_STATE_DIR")
+    if not path:
+        base = os.getenv("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+        path = os.path.join(base, "jira-mcp")
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        os.chmod(path, 0o700)
+    return path
+
+
+def _private_file(path: str) -> None:
+    """Create `path` readable and writable by its owner only, or restrict an existing one."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+    os.chmod(path, 0o600)
+
+
+class SQLiteStore:
+    """
+    One SQLite file, safe to share between threads.
+
+    Subclasses set `filename` (their file in the state directory) and
+    `schema`, and may override `prepare` to tidy the store when it is opened.
+    """
+
+    filename = ""
+    schema = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        _private_file(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(self.schema)
+            self.prepare()
+
+    def prepare(self) -> None:
+        """Called with the lock held once the schema exists."""
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @contextlib.contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the lock and run the statements of the block atomically.
+
+        An immediate transaction takes the file's write lock at the start, so
+        other processes cannot write between the block's reads and writes.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield self._db
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+S = TypeVar("S", bound=SQLiteStore)
+
+_stores: Dict[type, Any] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(store_class: Type[S]) -> S:
+    """Return the process's store of a class, opening its file in the state directory on first use."""
+    with _stores_lock:
+        store = _stores.get(store_class)
+        if store is None:
+            store = _stores[store_class] = store_class(os.path.join(state_dir(), store_class.filename))
+        return store
+
+
+def close_stores() -> None:
+    """Close every open store; the next use opens them again."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
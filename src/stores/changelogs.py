@@ -0,0 +1,102 @@
+"""Issue changelogs, which only ever grow, cached as they are read."""
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from src.stores import SQLiteStore, open_store
+
+
+class ChangelogStore(SQLiteStore):
+    """The changelog entries of issues and how far each issue's changelog is cached."""
+
+    filename = "changelogs.sqlite3"
+    schema = """
+    CREATE TABLE IF NOT EXISTS changelog_heads (
+        server TEXT NOT NULL,
+        issue_key TEXT NOT NULL,
+        entries INTEGER NOT NULL,
+        last_id TEXT,
+        updated TEXT,
+        synced REAL NOT NULL,
+        PRIMARY KEY (server, issue_key)
+    );
+    CREATE TABLE IF NOT EXISTS changelog_entries (
+        server TEXT NOT NULL,
+        issue_key TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        history_id TEXT NOT NULL,
+        entry TEXT NOT NULL,
+        PRIMARY KEY (server, issue_key, position)
+    );
+    """
+
+    def head(self, server: str, issue_key: str) -> Optional[Dict[str, Any]]:
+        """
+        How much of an issue's changelog is cached.
+
+        Returns:
+            None if nothing is cached, else the number of entries, the id of the
+            last one and the issue's updated timestamp when it was last synced
+            (None if unknown)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT entries, last_id, updated, synced FROM changelog_heads WHERE server = ? AND issue_key = ?",
+                (server, issue_key.upper()),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def append(
+        self, server: str, issue_key: str, position: int, entries: List[Dict[str, Any]], updated: Optional[str] = None
+    ) -> None:
+        """
+        Cache changelog entries starting at `position`, the number of entries already cached.
+
+        Entries at positions that are already cached (e.g. appended by a
+        concurrent call) are left as they are.
+        """
+        issue_key = issue_key.upper()
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR IGNORE INTO changelog_entries (server, issue_key, position, history_id, entry) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (server, issue_key, position + offset, entry["id"], json.dumps(entry, separators=(",", ":")))
+                    for offset, entry in enumerate(entries)
+                ],
+            )
+            count, last_id = db.execute(
+                "SELECT COUNT(*), (SELECT history_id FROM changelog_entries WHERE server = ? AND issue_key = ? "
+                "ORDER BY position DESC LIMIT 1) FROM changelog_entries WHERE server = ? AND issue_key = ?",
+                (server, issue_key, server, issue_key),
+            ).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO changelog_heads (server, issue_key, entries, last_id, updated, synced) "
+                "VALUES (?, ?, ?, ?, COALESCE(?, (SELECT updated FROM changelog_heads "
+                "WHERE server = ? AND issue_key = ?)), ?)",
+                (server, issue_key, count, last_id, updated, server, issue_key, time.time()),
+            )
+
+    def load(self, server: str, issue_key: str, start: int = 0) -> List[Dict[str, Any]]:
+        """Cached changelog entries of an issue from position `start` on, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT entry FROM changelog_entries WHERE server = ? AND issue_key = ? AND position >= ? "
+                "ORDER BY position",
+                (server, issue_key.upper(), start),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def drop(self, server: str, issue_key: str) -> None:
+        """Forget an issue's cached changelog, e.g. when JIRA's no longer extends it."""
+        with self.transaction() as db:
+            db.execute(
+                "DELETE FROM changelog_entries WHERE server = ? AND issue_key = ?", (server, issue_key.upper())
+            )
+            db.execute(
+                "DELETE FROM changelog_heads WHERE server = ? AND issue_key = ?", (server, issue_key.upper())
+            )
+
+
+def get_changelogs() -> ChangelogStore:
+    return open_store(ChangelogStore)
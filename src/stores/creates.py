@@ -0,0 +1,107 @@
+"""Idempotency keys of create_issue calls and the issues they created."""
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.stores import SQLiteStore, open_store
+
+# Seconds create_issue idempotency keys are remembered
+IDEMPOTENCY_RETENTION = 7 * 24 * 3600.0
+
+
+class CreateStore(SQLiteStore):
+    """
+    Creates recorded under an idempotency key, so a repeated call returns the existing issue.
+
+    Keys are kept per JIRA server and client scope (see src.sessions.client_scope),
+    so the same key from another client or server is a different create.
+    """
+
+    filename = "creates.sqlite3"
+    schema = """
+    CREATE TABLE IF NOT EXISTS creates (
+        server TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        idempotency_key TEXT NOT NULL,
+        project TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        issue_key TEXT,
+        started REAL NOT NULL,
+        updated REAL NOT NULL,
+        PRIMARY KEY (server, scope, idempotency_key)
+    );
+    """
+
+    def prepare(self) -> None:
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(creates)")}
+        if "scope" not in columns:
+            # Keys recorded before they were scoped cannot be told apart; they expire within a week anyway
+            self._db.execute("DROP TABLE creates")
+            self._db.executescript(self.schema)
+        self._db.execute("DELETE FROM creates WHERE updated < ?", (time.time() - IDEMPOTENCY_RETENTION,))
+
+    def begin(
+        self, server: str, scope: str, idempotency_key: str, project: str, summary: str, lease: float
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Claim the create of an idempotency key for the calling create_issue.
+
+        Args:
+            lease: Seconds after which an unfinished create is taken to be abandoned
+
+        Returns:
+            (state, record): state is "new" when this call recorded the key,
+            "abandoned" when it took over an earlier call's unfinished create,
+            "running" while another call is creating the issue, and "finished"
+            once the issue exists; record is the create as recorded before the claim
+        """
+        now = time.time()
+        with self.transaction(immediate=True) as db:
+            row = db.execute(
+                "SELECT * FROM creates WHERE server = ? AND scope = ? AND idempotency_key = ?",
+                (server, scope, idempotency_key),
+            ).fetchone()
+            if row is None:
+                db.execute(
+                    "INSERT INTO creates (server, scope, idempotency_key, project, summary, started, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (server, scope, idempotency_key, project, summary, now, now),
+                )
+                return "new", {
+                    "project": project, "summary": summary, "issue_key": None, "started": now, "updated": now
+                }
+            record = dict(row)
+            if record["issue_key"]:
+                return "finished", record
+            if record["updated"] >= now - lease:
+                return "running", record
+            db.execute(
+                "UPDATE creates SET updated = ? WHERE server = ? AND scope = ? AND idempotency_key = ?",
+                (now, server, scope, idempotency_key),
+            )
+            return "abandoned", record
+
+    def finish(self, server: str, scope: str, idempotency_key: str, issue_key: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE creates SET issue_key = ?, updated = ? WHERE server = ? AND scope = ? AND idempotency_key = ?",
+                (issue_key, time.time(), server, scope, idempotency_key),
+            )
+
+    def release(self, server: str, scope: str, idempotency_key: str, forget: bool) -> None:
+        """
+        Give up an unfinished create that failed.
+
+        Args:
+            forget: Whether to drop the key, because no request that could have created
+                the issue was sent; otherwise the next call takes the create over at once
+        """
+        where = "server = ? AND scope = ? AND idempotency_key = ? AND issue_key IS NULL"
+        with self._lock:
+            if forget:
+                self._db.execute(f"DELETE FROM creates WHERE {where}", (server, scope, idempotency_key))
+            else:
+                self._db.execute(f"UPDATE creates SET updated = 0 WHERE {where}", (server, scope, idempotency_key))
+
+
+def get_creates() -> CreateStore:
+    return open_store(CreateStore)
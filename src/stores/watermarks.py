@@ -0,0 +1,73 @@
+"""Named poll_changes watermarks."""
+import json
+import time
+from typing import Any, Dict, Optional
+
+from src.stores import SQLiteStore, open_store
+
+# Seconds the watermarks of a session are kept after its last poll; sessions do not come back
+SESSION_RETENTION = 24 * 3600.0
+
+
+class WatermarkStore(SQLiteStore):
+    """
+    The query, watermark and matching issues of each named poll_changes watch.
+
+    Watermarks are kept per scope, the client that polls: "user:<account>"
+    when one client is served, or "session:<id>" for each client of a
+    shared server, so clients using the same name do not advance each
+    other's watermark.
+    """
+
+    filename = "watermarks.sqlite3"
+    schema = """
+    CREATE TABLE IF NOT EXISTS watermarks (
+        server TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        name TEXT NOT NULL,
+        jql TEXT NOT NULL,
+        watermark REAL NOT NULL,
+        issues TEXT NOT NULL,
+        polled REAL NOT NULL,
+        PRIMARY KEY (server, scope, name)
+    );
+    """
+
+    def prepare(self) -> None:
+        self._prune()
+
+    def _prune(self) -> None:
+        self._db.execute(
+            "DELETE FROM watermarks WHERE scope LIKE 'session:%' AND polled < ?", (time.time() - SESSION_RETENTION,)
+        )
+
+    def load(self, server: str, scope: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        The state of a named watermark.
+
+        Returns:
+            None if unknown, else the watermark's jql, watermark (start of the
+            last poll, epoch seconds) and issues ({key: updated timestamp})
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM watermarks WHERE server = ? AND scope = ? AND name = ?", (server, scope, name)
+            ).fetchone()
+        if row is None:
+            return None
+        state = dict(row)
+        state["issues"] = json.loads(state["issues"])
+        return state
+
+    def save(self, server: str, scope: str, name: str, jql: str, watermark: float, issues: Dict[str, str]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks (server, scope, name, jql, watermark, issues, polled) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (server, scope, name, jql, watermark, json.dumps(issues, separators=(",", ":")), time.time()),
+            )
+            self._prune()
+
+
+def get_watermarks() -> WatermarkStore:
+    return open_store(WatermarkStore)
@@ -0,0 +1,121 @@
+"""Worklogs of worklog_report and the watermarks they were synced up to."""
+import time
+from typing import Any, List, Optional, Tuple
+
+from src.stores import SQLiteStore, open_store
+
+
+class WorklogStore(SQLiteStore):
+    """Worklogs per server, the issues they were logged on and the sync watermarks."""
+
+    filename = "worklogs.sqlite3"
+    schema = """
+    CREATE TABLE IF NOT EXISTS worklogs (
+        server TEXT NOT NULL,
+        id TEXT NOT NULL,
+        issue_id TEXT NOT NULL,
+        author TEXT,
+        started REAL NOT NULL,
+        seconds INTEGER NOT NULL,
+        PRIMARY KEY (server, id)
+    );
+    CREATE INDEX IF NOT EXISTS worklogs_started ON worklogs (server, started);
+    CREATE TABLE IF NOT EXISTS worklog_issues (
+        server TEXT NOT NULL,
+        issue_id TEXT NOT NULL,
+        issue_key TEXT NOT NULL,
+        project TEXT NOT NULL,
+        epic TEXT,
+        PRIMARY KEY (server, issue_id)
+    );
+    CREATE TABLE IF NOT EXISTS worklog_watermarks (
+        server TEXT PRIMARY KEY,
+        floor INTEGER NOT NULL,
+        updated_since INTEGER NOT NULL,
+        deleted_since INTEGER NOT NULL,
+        synced REAL NOT NULL
+    );
+    """
+
+    def watermarks(self, server: str) -> Optional[Tuple[int, int, int]]:
+        """
+        How far the server's worklogs are synced, in epoch milliseconds.
+
+        Returns:
+            None if never synced, else the update time from which worklogs are
+            stored and those up to which updated and deleted worklogs are stored
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT floor, updated_since, deleted_since FROM worklog_watermarks WHERE server = ?", (server,)
+            ).fetchone()
+        return (row[0], row[1], row[2]) if row else None
+
+    def store(
+        self,
+        server: str,
+        worklogs: List[Tuple[str, str, Optional[str], float, int]],
+        deleted: List[str],
+        watermarks: Tuple[int, int, int]
+    ) -> None:
+        """
+        Store changed worklogs, drop deleted ones and advance the watermarks, atomically.
+
+        Args:
+            worklogs: (id, issue id, author, started epoch seconds, seconds spent) of each worklog
+            deleted: Ids of deleted worklogs
+            watermarks: The new floor, updated and deleted watermarks in epoch milliseconds
+        """
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO worklogs (server, id, issue_id, author, started, seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(server,) + tuple(worklog) for worklog in worklogs],
+            )
+            db.executemany(
+                "DELETE FROM worklogs WHERE server = ? AND id = ?", [(server, worklog_id) for worklog_id in deleted]
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO worklog_watermarks (server, floor, updated_since, deleted_since, synced) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (server, watermarks[0], watermarks[1], watermarks[2], time.time()),
+            )
+
+    def unknown_issues(self, server: str) -> List[str]:
+        """Ids of issues with stored worklogs whose key, project and epic are not stored."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT w.issue_id FROM worklogs w LEFT JOIN worklog_issues i "
+                "ON i.server = w.server AND i.issue_id = w.issue_id WHERE w.server = ? AND i.issue_id IS NULL",
+                (server,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def store_issues(self, server: str, issues: List[Tuple[str, str, str, Optional[str]]]) -> None:
+        """Store the (issue id, key, project key, epic key) of issues with worklogs."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO worklog_issues (server, issue_id, issue_key, project, epic) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(server,) + tuple(issue) for issue in issues],
+            )
+
+    def rows(
+        self, server: str, start: float, end: float, project: Optional[str] = None
+    ) -> List[Tuple[Optional[str], float, int, Optional[str], Optional[str], Optional[str]]]:
+        """(author, started, seconds, issue key, project, epic) of the worklogs started in [start, end)."""
+        query = (
+            "SELECT w.author, w.started, w.seconds, i.issue_key, i.project, i.epic FROM worklogs w "
+            "LEFT JOIN worklog_issues i ON i.server = w.server AND i.issue_id = w.issue_id "
+            "WHERE w.server = ? AND w.started >= ? AND w.started < ?"
+        )
+        params: List[Any] = [server, start, end]
+        if project:
+            query += " AND i.project = ?"
+            params.append(project.upper())
+        with self._lock:
+            return [tuple(row) for row in self._db.execute(query, params).fetchall()]
+
+
+def get_worklogs() -> WorklogStore:
+    return open_store(WorklogStore)
@@ -0,0 +1,474 @@
+"""Tools that change many JIRA issues in one call."""
+import json
+import logging
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from jira.exceptions import JIRAError
+
+from src.catalog import get_priorities, match_name, prime_field_cache
+from src.concurrency import run_concurrently
+from src.fields import encode_fields, field_names
+from src.main import initialize_jira
+from src.progress import report_progress
+from src.workflow import graph_for, is_issue_key, match_transition, target_status
+
+logger = logging.getLogger(__name__)
+
+# Issues fetched per search request (JIRA's page size limit)
+BULK_PAGE_SIZE = 100
+
+# Most issues one bulk edit task may select
+BULK_EDIT_LIMIT = 1000
+
+# Seconds to wait for a bulk edit task before reporting it as still running
+BULK_EDIT_TIMEOUT = 120.0
+
+INVALID_KEY_ERROR = "Not a valid issue key"
+
+def _collect_issues(
+    jira,
+    jql: Optional[str],
+    issue_keys: Optional[List[str]],
+    fields: List[str],
+    max_issues: int
+) -> Tuple[List[Dict[str, Any]], List[str], List[str], int]:
+    """
+    Fetch the raw JSON of the issues a bulk tool works on.
+
+    Returns:
+        (issues, missing keys, malformed keys, total matches of the JQL)
+    """
+    if bool(jql) == bool(issue_keys):
+        raise ValueError("Provide either jql or issue_keys")
+
+    # Reuse the cached field list instead of letting the client fetch it again
+    prime_field_cache(jira)
+
+    if jql:
+        issues: List[Dict[str, Any]] = []
+        total = 0
+        while len(issues) < max_issues:
+            page = jira.search_issues(
+                jql_str=jql,
+                startAt=len(issues),
+                maxResults=min(BULK_PAGE_SIZE, max_issues - len(issues)),
+                fields=list(fields),
+                json_result=True
+            )
+            batch = page.get('issues', [])
+            total = page.get('total', len(batch))
+            issues.extend(batch)
+            if not batch or len(issues) >= total:
+                break
+        return issues, [], [], total
+
+    keys = list(dict.fromkeys(key.strip().upper() for key in issue_keys if key.strip()))
+    if len(keys) > max_issues:
+        raise ValueError(f"{len(keys)} issue keys given; at most {max_issues} can be changed in one call")
+
+    # Keys go into the JQL as is, so anything not shaped like a key is rejected instead of searched for
+    invalid = [key for key in keys if not is_issue_key(key)]
+    keys = [key for key in keys if is_issue_key(key)]
+
+    # Look the keys up a page at a time; unknown keys are reported instead of failing the query
+    issues = []
+    for start in range(0, len(keys), BULK_PAGE_SIZE):
+        chunk = keys[start:start + BULK_PAGE_SIZE]
+        page = jira.search_issues(
+            jql_str=f"key in ({', '.join(chunk)})",
+            maxResults=len(chunk),
+            fields=list(fields),
+            validate_query=False,
+            json_result=True
+        )
+        issues.extend(page.get('issues', []))
+    found = {raw['key'].upper() for raw in issues}
+    return issues, [key for key in keys if key not in found], invalid, len(keys) + len(invalid)
+
+def bulk_transition(
+    status: str,
+    jql: Optional[str] = None,
+    issue_keys: Optional[List[str]] = None,
+    comment: Optional[str] = None,
+    dry_run: bool = False,
+    max_issues: int = 500
+) -> Dict[str, Any]:
+    """
+    Transition every issue matching a JQL query (or a list of keys) to a status.
+
+    Issues are grouped by project, issue type and current status, so the
+    transition is looked up once per group; the transitions themselves are
+    then performed concurrently under the server's shared rate limit.
+
+    Args:
+        status: The target status (or transition name)
+        jql: JQL query selecting the issues (e.g. "project = DEMO AND sprint in openSprints()")
+        issue_keys: Issue keys to transition, instead of a JQL query
+        comment: Optional comment to add to every transitioned issue
+        dry_run: Whether to only count what would be transitioned, without changing anything (default: False)
+        max_issues: Maximum number of issues to process (default: 500)
+
+    Returns:
+        Dictionary containing counts per outcome, one entry per (project, issue type, status) group
+        and, unless dry_run is set, the result of every issue
+    """
+    # Initialize JIRA client
+    jira = initialize_jira()
+
+    issues, missing, invalid, total = _collect_issues(
+        jira, jql, issue_keys, ['status', 'project', 'issuetype'], max_issues
+    )
+
+    # Group the issues by everything that decides which transitions they have
+    grouped: Dict[Tuple[Any, Any, Any], List[str]] = {}
+    for raw in issues:
+        fields = raw.get('fields') or {}
+        group_key = (
+            (fields.get('project') or {}).get('key'),
+            (fields.get('issuetype') or {}).get('name'),
+            (fields.get('status') or {}).get('name')
+        )
+        grouped.setdefault(group_key, []).append(raw['key'])
+
+    def resolve(group_key):
+        """Find a group's transition, from the cached workflow graph or one issue's transitions."""
+        project, issue_type, from_status = group_key
+        if isinstance(from_status, str) and from_status.lower() == status.lower():
+            return None, []
+        graph = graph_for(jira, project, issue_type)
+        if graph is not None and isinstance(from_status, str) and graph.is_explored(from_status):
+            step = match_transition(graph.transitions_from(from_status), status)
+            if step is not None:
+                return step, []
+        transitions = jira.transitions(grouped[group_key][0])
+        if graph is not None and isinstance(from_status, str):
+            graph.learn(from_status, transitions)
+        return match_transition(transitions, status), [t['name'] for t in transitions]
+
+    groups: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+    steps: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+    for group_key, resolved, error in run_concurrently(resolve, list(grouped)):
+        project, issue_type, from_status = group_key
+        group = {
+            'project': project,
+            'issue_type': issue_type,
+            'from_status': from_status,
+            'count': len(grouped[group_key])
+        }
+        if error is not None:
+            group.update(result='failed', error=str(error))
+        elif isinstance(from_status, str) and from_status.lower() == status.lower():
+            group['result'] = 'unchanged'
+        elif resolved[0] is None:
+            group.update(result='unavailable', available_transitions=resolved[1])
+        else:
+            steps[group_key] = resolved[0]
+            group.update(result='ready', transition=resolved[0]['name'])
+        groups[group_key] = group
+
+    counts = {'transitioned' if not dry_run else 'would_transition': 0, 'unchanged': 0,
+              'unavailable': 0, 'failed': len(invalid), 'not_found': len(missing)}
+    for group in groups.values():
+        outcome = group['result']
+        if outcome == 'ready':
+            outcome = 'would_transition' if dry_run else 'transitioned'
+        counts[outcome] += group['count']
+
+    details = {
+        'target_status': status,
+        'dry_run': dry_run,
+        'total': total,
+        'processed': len(issues) + len(missing) + len(invalid),
+        'counts': counts,
+        'groups': list(groups.values())
+    }
+    if dry_run:
+        return {
+            'status': 'success',
+            'message': f"{counts['would_transition']} of {len(issues)} issues would be transitioned to {status}",
+            'details': details
+        }
+
+    def apply(item):
+        """Transition one issue with its group's transition."""
+        key, _, step = item
+        try:
+            jira.transition_issue(key, step['id'], comment=comment)
+        except JIRAError as e:
+            if e.status_code != 400:
+                raise
+            # This issue's transitions differ from its group's (e.g. a condition); use its own
+            own = match_transition(jira.transitions(key), status)
+            if own is None or own['id'] == step['id']:
+                raise
+            jira.transition_issue(key, own['id'], comment=comment)
+            step = own
+        return step
+
+    results = []
+    work = []
+    for group_key, keys in grouped.items():
+        from_status = group_key[2]
+        if group_key in steps:
+            work.extend((key, from_status, steps[group_key]) for key in keys)
+        else:
+            results.extend({'key': key, 'result': groups[group_key]['result'], 'from': from_status} for key in keys)
+
+    # Perform the transitions concurrently; one failing issue does not stop the others
+    progress = _Progress('bulk_transition', len(work))
+    for (key, from_status, _), step, error in run_concurrently(apply, work, on_done=lambda *_: progress.advance()):
+        if error is None:
+            results.append({'key': key, 'result': 'transitioned', 'from': from_status, 'to': target_status(step)})
+        else:
+            counts['transitioned'] -= 1
+            counts['failed'] += 1
+            results.append({'key': key, 'result': 'failed', 'from': from_status,
+                            'error': getattr(error, 'text', None) or str(error)})
+    results.extend({'key': key, 'result': 'not_found'} for key in missing)
+    results.extend({'key': key, 'result': 'failed', 'error': INVALID_KEY_ERROR} for key in invalid)
+    details['issues'] = results
+
+    return {
+        'status': 'success' if not counts['failed'] else 'partial',
+        'message': f"Transitioned {counts['transitioned']} of {len(issues)} issues to {status}"
+                   + (f" ({counts['failed']} failed)" if counts['failed'] else ''),
+        'details': details
+    }
+
+class _Progress:
+    """Report how far a bulk operation has got to the client and the log, about every tenth of the way."""
+
+    def __init__(self, operation: str, total: int):
+        self.operation = operation
+        self.total = total
+        self.done = 0
+        self.step = max(1, total // 10)
+
+    def advance(self, count: int = 1) -> None:
+        if count <= 0:
+            return
+        before = self.done
+        self.done = min(self.total, self.done + count)
+        if self.done // self.step != before // self.step or self.done == self.total:
+            logger.info("%s: %d/%d issues processed", self.operation, self.done, self.total)
+            report_progress(self.done, self.total)
+
+def _bulk_edit_input(
+    jira,
+    add_labels: List[str],
+    remove_labels: List[str],
+    priority_id: Optional[str],
+    other_changes: bool
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a bulk edit request for the change set, or None if the bulk edit endpoint cannot express it.
+
+    Only JIRA Cloud has the endpoint; there it is used for label and priority changes.
+    """
+    if getattr(jira, '_is_cloud', False) is not True or other_changes or (add_labels and remove_labels):
+        return None
+    actions, edited = [], {}
+    if add_labels or remove_labels:
+        actions.append('labels')
+        edited['labelsFields'] = [{
+            'fieldId': 'labels',
+            'bulkEditMultiSelectFieldOption': 'ADD' if add_labels else 'REMOVE',
+            'labels': [{'name': label} for label in add_labels or remove_labels]
+        }]
+    if priority_id:
+        actions.append('priority')
+        edited['priority'] = {'priorityId': priority_id}
+    return {'selectedActions': actions, 'editedFieldsInput': edited, 'sendBulkNotification': False}
+
+def _run_bulk_edit(
+    jira,
+    issues: List[Dict[str, Any]],
+    edit: Dict[str, Any],
+    progress: _Progress
+) -> Optional[Tuple[Dict[str, str], Optional[str]]]:
+    """
+    Submit bulk edit tasks for the issues and wait for them.
+
+    A task still running after BULK_EDIT_TIMEOUT is left to finish on its
+    own, and the issues of later chunks are reported as not submitted.
+
+    Returns:
+        (error by issue key, id of a task still running or None), or None if
+        the endpoint is unavailable or refused the request
+    """
+    keys_by_id = {str(raw.get('id')): raw['key'] for raw in issues}
+    failures: Dict[str, str] = {}
+    for start in range(0, len(issues), BULK_EDIT_LIMIT):
+        chunk = issues[start:start + BULK_EDIT_LIMIT]
+        try:
+            response = jira._session.post(
+                jira._get_url('bulk/issues/fields'),
+                data=json.dumps(dict(edit, selectedIssueIdsOrKeys=[raw['key'] for raw in chunk]))
+            )
+        except JIRAError as e:
+            if start == 0 and e.status_code is not None and (400 <= e.status_code < 500 or e.status_code == 501):
+                return None
+            raise
+        task_id = str(response.json()['taskId'])
+
+        # Poll the task with growing intervals until it finishes
+        deadline = time.monotonic() + BULK_EDIT_TIMEOUT
+        delay = 0.25
+        reported = 0
+        while True:
+            task = jira._session.get(jira._get_url(f'bulk/queue/{task_id}')).json()
+            processed = len(task.get('processedAccessibleIssues') or [])
+            progress.advance(processed - reported)
+            reported = processed
+            if task.get('status') not in ('ENQUEUED', 'RUNNING'):
+                break
+            if time.monotonic() > deadline:
+                for raw in issues[start + len(chunk):]:
+                    failures[raw['key']] = f"Not submitted: bulk edit task {task_id} was still running"
+                return failures, task_id
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+        for issue_id, errors in (task.get('failedAccessibleIssues') or {}).items():
+            key = keys_by_id.get(str(issue_id), str(issue_id))
+            failures[key] = '; '.join(str(error) for error in errors) if isinstance(errors, list) else str(errors)
+        if task.get('status') != 'COMPLETE':
+            done = {keys_by_id.get(str(issue_id)) for issue_id in task.get('processedAccessibleIssues') or []}
+            for raw in chunk:
+                if raw['key'] not in done:
+                    failures.setdefault(raw['key'], f"Bulk edit task {task_id} ended with status {task.get('status')}")
+        progress.advance(len(chunk) - reported)
+    return failures, None
+
+def bulk_update_issues(
+    jql: Optional[str] = None,
+    issue_keys: Optional[List[str]] = None,
+    add_labels: Optional[List[str]] = None,
+    remove_labels: Optional[List[str]] = None,
+    priority: Optional[str] = None,
+    assignee: Optional[str] = None,
+    components: Optional[List[str]] = None,
+    custom_fields: Optional[Dict[str, Any]] = None,
+    max_issues: int = 500
+) -> Dict[str, Any]:
+    """
+    Apply one set of field changes to every issue matching a JQL query (or a list of keys).
+
+    On JIRA Cloud label and priority changes use the bulk edit endpoint;
+    otherwise each issue is updated with a single PUT, concurrently under
+    the server's shared rate limit.
+
+    Args:
+        jql: JQL query selecting the issues (e.g. "project = DEMO AND labels = triage")
+        issue_keys: Issue keys to update, instead of a JQL query
+        add_labels: Labels to add to every issue
+        remove_labels: Labels to remove from every issue
+        priority: Priority to set
+        assignee: Username to assign the issues to
+        components: Component names to set, replacing the current components
+        custom_fields: Other fields to set, keyed by field name or id (e.g. {"Story Points": 3})
+        max_issues: Maximum number of issues to update (default: 500)
+
+    Returns:
+        Dictionary containing the number of issues updated and the error of every issue that failed
+    """
+    add_labels = [label for label in add_labels or [] if label]
+    remove_labels = [label for label in remove_labels or [] if label]
+    if not any([add_labels, remove_labels, priority, assignee, components is not None, custom_fields]):
+        raise ValueError("No changes given")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+
+    # Check the priority and custom fields before changing anything
+    priority_id = None
+    if priority:
+        priorities = get_priorities(jira)
+        if priorities:
+            matched = match_name(priority, [p['name'] for p in priorities])
+            if matched is None:
+                raise ValueError(
+                    f"Priority '{priority}' does not exist. "
+                    f"Available priorities: {', '.join(p['name'] for p in priorities)}"
+                )
+            priority = matched
+            priority_id = next(p['id'] for p in priorities if p['name'] == matched)
+    extra_fields = encode_fields(jira, custom_fields) if custom_fields else {}
+
+    changes = []
+    if add_labels:
+        changes.append(f"Labels added: {', '.join(add_labels)}")
+    if remove_labels:
+        changes.append(f"Labels removed: {', '.join(remove_labels)}")
+    if priority:
+        changes.append(f"Priority set to: {priority}")
+    if assignee:
+        changes.append(f"Assigned to: {assignee}")
+    if components is not None:
+        changes.append(f"Components set to: {', '.join(components) or 'none'}")
+    if extra_fields:
+        changes.append(f"Fields updated: {', '.join(field_names(jira, list(extra_fields)))}")
+
+    issues, missing, invalid, total = _collect_issues(jira, jql, issue_keys, ['key'], max_issues)
+    progress = _Progress('bulk_update_issues', len(issues))
+
+    # Prefer one server-side bulk edit task over a request per issue
+    method = 'bulk_edit'
+    task_id = None
+    bulk = None
+    edit = _bulk_edit_input(
+        jira, add_labels, remove_labels, priority_id,
+        other_changes=bool(assignee or components is not None or extra_fields or (priority and not priority_id))
+    )
+    if edit is not None and issues:
+        bulk = _run_bulk_edit(jira, issues, edit, progress)
+
+    if bulk is not None:
+        failures, task_id = bulk
+    else:
+        method = 'single_updates'
+        payload: Dict[str, Any] = {'fields': dict(extra_fields), 'update': {}}
+        if add_labels or remove_labels:
+            payload['update']['labels'] = (
+                [{'add': label} for label in add_labels] + [{'remove': label} for label in remove_labels]
+            )
+        if priority:
+            payload['fields']['priority'] = {'name': priority}
+        if assignee:
+            payload['fields']['assignee'] = {'name': assignee}
+        if components is not None:
+            payload['fields']['components'] = [{'name': name} for name in components]
+        body = json.dumps(payload)
+
+        def update(raw):
+            jira._session.put(jira._get_url(f"issue/{raw['key']}"), data=body)
+
+        failures = {}
+        for raw, _, error in run_concurrently(update, issues, on_done=lambda *_: progress.advance()):
+            if error is not None:
+                failures[raw['key']] = getattr(error, 'text', None) or str(error)
+
+    updated = len(issues) - len(failures) if task_id is None else progress.done
+    failures.update((key, INVALID_KEY_ERROR) for key in invalid)
+    details = {
+        'method': method,
+        'changes': changes,
+        'total': total,
+        'updated': updated,
+        'failed': len(failures),
+        'not_found': missing,
+        'failures': [{'key': key, 'error': error} for key, error in sorted(failures.items())]
+    }
+    if task_id is not None:
+        details['task_id'] = task_id
+        message = (
+            f"Bulk edit task {task_id} is still running ({progress.done} of {len(issues)} issues updated so far)"
+            + (f"; {len(failures)} issues failed or were not submitted" if failures else '')
+        )
+    else:
+        message = f"Updated {updated} of {len(issues)} issues" + (f" ({len(failures)} failed)" if failures else '')
+    return {
+        'status': 'success' if not failures and task_id is None else 'partial',
+        'message': message,
+        'details': details
+    }
@@ -0,0 +1,212 @@
+"""Tools for measuring the flow of work through JIRA: lead time, cycle time and throughput."""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.catalog import get_status_categories, prime_field_cache
+from src.concurrency import run_concurrently
+from src.main import initialize_jira
+from src.stores.changelogs import get_changelogs
+from src.tools.history import sync_changelogs
+
+# Issues fetched per search request (JIRA's page size limit)
+FLOW_PAGE_SIZE = 100
+
+SECONDS_PER_DAY = 86400.0
+
+PERCENTILES = (50, 85, 95)
+
+
+def _matching_issues(jira, jql: str, max_issues: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    The created and updated timestamps and current status of the issues matching `jql`.
+
+    The first page gives the total; the remaining pages are fetched concurrently.
+
+    Returns:
+        (raw issues, total matches of the query)
+    """
+    fields = ['created', 'updated', 'status']
+
+    def fetch(start: int) -> List[Dict[str, Any]]:
+        return jira.search_issues(
+            jql_str=jql,
+            startAt=start,
+            maxResults=min(FLOW_PAGE_SIZE, max_issues - start),
+            fields=fields,
+            json_result=True
+        ).get('issues', [])
+
+    first = jira.search_issues(
+        jql_str=jql, startAt=0, maxResults=min(FLOW_PAGE_SIZE, max_issues), fields=fields, json_result=True
+    )
+    issues = first.get('issues', [])
+    total = first.get('total', len(issues))
+    starts = range(len(issues), min(total, max_issues), FLOW_PAGE_SIZE) if issues else []
+    for _, page, error in run_concurrently(fetch, starts):
+        if error is not None:
+            raise error
+        issues.extend(page)
+
+    # Issues moving between pages while they are read would otherwise be counted twice
+    return list({raw['key']: raw for raw in issues}.values()), total
+
+
+def _epoch_seconds(timestamps: List[str]) -> np.ndarray:
+    """Parse JIRA timestamps (e.g. 2024-03-21T10:00:00.000+0000) to UTC epoch seconds."""
+    if not timestamps:
+        return np.zeros(0)
+    local = np.array([value[:23] for value in timestamps], dtype='datetime64[ms]').astype(np.int64) / 1000.0
+    offsets = np.array([
+        (-1 if value[23] == '-' else 1) * (int(value[24:26]) * 3600 + int(value[26:28]) * 60)
+        for value in timestamps
+    ])
+    return local - offsets
+
+
+def _summary(days: np.ndarray) -> Dict[str, Any]:
+    """Count, mean and percentiles of durations in days."""
+    if not days.size:
+        return {'count': 0}
+    summary: Dict[str, Any] = {'count': int(days.size), 'mean': round(float(days.mean()), 2)}
+    for percentile, value in zip(PERCENTILES, np.percentile(days, PERCENTILES)):
+        summary[f'p{percentile}'] = round(float(value), 2)
+    return summary
+
+
+def flow_metrics(
+    jql: str,
+    weeks: int = 12,
+    max_issues: int = 2000
+) -> Dict[str, Any]:
+    """
+    Compute lead time, cycle time, time in status and weekly throughput for the issues matching a JQL query.
+
+    Status histories come from the issues' changelogs, which are cached in a local
+    store; only the changelogs of issues updated since they were cached are
+    fetched again, so re-running a report is fast.
+
+    Args:
+        jql: JIRA Query Language string (e.g. "project = DEMO AND created >= -90d")
+        weeks: Number of weeks of throughput to report, ending with the current week (default: 12)
+        max_issues: Maximum number of issues to analyse (default: 2000)
+
+    Returns:
+        Dictionary containing lead and cycle time percentiles in days, time in status
+        and the number of issues completed per week
+    """
+    if not jql or not jql.strip():
+        raise ValueError("JQL query cannot be empty")
+    if weeks < 1:
+        raise ValueError("weeks must be at least 1")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+    server = jira._options['server']
+
+    # Reuse the cached field list instead of letting the client fetch it again
+    prime_field_cache(jira)
+
+    issues, total = _matching_issues(jira, jql, max_issues)
+    synced, errors = sync_changelogs(jira, server, {raw['key']: raw['fields'].get('updated') for raw in issues})
+    issues = [raw for raw in issues if raw['key'] not in errors]
+
+    # Status categories by name; statuses only seen in the current issues are learned from them
+    categories = dict(get_status_categories(jira) or {})
+    for raw in issues:
+        status = raw['fields'].get('status') or {}
+        categories.setdefault(status.get('name'), (status.get('statusCategory') or {}).get('key', 'indeterminate'))
+
+    # Every issue is a run of points: its creation, then each status change. A point starts
+    # the time spent in a status, which lasts until the next point of the issue (or now).
+    changelogs = get_changelogs()
+    codes: Dict[str, int] = {}
+    point_times: List[str] = []
+    point_issue: List[int] = []
+    point_status: List[int] = []
+    for index, raw in enumerate(issues):
+        changes = [
+            (entry['created'], item['from'], item['to'])
+            for entry in changelogs.load(server, raw['key'])
+            for item in entry['items'] if item['field'] == 'status'
+        ]
+        current = (raw['fields'].get('status') or {}).get('name')
+        initial = changes[0][1] if changes else current
+        for timestamp, status in [(raw['fields']['created'], initial)] + [(c[0], c[2]) for c in changes]:
+            point_times.append(timestamp)
+            point_issue.append(index)
+            point_status.append(codes.setdefault(status, len(codes)))
+
+    now = time.time()
+    names = list(codes)
+    category = np.array([categories.get(name, 'indeterminate') for name in names], dtype=object)
+    times = _epoch_seconds(point_times)
+    issue = np.array(point_issue, dtype=np.int64)
+    status = np.array(point_status, dtype=np.int64)
+
+    # Every issue has at least one point, so with no points there are no issues
+    first_of_issue = np.append(True, issue[1:] != issue[:-1])[:issue.size]
+    last_of_issue = np.append(issue[1:] != issue[:-1], True)[:issue.size]
+    ends = np.where(last_of_issue, now, np.append(times[1:], now))
+    durations = np.clip(ends - times, 0, None)
+
+    # Time in each status per issue
+    in_status = np.zeros((len(issues), len(names)))
+    np.add.at(in_status, (issue, status), durations)
+
+    is_done = (category[status] == 'done').astype(bool)
+    is_started = (category[status] != 'new').astype(bool)
+    entering_done = is_done & (first_of_issue | ~np.append(False, is_done[:-1])[:issue.size])
+
+    created = np.full(len(issues), np.nan)
+    created[issue[first_of_issue]] = times[first_of_issue]
+    started = np.full(len(issues), np.inf)
+    np.minimum.at(started, issue[is_started], times[is_started])
+    done = np.full(len(issues), -np.inf)
+    np.maximum.at(done, issue[entering_done], times[entering_done])
+
+    # Completed issues are those whose current status (their last point) is a done status
+    completed = np.zeros(len(issues), dtype=bool)
+    completed[issue[last_of_issue]] = is_done[last_of_issue]
+
+    lead = (done - created)[completed] / SECONDS_PER_DAY
+    cycle = (done - started)[completed & np.isfinite(started)] / SECONDS_PER_DAY
+
+    time_in_status = {}
+    for code, name in enumerate(names):
+        if category[code] == 'done':
+            continue
+        spent = in_status[:, code]
+        time_in_status[name] = _summary(spent[spent > 0] / SECONDS_PER_DAY)
+
+    # Completions per calendar week (Monday to Sunday, UTC), the current week last
+    today = datetime.fromtimestamp(now, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    week = np.floor((done[completed] - first_week.timestamp()) / (7 * SECONDS_PER_DAY)).astype(np.int64)
+    per_week = np.bincount(week[(week >= 0) & (week < weeks)], minlength=weeks)
+    throughput = [
+        {'week': (first_week + timedelta(weeks=n)).date().isoformat(), 'completed': int(count)}
+        for n, count in enumerate(per_week)
+    ]
+
+    details = {
+        'total': total,
+        'analysed': len(issues),
+        'completed': int(completed.sum()),
+        'lead_time_days': _summary(lead),
+        'cycle_time_days': _summary(cycle),
+        'time_in_status_days': time_in_status,
+        'throughput': throughput,
+        'changelogs_fetched': len(synced) - len(errors),
+        'errors': errors
+    }
+    return {
+        'status': 'success' if not errors else 'partial',
+        'message': (
+            f"Analysed {len(issues)} of {total} issues: {details['completed']} completed, "
+            f"median cycle time {details['cycle_time_days'].get('p50', 'n/a')} days"
+        ),
+        'details': details
+    }
@@ -0,0 +1,168 @@
+"""Tools for exploring the hierarchy and links around a JIRA issue."""
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.catalog import prime_field_cache
+from src.concurrency import run_concurrently
+from src.main import initialize_jira
+from src.workflow import is_issue_key
+
+# Keys per `parent in (...)` or `key in (...)` clause, and issues per search page
+GRAPH_CHUNK_SIZE = 100
+
+_GRAPH_FIELDS = ['summary', 'status', 'issuetype', 'parent', 'issuelinks']
+
+
+def _search_all(jira, jql: str, limit: int) -> List[Dict[str, Any]]:
+    """Every issue matching `jql`, up to `limit`, a page at a time."""
+    issues: List[Dict[str, Any]] = []
+    while len(issues) < limit:
+        page = jira.search_issues(
+            jql_str=jql,
+            startAt=len(issues),
+            maxResults=min(GRAPH_CHUNK_SIZE, limit - len(issues)),
+            fields=_GRAPH_FIELDS,
+            validate_query=False,
+            json_result=True
+        )
+        batch = page.get('issues', [])
+        issues.extend(batch)
+        if not batch or len(issues) >= page.get('total', 0):
+            break
+    return issues
+
+
+def _links(raw: Dict[str, Any], link_types: Optional[Set[str]]) -> List[Tuple[str, str, str]]:
+    """(outward key, inward key, relation) of an issue's links, e.g. ("DEMO-1", "DEMO-2", "blocks")."""
+    links = []
+    for link in raw['fields'].get('issuelinks') or []:
+        link_type = link.get('type') or {}
+        names = {str(link_type.get(name, '')).lower() for name in ('name', 'inward', 'outward')}
+        if link_types is not None and not names & link_types:
+            continue
+        relation = link_type.get('outward') or link_type.get('name', 'relates to')
+        if 'outwardIssue' in link:
+            links.append((raw['key'], link['outwardIssue']['key'], relation))
+        elif 'inwardIssue' in link:
+            links.append((link['inwardIssue']['key'], raw['key'], relation))
+    return links
+
+
+def get_issue_graph(
+    issue_key: str,
+    depth: int = 2,
+    link_types: Optional[List[str]] = None,
+    include_children: bool = True,
+    include_links: bool = True,
+    max_nodes: int = 500
+) -> Dict[str, Any]:
+    """
+    Get the tree of issues below an issue (children, sub-tasks) and the issues linked to them.
+
+    The graph is explored breadth first, one level per round. Each level is fetched
+    with a few batched searches (`parent in (...)` for children, `key in (...)` for
+    linked issues), so the number of requests grows with the depth, not the number
+    of issues.
+
+    Args:
+        issue_key: The JIRA issue key to start from (e.g., "PROJ-123")
+        depth: How many levels to explore below the issue (default: 2)
+        link_types: Only follow links of these types, by name or description (e.g. ["Blocks", "relates to"])
+        include_children: Whether to follow child issues and sub-tasks (default: True)
+        include_links: Whether to follow issue links (default: True)
+        max_nodes: Maximum number of issues to return (default: 500)
+
+    Returns:
+        Dictionary containing the issues by key and the edges between them as an adjacency list
+    """
+    if depth < 0:
+        raise ValueError("depth cannot be negative")
+    if max_nodes < 1:
+        raise ValueError("max_nodes must be at least 1")
+    issue_key = issue_key.strip().upper()
+    if not is_issue_key(issue_key):
+        raise ValueError(f"'{issue_key}' is not a valid issue key")
+    wanted_links = {name.lower() for name in link_types} if link_types else None
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+
+    # Reuse the cached field list instead of letting the client fetch it again
+    prime_field_cache(jira)
+
+    root = _search_all(jira, f"key in ({issue_key})", 1)
+    if not root:
+        raise ValueError(f"Issue {issue_key} not found")
+
+    visited: Dict[str, Dict[str, Any]] = {root[0]['key']: root[0]}
+    levels = {root[0]['key']: 0}
+    frontier = [root[0]]
+    truncated = False
+    for level in range(1, depth + 1):
+        if not frontier:
+            break
+        clauses = []
+        if include_children:
+            keys = [raw['key'] for raw in frontier]
+            clauses += [
+                f"parent in ({', '.join(keys[start:start + GRAPH_CHUNK_SIZE])})"
+                for start in range(0, len(keys), GRAPH_CHUNK_SIZE)
+            ]
+        if include_links:
+            linked = sorted({
+                key for raw in frontier for link in _links(raw, wanted_links) for key in link[:2]
+                if key not in visited
+            })
+            clauses += [
+                f"key in ({', '.join(linked[start:start + GRAPH_CHUNK_SIZE])})"
+                for start in range(0, len(linked), GRAPH_CHUNK_SIZE)
+            ]
+
+        room = max_nodes - len(visited)
+        frontier = []
+        for _, found, error in run_concurrently(lambda jql: _search_all(jira, jql, room + 1), clauses):
+            if error is not None:
+                raise error
+            for raw in found:
+                if raw['key'] in visited:
+                    continue
+                if len(visited) >= max_nodes:
+                    truncated = True
+                    break
+                visited[raw['key']] = raw
+                levels[raw['key']] = level
+                frontier.append(raw)
+
+    # Edges between the issues found: parent to child, and every followed link type
+    edges: Dict[str, List[List[str]]] = {}
+    seen: Set[Tuple[str, str, str]] = set()
+    for raw in visited.values():
+        candidates = _links(raw, wanted_links) if include_links else []
+        parent = (raw['fields'].get('parent') or {}).get('key')
+        if include_children and parent:
+            candidates.append((parent, raw['key'], 'parent of'))
+        for source, target, relation in candidates:
+            if source in visited and target in visited and (source, target, relation) not in seen:
+                seen.add((source, target, relation))
+                edges.setdefault(source, []).append([target, relation])
+
+    nodes = {
+        key: {
+            'summary': raw['fields'].get('summary'),
+            'status': (raw['fields'].get('status') or {}).get('name'),
+            'type': (raw['fields'].get('issuetype') or {}).get('name'),
+            'level': levels[key]
+        }
+        for key, raw in visited.items()
+    }
+
+    return {
+        'status': 'success',
+        'message': f"Found {len(nodes)} issues within {depth} levels of {issue_key}"
+                   + (f" (stopped at max_nodes={max_nodes})" if truncated else ""),
+        'details': {
+            'root': root[0]['key'],
+            'nodes': nodes,
+            'edges': edges,
+            'truncated': truncated
+        }
+    }
@@ -0,0 +1,245 @@
+"""Tools for reading the change history of JIRA issues."""
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.concurrency import run_concurrently
+from src.main import initialize_jira
+from src.stores.changelogs import get_changelogs
+from src.workflow import is_issue_key
+
+# Changelog entries fetched per request (JIRA's page size limit)
+CHANGELOG_PAGE_SIZE = 100
+
+# Most issues get_issue_changelogs reads in one call
+MAX_CHANGELOG_ISSUES = 100
+
+INVALID_KEY_ERROR = "Not a valid issue key"
+
+
+def _entry(history: Dict[str, Any]) -> Dict[str, Any]:
+    """The cached form of one changelog history: who changed which fields when."""
+    return {
+        'id': str(history['id']),
+        'author': (history.get('author') or {}).get('displayName'),
+        'created': history.get('created'),
+        'items': [
+            {'field': item.get('field'), 'from': item.get('fromString'), 'to': item.get('toString')}
+            for item in history.get('items', [])
+        ]
+    }
+
+
+def _extends(head: Optional[Dict[str, Any]], histories: List[Dict[str, Any]], position: int) -> bool:
+    """Whether `histories`, starting at `position`, continue the cached changelog of `head`."""
+    if not head or not head['entries']:
+        return True
+    offset = head['entries'] - 1 - position
+    return 0 <= offset < len(histories) and str(histories[offset]['id']) == head['last_id']
+
+
+def _sync_changelog(jira, server: str, issue_key: str, updated: Optional[str] = None) -> None:
+    """
+    Append the entries of an issue's changelog that are not cached yet.
+
+    Changelog entries never change once written, so only the entries after the
+    last cached one are requested. The page starts one entry early to check that
+    JIRA's changelog still continues the cached one; if it does not, the cache
+    of the issue is dropped and the changelog fetched again.
+
+    Args:
+        updated: The issue's updated timestamp read before syncing, if known
+    """
+    changelogs = get_changelogs()
+    head = changelogs.head(server, issue_key)
+
+    if not jira._is_cloud:
+        # Server and Data Center have no changelog endpoint; the issue returns its whole history
+        raw = jira._get_json(f'issue/{issue_key}', params={'fields': 'updated', 'expand': 'changelog'})
+        histories = (raw.get('changelog') or {}).get('histories', [])
+        if not _extends(head, histories, 0):
+            changelogs.drop(server, issue_key)
+            head = None
+        cached = head['entries'] if head else 0
+        changelogs.append(
+            server, issue_key, cached, [_entry(h) for h in histories[cached:]], raw['fields'].get('updated')
+        )
+        return
+
+    cached = head['entries'] if head else 0
+    start = max(cached - 1, 0)
+    while True:
+        page = jira._get_json(
+            f'issue/{issue_key}/changelog', params={'startAt': start, 'maxResults': CHANGELOG_PAGE_SIZE}
+        )
+        histories = page.get('values', [])
+        if start < cached:
+            if not _extends(head, histories, start):
+                changelogs.drop(server, issue_key)
+                head, cached, start = None, 0, 0
+                continue
+            histories = histories[cached - start:]
+            start = cached
+        changelogs.append(server, issue_key, start, [_entry(h) for h in histories])
+        start += len(histories)
+        cached = start
+        if not histories or page.get('isLast', True) or start >= page.get('total', 0):
+            break
+    if updated is not None:
+        changelogs.append(server, issue_key, start, [], updated)
+
+
+def sync_changelogs(jira, server: str, updated: Dict[str, str]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Bring the cached changelogs of several issues up to date, concurrently.
+
+    Args:
+        updated: The updated timestamp of each issue, read before syncing; issues
+            not updated since their changelog was cached are skipped
+
+    Returns:
+        (keys of the issues that were synced, error of every issue that failed)
+    """
+    changelogs = get_changelogs()
+    stale = []
+    for key, timestamp in updated.items():
+        head = changelogs.head(server, key)
+        if head is None or head['updated'] != timestamp:
+            stale.append(key)
+
+    errors = {}
+    for key, _, error in run_concurrently(lambda key: _sync_changelog(jira, server, key, updated[key]), stale):
+        if error is not None:
+            errors[key] = str(error)
+    return stale, errors
+
+
+def _filter_entries(entries: List[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Keep only the changes to the given fields (case-insensitively), dropping entries left empty."""
+    if not fields:
+        return entries
+    wanted = {field.lower() for field in fields}
+    filtered = []
+    for entry in entries:
+        items = [item for item in entry['items'] if (item['field'] or '').lower() in wanted]
+        if items:
+            filtered.append(dict(entry, items=items))
+    return filtered
+
+
+def _changelog_details(
+    server: str, issue_key: str, fields: Optional[List[str]], max_entries: int
+) -> Dict[str, Any]:
+    entries = _filter_entries(get_changelogs().load(server, issue_key), fields)
+    return {
+        'key': issue_key,
+        'total': len(entries),
+        'entries': entries[-max_entries:] if max_entries > 0 else []
+    }
+
+
+def get_issue_changelog(
+    issue_key: str,
+    fields: Optional[List[str]] = None,
+    max_entries: int = 100
+) -> Dict[str, Any]:
+    """
+    Get the change history of a JIRA issue.
+
+    Entries are cached in a local store as they are read; later calls
+    only fetch the entries added since.
+
+    Args:
+        issue_key: The JIRA issue key (e.g., "PROJ-123")
+        fields: Only report changes to these fields (e.g. ["status", "assignee"])
+        max_entries: Maximum number of entries to return, the most recent ones (default: 100)
+
+    Returns:
+        Dictionary containing the issue's changelog entries, oldest first
+    """
+    issue_key = issue_key.strip().upper()
+    if not issue_key:
+        raise ValueError("An issue key is required")
+    if not is_issue_key(issue_key):
+        raise ValueError(f"'{issue_key}' is not a valid issue key")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+    server = jira._options['server']
+
+    _sync_changelog(jira, server, issue_key)
+    details = _changelog_details(server, issue_key, fields, max_entries)
+
+    return {
+        'status': 'success',
+        'message': f"Retrieved {len(details['entries'])} of {details['total']} changelog entries for issue {issue_key}",
+        'details': details
+    }
+
+
+def get_issue_changelogs(
+    issue_keys: List[str],
+    fields: Optional[List[str]] = None,
+    max_entries: int = 100
+) -> Dict[str, Any]:
+    """
+    Get the change history of several JIRA issues.
+
+    One search reads when each issue was last updated; only the changelogs of
+    issues updated since they were cached are fetched, concurrently.
+
+    Args:
+        issue_keys: The JIRA issue keys (e.g. ["PROJ-1", "PROJ-2"]), at most 100
+        fields: Only report changes to these fields (e.g. ["status", "assignee"])
+        max_entries: Maximum number of entries to return per issue, the most recent ones (default: 100)
+
+    Returns:
+        Dictionary containing the changelog of every issue, the keys that were not found
+        and the keys that could not be read, with their errors
+    """
+    keys = list(dict.fromkeys(key.strip().upper() for key in issue_keys if key.strip()))
+    if not keys:
+        raise ValueError("At least one issue key is required")
+    if len(keys) > MAX_CHANGELOG_ISSUES:
+        raise ValueError(f"{len(keys)} issue keys given; at most {MAX_CHANGELOG_ISSUES} can be read in one call")
+
+    # Keys go into the JQL as is, so anything not shaped like a key is rejected instead of searched for
+    invalid = [key for key in keys if not is_issue_key(key)]
+    valid = [key for key in keys if is_issue_key(key)]
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+    server = jira._options['server']
+
+    # Unknown keys are reported instead of failing the query
+    updated = {}
+    if valid:
+        page = jira.search_issues(
+            jql_str=f"key in ({', '.join(valid)})",
+            maxResults=len(valid),
+            fields=['updated'],
+            validate_query=False,
+            json_result=True
+        )
+        updated = {raw['key'].upper(): raw['fields'].get('updated') for raw in page.get('issues', [])}
+    missing = [key for key in valid if key not in updated]
+
+    stale, errors = sync_changelogs(jira, server, updated)
+    refreshed = len(stale) - len(errors)
+    errors.update((key, INVALID_KEY_ERROR) for key in invalid)
+
+    changelogs = [
+        _changelog_details(server, key, fields, max_entries)
+        for key in keys if key in updated and key not in errors
+    ]
+
+    return {
+        'status': 'success' if not errors else 'partial',
+        'message': (
+            f"Retrieved the changelogs of {len(changelogs)} issues, {refreshed} of them updated "
+            f"since they were cached"
+        ),
+        'details': {
+            'changelogs': changelogs,
+            'not_found': missing,
+            'errors': errors
+        }
+    }
@@ -1,8 +1,28 @@
 """Tools for interacting with JIRA issues."""
-from typing import List, Dict, Any, Optional, Union
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple, Union
 from fastmcp.tools import Tool
+from jira.exceptions import JIRAError
+from requests.exceptions import ConnectTimeout
 
+from src.catalog import (
+    editable_values, invalidate_project, match_name, prime_field_cache, validate_create
+)
+from src.concurrency import run_concurrently
+from src.deadline import current_budget
+from src.fields import compile_projection, encode_fields, field_names, project_issue
+from src.http_hooks import single_attempt
+from src.journal import submit as submit_write
 from src.main import initialize_jira
+from src.retry import backoff, is_transient
+from src.sessions import client_scope
+from src.stale import read_through
+from src.stores.creates import get_creates
+from src.workflow import discover, match_transition, quote_jql, target_status, workflow_graph
 
 def search_issues(
     jql: str,
@@ -15,62 +35,200 @@ def search_issues(
     Args:
         jql: JIRA Query Language string (e.g. "project=DEMO AND status=Open")
         max_results: Maximum number of results to return (default: 10)
-        fields: Comma-separated list of fields to include in the results
+        fields: Comma-separated list of fields to include in the results, by id
+            (e.g. "customfield_10016"), name (e.g. "Story Points") or JQL clause name
     
     Returns:
-        Dictionary containing total issues count and list of matching issues
+        Dictionary containing total issues count and list of matching issues,
+        each with its key and the requested fields
     """
     # Initialize JIRA client
     jira = initialize_jira()
     
-    # Parse fields
-    field_list = [f.strip() for f in fields.split(",")]
+    # Resolve the requested fields to ids and value extractors (cached per field set)
+    projection = compile_projection(jira, (fields or "").split(","))
     
-    # Execute the search
+    # Reuse the cached field list instead of letting the client fetch it again
+    prime_field_cache(jira)
+    
+    # Execute the search, keeping the raw JSON instead of building resource objects
     search_results = jira.search_issues(
         jql_str=jql,
         maxResults=max_results,
-        fields=field_list
+        fields=[field_id for _, field_id, _ in projection] or ["key"],
+        json_result=True
     )
     
-    # Format response
-    formatted_issues = []
-    for issue in search_results:
-        issue_data = {
-            "key": issue.key,
-            "summary": getattr(issue.fields, "summary", "No summary provided")
-        }
-        
-        # Add status if available
-        if hasattr(issue.fields, "status") and issue.fields.status:
-            issue_data["status"] = issue.fields.status.name
-        
-        # Add assignee if available
-        if hasattr(issue.fields, "assignee") and issue.fields.assignee:
-            issue_data["assignee"] = issue.fields.assignee.displayName
-        
-        # Add priority if available
-        if hasattr(issue.fields, "priority") and issue.fields.priority:
-            issue_data["priority"] = issue.fields.priority.name
-        
-        # Add issue type if available
-        if hasattr(issue.fields, "issuetype") and issue.fields.issuetype:
-            issue_data["issuetype"] = issue.fields.issuetype.name
-        
-        formatted_issues.append(issue_data)
+    # Format response with only the requested fields
+    formatted_issues = [project_issue(raw, projection) for raw in search_results.get("issues", [])]
     
     return {
-        "total": len(search_results),
+        "total": len(formatted_issues),
         "issues": formatted_issues
     }
 
+# Most queries one multi_search call may run
+MAX_SEARCH_QUERIES = 10
+
+def multi_search(
+    queries: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Run several named JQL searches concurrently in one call.
+
+    Each issue is returned once, with the union of the fields requested by the
+    queries it matched; every query lists the keys of its matches in order.
+
+    Args:
+        queries: Searches to run, each a dictionary with a "name", a "jql" and optionally
+            "fields" (comma-separated, default: "summary,status,assignee,priority,issuetype")
+            and "max_results" (default: 10), e.g.
+            [{"name": "my_bugs", "jql": "assignee = currentUser() AND type = Bug"}]
+
+    Returns:
+        Dictionary containing the results of each query by name and the matched issues by key
+    """
+    if not queries:
+        raise ValueError("At least one query is required")
+    if len(queries) > MAX_SEARCH_QUERIES:
+        raise ValueError(f"{len(queries)} queries given; at most {MAX_SEARCH_QUERIES} can be run in one call")
+    names = [query.get('name') for query in queries]
+    if any(not name for name in names) or len(set(names)) != len(names):
+        raise ValueError("Every query needs a unique name")
+    if any(not query.get('jql') for query in queries):
+        raise ValueError("Every query needs a JQL string")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+
+    # Reuse the cached field list instead of letting the client fetch it again
+    prime_field_cache(jira)
+
+    def run(query: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]]]:
+        projection = compile_projection(
+            jira, (query.get('fields') or "summary,status,assignee,priority,issuetype").split(",")
+        )
+        result = jira.search_issues(
+            jql_str=query['jql'],
+            maxResults=query.get('max_results', 10),
+            fields=[field_id for _, field_id, _ in projection] or ["key"],
+            json_result=True
+        )
+        return result.get('total', 0), [project_issue(raw, projection) for raw in result.get('issues', [])]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    issues: Dict[str, Dict[str, Any]] = {}
+    for query, outcome, error in run_concurrently(run, queries):
+        if error is not None:
+            results[query['name']] = {'error': getattr(error, 'text', None) or str(error)}
+            continue
+        total, matches = outcome
+        results[query['name']] = {'total': total, 'keys': [issue['key'] for issue in matches]}
+        for issue in matches:
+            issues.setdefault(issue['key'], {}).update(issue)
+
+    failed = [name for name, result in results.items() if 'error' in result]
+    return {
+        'status': 'success' if not failed else 'partial',
+        'message': f"Ran {len(queries) - len(failed)} of {len(queries)} queries matching {len(issues)} distinct issues",
+        'details': {
+            'queries': results,
+            'issues': issues
+        }
+    }
+
+# Retries of a create that failed with a connection error, timeout, 429 or 5xx response
+CREATE_RETRIES = int(os.getenv("JIRA_MCP_CREATE_RETRIES", "3"))
+
+# Issue entity property marking an issue created under an idempotency key
+IDEMPOTENCY_PROPERTY = "mcp-idempotency"
+
+def _idempotency_marker(idempotency_key: str) -> str:
+    """Value of the idempotency property stamped on an issue so a retry can find it."""
+    return hashlib.sha1(idempotency_key.encode("utf-8")).hexdigest()
+
+def _post_issue(jira, fields: Dict[str, Any], marker: Optional[str]) -> str:
+    """
+    Create an issue and return its key.
+
+    With a marker, the issue is created carrying the idempotency property in the
+    same request, so it can never exist without it.
+    """
+    if marker is None:
+        return jira.create_issue(fields=fields).key
+    body = {'fields': fields, 'properties': [{'key': IDEMPOTENCY_PROPERTY, 'value': {'key': marker}}]}
+    return jira._session.post(jira._get_url('issue'), data=json.dumps(body)).json()['key']
+
+def _refused(error: BaseException) -> bool:
+    """Whether a failed create certainly did not reach JIRA or was turned away before creating anything."""
+    if isinstance(error, JIRAError):
+        return error.status_code in (429, 503)
+    return isinstance(error, ConnectTimeout)
+
+# Seconds an unfinished create holds its idempotency key before another call may take it over
+CREATE_LEASE_SECONDS = 120.0
+
+# Seconds between checks while another call creates the issue of the same idempotency key
+CREATE_WAIT_INTERVAL = 0.5
+
+def _claim_create(
+    creates, server: str, scope: str, idempotency_key: str, project_key: str, summary: str
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Claim an idempotency key for this call, waiting while another call creates its issue.
+
+    Returns:
+        The state and record of CreateStore.begin, other than "running"
+
+    Raises:
+        ValueError: If the key was used for an issue in another project or with another summary
+    """
+    while True:
+        state, record = creates.begin(server, scope, idempotency_key, project_key, summary, CREATE_LEASE_SECONDS)
+        if record['project'].upper() != project_key.upper() or record['summary'] != summary:
+            raise ValueError(
+                f"Idempotency key '{idempotency_key}' was already used for another issue "
+                f"(project {record['project']}, summary '{record['summary']}')"
+            )
+        if state != 'running':
+            return state, record
+        # Another call with this key is creating the issue; wait for it rather than create a second one
+        budget = current_budget()
+        if budget is not None:
+            budget.check()
+        time.sleep(CREATE_WAIT_INTERVAL)
+
+def _find_created(jira, project_key: str, marker: str, since: float) -> Optional[str]:
+    """
+    Look for an issue that an interrupted create may have made after all.
+
+    Issues the user created since the first attempt are checked for the
+    idempotency property carrying `marker`.
+    """
+    minutes = int((time.time() - since) // 60) + 2
+    jql = (f"project = {quote_jql(project_key)} AND reporter = currentUser() "
+           f"AND created >= \"-{minutes}m\" ORDER BY created ASC")
+    result = jira.search_issues(jql_str=jql, maxResults=50, fields=['created'], json_result=True)
+    for raw in result.get('issues', []):
+        try:
+            stamped = jira._get_json(f"issue/{raw['key']}/properties/{IDEMPOTENCY_PROPERTY}")
+        except JIRAError as e:
+            if e.status_code == 404:
+                continue
+            raise
+        if (stamped.get('value') or {}).get('key') == marker:
+            return raw['key']
+    return None
+
 def create_issue(
     project_key: str,
     summary: str,
     description: Optional[str] = None,
     issue_type: Optional[str] = "Task",
     priority: Optional[str] = None,
-    assignee: Optional[str] = None
+    assignee: Optional[str] = None,
+    custom_fields: Optional[Dict[str, Any]] = None,
+    idempotency_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create a new JIRA issue.
@@ -82,6 +240,9 @@ def create_issue(
         issue_type: Type of issue (default: "Task")
         priority: Priority of the issue
         assignee: Username to assign the issue to
+        custom_fields: Other fields to set, keyed by field name or id (e.g. {"Story Points": 3})
+        idempotency_key: Optional caller-chosen key; repeating a call with the same key returns
+            the issue created by the first call instead of creating another one
         
     Returns:
         Dictionary containing the created issue key and URL
@@ -89,35 +250,114 @@ def create_issue(
     # Initialize JIRA client
     jira = initialize_jira()
     
-    # Prepare issue fields
-    issue_dict = {
-        'project': {'key': project_key},
-        'summary': summary,
-        'issuetype': {'name': issue_type}
-    }
-    
-    # Add optional fields if provided
-    if description:
-        issue_dict['description'] = description
+    def response(issue_key: str, deduplicated: bool = False) -> Dict[str, Any]:
+        result = {
+            'key': issue_key,
+            'summary': summary,
+            'project': project_key,
+            'url': f"{jira._options['server']}/browse/{issue_key}"
+        }
+        if idempotency_key:
+            result['idempotency_key'] = idempotency_key
+        if deduplicated:
+            result['deduplicated'] = True
+        return result
     
-    if priority:
-        issue_dict['priority'] = {'name': priority}
+    # A call repeating an idempotency key returns the issue the first call created; one made
+    # while the first call is still running waits for it
+    creates = get_creates() if idempotency_key else None
+    server, scope = jira._options['server'], client_scope()
+    state, record = None, None
+    if creates:
+        state, record = _claim_create(creates, server, scope, idempotency_key, project_key, summary)
+        if state == 'finished':
+            return response(record['issue_key'], deduplicated=True)
     
-    if assignee:
-        issue_dict['assignee'] = {'name': assignee}
+    # A failed call gives up its claim on the key, which is only forgotten when no
+    # request that may have created the issue was sent
+    posted = state == 'abandoned'
+    try:
+        # Resolve custom field names to ids and encode their values by field type
+        extra_fields = encode_fields(jira, custom_fields) if custom_fields else {}
+        
+        # Validate and normalize the input against the project's cached create metadata
+        provided = [name for name, value in (
+            ('description', description), ('priority', priority), ('assignee', assignee)
+        ) if value] + list(extra_fields)
+        issue_type, priority = validate_create(jira, project_key, issue_type, priority, provided)
+        
+        # Prepare issue fields
+        issue_dict = {
+            'project': {'key': project_key},
+            'summary': summary,
+            'issuetype': {'name': issue_type}
+        }
+        
+        # Add optional fields if provided
+        if description:
+            issue_dict['description'] = description
+        
+        if priority:
+            issue_dict['priority'] = {'name': priority}
+        
+        if assignee:
+            issue_dict['assignee'] = {'name': assignee}
+        
+        issue_dict.update(extra_fields)
+        
+        # Only an idempotency key stamps the issue, with an entity property rather than a visible label
+        marker = _idempotency_marker(idempotency_key) if idempotency_key else None
+        
+        started = time.time()
+        if state == 'abandoned':
+            # An earlier call with this key did not finish; it may still have created the issue
+            existing = _find_created(jira, project_key, marker, record['started'])
+            if existing:
+                creates.finish(server, scope, idempotency_key, existing)
+                return response(existing, deduplicated=True)
+            started = record['started']
+        
+        # Create the issue, retrying transient failures. The client's own retries are turned off
+        # for the POST, since it would resend it without checking whether the first one succeeded.
+        issue_key = None
+        deduplicated = False
+        with single_attempt():
+            for attempt in range(CREATE_RETRIES + 1):
+                try:
+                    posted = True
+                    issue_key = _post_issue(jira, issue_dict, marker)
+                    break
+                except Exception as e:
+                    # JIRA rejected input the catalog accepted, so the cached metadata may be stale
+                    if isinstance(e, JIRAError) and e.status_code == 400:
+                        invalidate_project(jira, project_key)
+                    if not is_transient(e):
+                        raise
+                    if not _refused(e):
+                        # The request may have created the issue. Only the idempotency
+                        # property tells; without it, retrying could create a duplicate.
+                        if marker is None:
+                            raise
+                        try:
+                            issue_key = _find_created(jira, project_key, marker, started)
+                        except Exception:
+                            issue_key = None
+                        if issue_key:
+                            deduplicated = True
+                            break
+                    if attempt == CREATE_RETRIES:
+                        raise
+                    time.sleep(backoff(attempt + 1))
+    except BaseException:
+        if creates:
+            creates.release(server, scope, idempotency_key, forget=not posted)
+        raise
     
-    # Create the issue
-    new_issue = jira.create_issue(fields=issue_dict)
+    if creates:
+        creates.finish(server, scope, idempotency_key, issue_key)
     
     # Prepare response
-    response = {
-        'key': new_issue.key,
-        'summary': summary,
-        'project': project_key,
-        'url': f"{jira._options['server']}/browse/{new_issue.key}"
-    }
-    
-    return response
+    return response(issue_key, deduplicated)
 
 def update_issue(
     issue_key: str,
@@ -126,7 +366,8 @@ def update_issue(
     status: Optional[str] = None,
     priority: Optional[str] = None,
     assignee: Optional[str] = None,
-    comment: Optional[str] = None
+    comment: Optional[str] = None,
+    custom_fields: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Update an existing JIRA issue.
@@ -139,6 +380,7 @@ def update_issue(
         priority: New priority for the issue
         assignee: New assignee for the issue
         comment: Comment to add to the issue
+        custom_fields: Other fields to set, keyed by field name or id (e.g. {"Sprint": 12})
         
     Returns:
         Dictionary containing the updated issue information
@@ -146,13 +388,35 @@ def update_issue(
     # Initialize JIRA client
     jira = initialize_jira()
     
-    # Get the issue
-    issue = jira.issue(issue_key)
+    # Get the issue together with its edit metadata
+    issue = jira.issue(issue_key, expand='editmeta')
     
     # Check if issue exists
     if not issue:
         raise ValueError(f"Issue {issue_key} not found")
     
+    # Validate the priority before changing anything
+    if priority:
+        known, allowed = editable_values(issue, 'priority')
+        if known and allowed is None:
+            raise ValueError(f"Priority cannot be edited on issue {issue_key}")
+        if known and allowed:
+            matched = match_name(priority, allowed)
+            if matched is None:
+                raise ValueError(
+                    f"Priority '{priority}' is not valid for issue {issue_key}. "
+                    f"Allowed priorities: {', '.join(allowed)}"
+                )
+            priority = matched
+    
+    # Resolve custom field names to ids and check they can be edited on this issue
+    extra_fields = encode_fields(jira, custom_fields) if custom_fields else {}
+    if extra_fields:
+        for field_id, name in zip(list(extra_fields), field_names(jira, list(extra_fields))):
+            known, allowed = editable_values(issue, field_id)
+            if known and allowed is None:
+                raise ValueError(f"Field '{name}' cannot be edited on issue {issue_key}")
+    
     # Dictionary to track changes
     changes = []
     
@@ -173,6 +437,10 @@ def update_issue(
         issue.update(fields={'assignee': {'name': assignee}})
         changes.append(f"Assigned to: {assignee}")
     
+    if extra_fields:
+        issue.update(fields=extra_fields)
+        changes.append(f"Fields updated: {', '.join(field_names(jira, list(extra_fields)))}")
+    
     # Add comment if provided
     if comment:
         jira.add_comment(issue, comment)
@@ -260,7 +528,8 @@ def delete_issue(
 
 def add_comment(
     issue_key: str,
-    comment: str
+    comment: str,
+    deferred: bool = False
 ) -> Dict[str, Any]:
     """
     Add a comment to a JIRA issue.
@@ -268,10 +537,25 @@ def add_comment(
     Args:
         issue_key: The JIRA issue key (e.g., "PROJ-123")
         comment: The comment text to add to the issue
+        deferred: Whether to return at once with a receipt and let a background worker post
+            the comment (check its progress with write_status) (default: False)
         
     Returns:
-        Dictionary containing the comment information and status
+        Dictionary containing the comment information and status, or the receipt of a deferred comment
     """
+    # Journal the comment and let the background worker post it
+    if deferred:
+        receipt = submit_write('comment', issue_key, {'body': comment})
+        return {
+            'status': 'queued',
+            'message': f'Comment to issue {issue_key} queued',
+            'details': {
+                'issue_key': issue_key,
+                'receipt': receipt,
+                'comment_text': comment
+            }
+        }
+    
     # Initialize JIRA client
     jira = initialize_jira()
     
@@ -299,21 +583,27 @@ def add_comment(
         }
     }
 
+# Most transitions one multi-hop transition_issue call may perform
+MAX_TRANSITION_HOPS = 10
+
 def transition_issue(
     issue_key: str,
     status: str,
-    comment: Optional[str] = None
+    comment: Optional[str] = None,
+    multi_hop: bool = False
 ) -> Dict[str, Any]:
     """
     Transition a JIRA issue to a new status.
     
     Args:
         issue_key: The JIRA issue key (e.g., "PROJ-123")
-        status: The target status to transition the issue to
-        comment: Optional comment to add with the transition
+        status: The target status (or transition name) to transition the issue to
+        comment: Optional comment to add with the (final) transition
+        multi_hop: Whether to reach a status that is not directly available by following
+            the shortest path of transitions through the workflow (default: False)
         
     Returns:
-        Dictionary containing the transition information and status
+        Dictionary containing the transition information, status and the path of transitions taken
     """
     # Initialize JIRA client
     jira = initialize_jira()
@@ -328,69 +618,99 @@ def transition_issue(
     # Get current status
     current_status = getattr(issue.fields.status, 'name', 'Unknown')
     
-    # Get available transitions
-    transitions = jira.transitions(issue)
-    transition_id = None
-    available_statuses = [t['name'] for t in transitions]
+    # Transitions seen before for this project and issue type (None if unknown)
+    graph = workflow_graph(jira, issue)
     
-    # Find the transition ID for the requested status
-    for t in transitions:
-        if t['name'].lower() == status.lower():
-            transition_id = t['id']
+    path = []
+    at_status = current_status
+    fetched = None
+    while len(path) < MAX_TRANSITION_HOPS:
+        # Use the cached transitions of this status, or ask JIRA for them
+        if fetched is None and graph is not None and graph.is_explored(at_status):
+            transitions = graph.transitions_from(at_status)
+        else:
+            if fetched is None:
+                fetched = jira.transitions(issue)
+                if graph is not None:
+                    graph.learn(at_status, fetched)
+            transitions = fetched
+        
+        # Find the transition ID for the requested status, or plan a path to it
+        step = match_transition(transitions, status)
+        final = step is not None
+        if step is None:
+            if at_status.lower() == status.lower():
+                break
+            plan = graph.shortest_path(at_status, status) if multi_hop and graph is not None else None
+            if not plan and fetched is None:
+                # The cached transitions may be out of date; check with JIRA first
+                fetched = jira.transitions(issue)
+                if graph is not None:
+                    graph.learn(at_status, fetched)
+                continue
+            if not multi_hop:
+                available_statuses = [t['name'] for t in transitions]
+                raise ValueError(
+                    f"Status '{status}' not found. Available transitions from '{at_status}': "
+                    f"{', '.join(available_statuses)}. Set multi_hop=True to reach it through other statuses."
+                )
+            if not plan and graph is not None and discover(jira, graph):
+                plan = graph.shortest_path(at_status, status)
+            if not plan:
+                known = ', '.join(graph.statuses()) if graph is not None else at_status
+                raise ValueError(
+                    f"No path from '{at_status}' to '{status}' found in the workflow of {issue_key}. "
+                    f"Known statuses: {known}"
+                )
+            step = plan[0]
+            final = len(plan) == 1
+        
+        # Perform the transition, adding the comment to the last one
+        try:
+            jira.transition_issue(issue, step['id'], comment=comment if final else None)
+        except JIRAError as e:
+            if fetched is None and e.status_code == 400:
+                # A cached transition is no longer valid; reload this status's transitions
+                fetched = jira.transitions(issue)
+                if graph is not None:
+                    graph.learn(at_status, fetched)
+                continue
+            raise
+        path.append({'transition': step['name'], 'from': at_status, 'to': target_status(step)})
+        
+        if final:
             break
+        at_status = target_status(step)
+        fetched = None
+    else:
+        raise ValueError(f"Giving up after {MAX_TRANSITION_HOPS} transitions without reaching '{status}'")
     
-    # If transition is not found, raise error with available statuses
-    if not transition_id:
-        raise ValueError(
-            f"Status '{status}' not found. Available transitions from '{current_status}': "
-            f"{', '.join(available_statuses)}"
-        )
-    
-    # Prepare transition data
-    transition_data = {
-        'transition': {'id': transition_id}
-    }
-    
-    # Add comment if provided
-    if comment:
-        transition_data['update'] = {
-            'comment': [{'add': {'body': comment}}]
-        }
-    
-    # Perform the transition
-    jira.transition_issue(issue, transition_id, transition_data)
-    
-    # Refresh issue to get updated status
-    updated_issue = jira.issue(issue_key)
-    new_status = getattr(updated_issue.fields.status, 'name', 'Unknown')
+    # The target status is known from the transitions; otherwise ask JIRA
+    if not path:
+        new_status = at_status
+    elif path[-1]['to']:
+        new_status = path[-1]['to']
+    else:
+        updated_issue = jira.issue(issue_key)
+        new_status = getattr(updated_issue.fields.status, 'name', 'Unknown')
     
     # Prepare response
     return {
         'status': 'success',
-        'message': f'Issue {issue_key} transitioned from {current_status} to {new_status}',
+        'message': f'Issue {issue_key} transitioned from {current_status} to {new_status}'
+                   + (f' via {len(path)} transitions' if len(path) > 1 else ''),
         'details': {
             'issue_key': issue_key,
             'previous_status': current_status,
             'new_status': new_status,
-            'comment_added': bool(comment),
+            'path': path,
+            'comment_added': bool(comment) and bool(path),
             'url': f"{jira._options['server']}/browse/{issue_key}"
         }
     }
 
-def get_issue_details(
-    issue_key: str,
-    include_comments: bool = False
-) -> Dict[str, Any]:
-    """
-    Get detailed information about a JIRA issue.
-    
-    Args:
-        issue_key: The JIRA issue key (e.g., "PROJ-123")
-        include_comments: Whether to include issue comments in the response (default: False)
-        
-    Returns:
-        Dictionary containing detailed issue information
-    """
+def _load_issue_details(issue_key: str, include_comments: bool) -> Dict[str, Any]:
+    """Fetch an issue and its available transitions in the shape returned by get_issue_details."""
     # Initialize JIRA client
     jira = initialize_jira()
     
@@ -439,11 +759,183 @@ def get_issue_details(
     transitions = jira.transitions(issue)
     details['available_transitions'] = [t['name'] for t in transitions]
     
-    return {
+    return details
+
+def get_issue_details(
+    issue_key: str,
+    include_comments: bool = False
+) -> Dict[str, Any]:
+    """
+    Get detailed information about a JIRA issue.
+    
+    While JIRA is failing or slow, the last details retrieved for the issue are
+    returned instead, marked with 'stale': True, and refreshed in the background.
+    
+    Args:
+        issue_key: The JIRA issue key (e.g., "PROJ-123")
+        include_comments: Whether to include issue comments in the response (default: False)
+        
+    Returns:
+        Dictionary containing detailed issue information
+    """
+    details, stale = read_through(
+        'issue', ('details', issue_key, include_comments), lambda: _load_issue_details(issue_key, include_comments)
+    )
+    
+    response = {
         'status': 'success',
         'message': f'Retrieved details for issue {issue_key}',
         'details': details
     }
+    if stale:
+        response['stale'] = True
+        response['message'] += ' from cache; JIRA is currently failing or slow'
+    return response
+
+# Comments requested per page when following a thread from a cursor; the page grows up to
+# COMMENT_PAGE_SIZE while only new comments keep coming
+FIRST_COMMENT_PAGE = 10
+COMMENT_PAGE_SIZE = 100
+
+def _comment_time(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+def _parse_since(since: str) -> Union[int, datetime]:
+    """A comment id, or an ISO 8601 timestamp (UTC unless it has an offset)."""
+    since = since.strip()
+    if since.isdigit():
+        return int(since)
+    try:
+        moment = datetime.fromisoformat(since.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"since must be a comment id or an ISO 8601 timestamp, not '{since}'") from None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+def _comment_entry(comment: Dict[str, Any], max_body_length: Optional[int]) -> Dict[str, Any]:
+    body = comment.get('body') or ''
+    entry = {
+        'id': comment['id'],
+        'author': (comment.get('author') or {}).get('displayName', 'Unknown'),
+        'created': comment.get('created'),
+        'updated': comment.get('updated'),
+        'body': body
+    }
+    if max_body_length is not None and len(body) > max_body_length:
+        entry.update(body=body[:max_body_length] + '…', truncated=True, body_length=len(body))
+    return entry
+
+def _comments_since(
+    jira, issue_key: str, since: Union[int, datetime], include_edited: bool
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Comments of an issue created (or, with include_edited, updated) after a cursor, newest first.
+
+    Returns:
+        (comments, total comments of the issue)
+    """
+    since_id = since if isinstance(since, int) else None
+    since_time = since if isinstance(since, datetime) else None
+    found: List[Dict[str, Any]] = []
+    start, size, total = 0, FIRST_COMMENT_PAGE, 0
+    while True:
+        page = jira._get_json(
+            f'issue/{issue_key}/comment', params={'startAt': start, 'maxResults': size, 'orderBy': '-created'}
+        )
+        batch = page.get('comments', [])
+        total = page.get('total', 0)
+        for comment in batch:
+            if since_id is not None and int(comment['id']) == since_id:
+                # Older comments count as edited when updated after the cursor comment was written
+                since_time = _comment_time(comment['created'])
+            if since_id is not None and int(comment['id']) > since_id:
+                found.append(comment)
+            elif since_id is None and _comment_time(comment['created']) > since_time:
+                found.append(comment)
+            elif not include_edited:
+                # Everything further on is older than the cursor
+                return found, total
+            elif since_time is not None and _comment_time(comment['updated']) > since_time:
+                found.append(comment)
+        start += len(batch)
+        if not batch or start >= total:
+            return found, total
+        size = min(size * 2, COMMENT_PAGE_SIZE)
+
+def get_comments(
+    issue_key: str,
+    max_results: int = 50,
+    start_at: int = 0,
+    order: str = "asc",
+    since: Optional[str] = None,
+    include_edited: bool = False,
+    max_body_length: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get the comments of a JIRA issue a page at a time.
+
+    With `since`, only comments created after that comment id or timestamp are
+    fetched, so following a long thread costs only its new comments. If there
+    are more than max_results new comments, the oldest of them are returned;
+    pass the returned cursor as `since` to continue.
+
+    Args:
+        issue_key: The JIRA issue key (e.g., "PROJ-123")
+        max_results: Maximum number of comments to return (default: 50)
+        start_at: Index of the first comment to return, without `since` (default: 0)
+        order: "asc" for oldest first or "desc" for newest first (default: "asc")
+        since: Only return comments created after this comment id or ISO 8601 timestamp
+        include_edited: With `since`, also return older comments edited after it; this reads
+            the whole thread (default: False)
+        max_body_length: Truncate comment bodies to this many characters
+
+    Returns:
+        Dictionary containing the comments and the cursor for the next call
+    """
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be 'asc' or 'desc'")
+    if max_results < 1:
+        raise ValueError("max_results must be at least 1")
+    if max_body_length is not None and max_body_length < 0:
+        raise ValueError("max_body_length cannot be negative")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+
+    details: Dict[str, Any] = {'issue_key': issue_key}
+    if since is None:
+        page = jira._get_json(f'issue/{issue_key}/comment', params={
+            'startAt': start_at,
+            'maxResults': max_results,
+            'orderBy': '+created' if order == 'asc' else '-created'
+        })
+        comments = page.get('comments', [])
+        total = page.get('total', 0)
+        following = start_at + len(comments)
+        details['next_start_at'] = following if following < total else None
+        cursor = max((int(c['id']) for c in comments), default=None)
+    else:
+        since_value = _parse_since(since)
+        found, total = _comments_since(jira, issue_key, since_value, include_edited)
+        # Keep the new comments closest to the cursor, so the next call continues after them
+        found.reverse()
+        comments = found[:max_results]
+        details['more'] = len(found) > max_results
+        if order == 'desc':
+            comments.reverse()
+        cursor = max((int(c['id']) for c in comments), default=None)
+        if isinstance(since_value, int):
+            cursor = max(cursor or 0, since_value)
+
+    details.update({
+        'total': total,
+        'comments': [_comment_entry(comment, max_body_length) for comment in comments],
+        'cursor': str(cursor) if cursor is not None else since
+    })
+    return {
+        'status': 'success',
+        'message': f'Retrieved {len(comments)} of {total} comments for issue {issue_key}',
+        'details': details
+    }
 
 def search_users(
     query: str,
@@ -469,9 +961,6 @@ def search_users(
     Raises:
         ValueError: If the search query is empty or if neither active nor inactive users are included
     """
-    # Initialize JIRA client
-    jira = initialize_jira()
-    
     # Validate input
     if not query:
         raise ValueError("Search query cannot be empty")
@@ -479,7 +968,10 @@ def search_users(
     if not include_active_users and not include_inactive_users:
         raise ValueError("At least one of include_active_users or include_inactive_users must be True")
     
-    try:
+    def load_users() -> List[Dict[str, Any]]:
+        # Initialize JIRA client
+        jira = initialize_jira()
+        
         # Use the GDPR-compliant search endpoint
         users = jira._get_json('user/search', params={
             'query': query,
@@ -501,8 +993,15 @@ def search_users(
                 'avatar_url': user.get('avatarUrls', {}).get('48x48') if 'avatarUrls' in user else None
             }
             formatted_users.append(user_data)
+        return formatted_users
+    
+    try:
+        # While JIRA is failing or slow, the last result of the same search is returned
+        formatted_users, stale = read_through(
+            'metadata', ('users', query, max_results, include_active_users, include_inactive_users), load_users
+        )
         
-        return {
+        response = {
             'status': 'success',
             'message': f'Found {len(formatted_users)} users matching "{query}"',
             'details': {
@@ -516,6 +1015,9 @@ def search_users(
                 }
             }
         }
+        if stale:
+            response['stale'] = True
+        return response
         
     except Exception as e:
         # Handle API errors gracefully
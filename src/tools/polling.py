@@ -0,0 +1,164 @@
+"""Tools for following changes to the issues matching a JQL query."""
+import math
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from src.catalog import prime_field_cache
+from src.main import initialize_jira
+from src.sessions import client_scope
+from src.stores.watermarks import get_watermarks
+
+# Minutes polled before the watermark, for JQL's minute precision and slow requests
+POLL_OVERLAP_MINUTES = int(os.getenv("JIRA_MCP_POLL_OVERLAP_MINUTES", "5"))
+
+# Issues a watched query may match; the first poll fetches all of them
+POLL_MAX_ISSUES = int(os.getenv("JIRA_MCP_POLL_MAX_ISSUES", "5000"))
+
+POLL_PAGE_SIZE = 100
+
+_ORDER_BY = re.compile(r"\border\s+by\b", re.IGNORECASE)
+
+
+def without_order_by(jql: str) -> str:
+    """The query without its ORDER BY clause, which is irrelevant to which issues match."""
+    return _ORDER_BY.split(jql)[0].strip()
+
+
+def updated_issues(jira, jql: str) -> Dict[str, str]:
+    """Keys and updated timestamps of every issue matching `jql`, fetching only the updated field."""
+    issues: Dict[str, str] = {}
+    while True:
+        page = jira.search_issues(
+            jql_str=jql,
+            startAt=len(issues),
+            maxResults=POLL_PAGE_SIZE,
+            fields=['updated'],
+            json_result=True
+        )
+        batch = page.get('issues', [])
+        for issue in batch:
+            issues[issue['key']] = issue['fields']['updated']
+        if len(issues) > POLL_MAX_ISSUES:
+            raise ValueError(
+                f"The query matches more than {POLL_MAX_ISSUES} issues; narrow it down to watch it"
+            )
+        if not batch or len(issues) >= page.get('total', 0):
+            return issues
+
+
+def _still_matching(jira, jql: str, keys: List[str]) -> set:
+    """The subset of `keys` that still match `jql`."""
+    matching = set()
+    for start in range(0, len(keys), POLL_PAGE_SIZE):
+        chunk = keys[start:start + POLL_PAGE_SIZE]
+        page = jira.search_issues(
+            jql_str=f"({jql}) AND key in ({', '.join(chunk)})",
+            maxResults=len(chunk),
+            fields=['updated'],
+            json_result=True,
+            validate_query=False
+        )
+        matching.update(issue['key'] for issue in page.get('issues', []))
+    return matching
+
+
+def changes_since(jira, jql: str, known: Dict[str, str], watermark: float) -> Tuple[List[str], List[str], List[str]]:
+    """Added, changed and removed keys since the poll that started at `watermark`; updates `known` in place."""
+    # The window is relative to JIRA's clock, so only the time elapsed here matters, not clock skew.
+    # It reaches back further for JQL's minute precision; issues already seen with the same
+    # updated timestamp are skipped below.
+    minutes = math.ceil(max(time.time() - watermark, 0) / 60) + POLL_OVERLAP_MINUTES
+    recent = updated_issues(jira, f'({jql}) AND updated >= "-{minutes}m"')
+
+    added = sorted(key for key in recent if key not in known)
+    changed = sorted(key for key in recent if key in known and recent[key] != known[key])
+    known.update(recent)
+
+    # Issues leaving the result (or deleted) do not show up above; the total tells whether any did
+    total = jira.search_issues(jql_str=jql, maxResults=1, fields=['updated'], json_result=True).get('total', 0)
+    removed: List[str] = []
+    if total < len(known):
+        matching = _still_matching(jira, jql, sorted(set(known) - set(recent)))
+        removed = sorted(key for key in known if key not in recent and key not in matching)
+    elif total > len(known):
+        # Issues entered the result without being updated, e.g. through a relative date in the query
+        current = updated_issues(jira, jql)
+        added = sorted(set(added) | (set(current) - set(known)))
+        removed = sorted(set(known) - set(current))
+        known.update(current)
+    for key in removed:
+        del known[key]
+    return added, changed, removed
+
+
+def poll_changes(
+    name: str,
+    jql: str,
+    reset: bool = False
+) -> Dict[str, Any]:
+    """
+    Report which issues matching a JQL query were added, changed or removed since the last poll.
+
+    The state of each named watermark is kept in a local store, per client, so only issues
+    updated since the previous poll are fetched. The first poll of a name (or of a
+    changed query) reports every matching issue as added.
+
+    Args:
+        name: Name of the watermark, e.g. "team-board"; one per watched query
+        jql: JIRA Query Language string (e.g. "project = DEMO AND status != Done")
+        reset: Whether to forget the watermark and start over (default: False)
+
+    Returns:
+        Dictionary containing the added, changed and removed issue keys
+    """
+    if not name:
+        raise ValueError("A watermark name is required")
+
+    # Ordering is irrelevant to the result and JQL cannot combine it with further clauses
+    jql = without_order_by(jql)
+    if not jql:
+        raise ValueError("JQL query cannot be empty")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+    server = jira._options['server']
+
+    # Reuse the cached field list instead of letting the client fetch it again
+    prime_field_cache(jira)
+
+    watermarks = get_watermarks()
+    scope = client_scope()
+    saved = None if reset else watermarks.load(server, scope, name)
+    baseline = saved is None or saved['jql'] != jql
+
+    started = time.time()
+    if baseline:
+        known = updated_issues(jira, jql)
+        added, changed, removed = sorted(known), [], []
+    else:
+        known = saved['issues']
+        added, changed, removed = changes_since(jira, jql, known, saved['watermark'])
+    watermarks.save(server, scope, name, jql, started, known)
+
+    details: Dict[str, Any] = {
+        'name': name,
+        'baseline': baseline,
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+        'matching': len(known)
+    }
+    if not baseline:
+        details['since'] = datetime.fromtimestamp(saved['watermark']).astimezone().isoformat()
+
+    return {
+        'status': 'success',
+        'message': (
+            f"First poll of '{name}': {len(added)} matching issues" if baseline
+            else f"{len(added)} added, {len(changed)} changed, {len(removed)} removed since the last poll"
+        ),
+        'details': details
+    }
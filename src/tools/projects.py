@@ -1,37 +1,96 @@
 """Tools for interacting with JIRA projects."""
-from typing import List, Dict, Any, Optional
+import os
+from typing import List, Dict, Any, Optional, Tuple
 from fastmcp.tools import Tool
 
+from src.cache import TTLCache
+from src.catalog import server_key
+from src.concurrency import run_concurrently
 from src.main import initialize_jira
+from src.stale import read_through
+from src.workflow import quote_jql
+
+# Seconds issue counts of a project are reused by list_projects
+PROJECT_STATS_TTL = float(os.getenv("JIRA_MCP_PROJECT_STATS_TTL", "60"))
+
+# Issue counts reported per project and the JQL condition of each
+PROJECT_STATS = {
+    "open": "statusCategory != Done",
+    "in_progress": 'statusCategory = "In Progress"',
+}
+
+_project_stats = TTLCache("project_stats", PROJECT_STATS_TTL)
+
+def _load_projects() -> List[Dict[str, Any]]:
+    """Fetch every project visible to the authenticated user."""
+    # Initialize JIRA client
+    jira = initialize_jira()
+    
+    # Format response
+    formatted_projects = []
+    for project in jira.projects():
+        formatted_projects.append({
+            "key": project.key,
+            "name": project.name,
+            "lead": getattr(project, "lead", {}).get("displayName", "Unknown") if hasattr(project, "lead") else "Unknown"
+        })
+    
+    return formatted_projects
+
+def _count_issues(jira, project_key: str, stat: str) -> int:
+    """Number of a project's issues matching a PROJECT_STATS condition, without fetching any issue."""
+    def load():
+        result = jira._get_json('search', params={
+            'jql': f"project = {quote_jql(project_key)} AND {PROJECT_STATS[stat]}",
+            'maxResults': 0,
+            'fields': 'key'
+        })
+        return result.get('total', 0)
+
+    return _project_stats.get_or_load((server_key(jira), project_key, stat), load)
+
+def _add_stats(projects: List[Dict[str, Any]]) -> None:
+    """Add the issue counts of every project, counting concurrently across projects."""
+    jira = initialize_jira()
+    counts = [(project["key"], stat) for project in projects for stat in PROJECT_STATS]
+    results: Dict[Tuple[str, str], Any] = {}
+    for (project_key, stat), total, error in run_concurrently(lambda item: _count_issues(jira, *item), counts):
+        results[project_key, stat] = error if error is not None else total
+    for project in projects:
+        stats = {stat: results[project["key"], stat] for stat in PROJECT_STATS}
+        errors = [value for value in stats.values() if isinstance(value, Exception)]
+        if errors:
+            project["stats"] = {"error": getattr(errors[0], "text", None) or str(errors[0])}
+        else:
+            project["stats"] = stats
 
 def list_projects(
-    limit: Optional[int] = 10
+    limit: Optional[int] = 10,
+    include_stats: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Lists JIRA projects for the authenticated user.
 
+    While JIRA is failing or slow, the last list retrieved is returned
+    instead, with 'stale': True on every project.
+
     Args:
         limit: Maximum number of projects to return (default: 10)
+        include_stats: Whether to add the number of open and in-progress issues of each
+            project, counted concurrently and cached for JIRA_MCP_PROJECT_STATS_TTL seconds (default: False)
     
     Returns:
         List of projects with their key, name, and lead information
     """
-    # Initialize JIRA client
-    jira = initialize_jira()
-    
-    # Get projects
-    projects = jira.projects()
-    
-    # Limit results
-    projects = projects[:limit]
+    projects, stale = read_through('metadata', ('projects',), _load_projects)
     
-    # Format response
-    formatted_projects = []
-    for project in projects:
-        formatted_projects.append({
-            "key": project.key,
-            "name": project.name,
-            "lead": getattr(project, "lead", {}).get("displayName", "Unknown") if hasattr(project, "lead") else "Unknown"
-        })
+    # Limit results, marking each project when JIRA could not be reached
+    if stale:
+        projects = [dict(project, stale=True) for project in projects[:limit]]
+    else:
+        projects = projects[:limit]
     
-    return formatted_projects
\ No newline at end of file
+    if include_stats:
+        projects = [dict(project) for project in projects]
+        _add_stats(projects)
+    return projects
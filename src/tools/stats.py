@@ -0,0 +1,113 @@
+"""Tools for inspecting the MCP server itself."""
+import json
+import os
+from typing import Dict, Any, Optional
+
+from src.breaker import breaker_states
+from src.journal import get_journal
+from src.metrics import registry
+from src.sessions import session_receipts
+
+def server_stats(
+    reset: bool = False
+) -> Dict[str, Any]:
+    """
+    Report per-tool latency, JIRA HTTP request and cache statistics for this server process.
+
+    Args:
+        reset: Whether to clear all statistics after reading them (default: False)
+
+    Returns:
+        Dictionary containing tool latency histograms, per-endpoint HTTP statistics, cache hit ratios
+        and the state of the circuit breakers
+    """
+    # Rewrite the operator's Prometheus file first, so it matches the returned snapshot
+    # and keeps the statistics a reset is about to clear
+    metrics_file = os.getenv("JIRA_MCP_METRICS_FILE")
+    if metrics_file:
+        registry.write_prometheus(metrics_file)
+
+    snapshot = registry.snapshot()
+    snapshot['circuit_breakers'] = breaker_states()
+
+    if reset:
+        registry.reset()
+
+    return {
+        'status': 'success',
+        'message': (
+            f"{sum(t['count'] for t in snapshot['tools'].values())} tool calls and "
+            f"{snapshot['http']['requests']} JIRA requests recorded"
+        ),
+        'details': snapshot
+    }
+
+def _write_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe a journaled write without its internal row id."""
+    entry = {
+        'receipt': item['receipt'],
+        'kind': item['kind'],
+        'issue_key': item['issue_key'],
+        'state': item['state'],
+        'attempts': item['attempts'],
+        'created': item['created']
+    }
+    if item['last_error']:
+        entry['last_error'] = item['last_error']
+    if item['state'] == 'pending' and item['attempts']:
+        entry['next_attempt'] = item['next_attempt']
+    if item['result']:
+        entry['result'] = json.loads(item['result'])
+    return entry
+
+def write_status(
+    receipt: Optional[str] = None,
+    retry_failed: bool = False,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Report deferred writes (e.g. add_comment with deferred=True) that are pending or failed.
+
+    When the server is shared by several clients, the counts and the list
+    only cover the writes of the calling client.
+
+    Args:
+        receipt: Optional receipt of one deferred write to report on
+        retry_failed: Whether to queue every failed write again (default: False)
+        limit: Maximum number of pending and failed writes to list (default: 20)
+
+    Returns:
+        Dictionary containing the number of writes in each state and the pending and failed writes,
+        or the state of the write with the given receipt
+    """
+    journal = get_journal()
+
+    if receipt:
+        item = journal.item(receipt)
+        if item is None:
+            raise ValueError(f"No deferred write with receipt {receipt}")
+        return {
+            'status': 'success',
+            'message': f"Write {receipt} is {item['state']}",
+            'details': _write_entry(item)
+        }
+
+    # When the server is shared by several clients, each only sees its own writes
+    receipts = session_receipts()
+    requeued = journal.retry_failed(receipts) if retry_failed else 0
+    counts = journal.counts(receipts)
+    return {
+        'status': 'success',
+        'message': (
+            f"{counts['pending'] + counts['in_flight']} writes pending, {counts['failed']} failed"
+            + (f", {requeued} requeued" if requeued else '')
+        ),
+        'details': {
+            'counts': counts,
+            'requeued': requeued,
+            'journal': journal.path,
+            'items': [
+                _write_entry(item) for item in journal.items(['in_flight', 'pending', 'failed'], limit, receipts)
+            ]
+        }
+    }
@@ -0,0 +1,267 @@
+"""Tools for reporting time logged on JIRA issues."""
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.concurrency import run_concurrently
+from src.main import initialize_jira
+from src.stores.worklogs import get_worklogs
+
+# Worklogs fetched per worklog/list request (JIRA's limit)
+WORKLOG_LIST_SIZE = 1000
+
+# Issues described per search request
+WORKLOG_ISSUE_PAGE_SIZE = 100
+
+SECONDS_PER_DAY = 86400
+
+GROUPS = ('user', 'project', 'epic', 'issue')
+
+PERIODS = ('day', 'week', 'month')
+
+
+def _changed_pages(jira, endpoint: str, since: int, stop: Optional[int] = None) -> Iterator[Tuple[List[str], int]]:
+    """
+    Ids of the worklogs updated (or deleted) since `since`, a page of worklog/updated at a time.
+
+    Args:
+        stop: Stop at this watermark instead of the last page, leaving out later updates
+
+    Yields:
+        (worklog ids of the page, watermark to continue from after it)
+    """
+    while True:
+        page = jira._get_json(f'worklog/{endpoint}', params={'since': since})
+        until = max(since, int(page.get('until') or 0))
+        values = page.get('values', [])
+        if stop is not None:
+            values = [value for value in values if int(value.get('updatedTime') or 0) <= stop]
+        yield [str(value['worklogId']) for value in values], until
+        if page.get('lastPage', True) or until <= since or (stop is not None and until >= stop):
+            return
+        since = until
+
+
+def _epoch_seconds(timestamp: str) -> float:
+    return datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp()
+
+
+def _describe_issues(jira, issue_ids: List[str]) -> List[Tuple[str, str, str, Optional[str]]]:
+    """
+    (issue id, key, project key, epic key) of each issue.
+
+    An issue's epic is its parent when that is an epic, or for a sub-task the
+    epic of its parent, which takes one more search.
+    """
+    def search(clause: str, values: List[str]) -> List[Dict[str, Any]]:
+        found = []
+        for start in range(0, len(values), WORKLOG_ISSUE_PAGE_SIZE):
+            chunk = values[start:start + WORKLOG_ISSUE_PAGE_SIZE]
+            found.extend(jira.search_issues(
+                jql_str=f"{clause} in ({', '.join(chunk)})",
+                maxResults=len(chunk),
+                fields=['project', 'parent', 'issuetype'],
+                validate_query=False,
+                json_result=True
+            ).get('issues', []))
+        return found
+
+    def parent_of(raw: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+        parent = raw['fields'].get('parent') or {}
+        issue_type = ((parent.get('fields') or {}).get('issuetype') or {}).get('name', '')
+        return parent.get('key'), issue_type.lower() == 'epic'
+
+    issues = search('id', issue_ids)
+    # Sub-tasks hang below stories; their epic is the story's parent
+    grandparents = sorted({parent for parent, is_epic in map(parent_of, issues) if parent and not is_epic})
+    epics_of_parents = {
+        raw['key']: parent if is_epic else None
+        for raw in (search('key', grandparents) if grandparents else [])
+        for parent, is_epic in [parent_of(raw)]
+    }
+
+    described = []
+    for raw in issues:
+        parent, is_epic = parent_of(raw)
+        epic = parent if is_epic else epics_of_parents.get(parent)
+        described.append((str(raw['id']), raw['key'], raw['fields']['project']['key'], epic))
+    return described
+
+
+def _fetch_worklogs(jira, ids: List[str]) -> List[Tuple[str, str, Optional[str], float, int]]:
+    """(id, issue id, author, started epoch seconds, seconds spent) of the worklogs with the given ids."""
+    def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+        return jira._session.post(jira._get_url('worklog/list'), data=json.dumps({'ids': chunk})).json()
+
+    chunks = [ids[start:start + WORKLOG_LIST_SIZE] for start in range(0, len(ids), WORKLOG_LIST_SIZE)]
+    worklogs = []
+    for _, page, error in run_concurrently(fetch, chunks):
+        if error is not None:
+            raise error
+        for raw in page:
+            worklogs.append((
+                str(raw['id']),
+                str(raw['issueId']),
+                (raw.get('author') or {}).get('displayName'),
+                _epoch_seconds(raw['started']),
+                int(raw.get('timeSpentSeconds') or 0)
+            ))
+    return worklogs
+
+
+def _sync_worklogs(jira, server: str, since: int) -> Dict[str, int]:
+    """
+    Store the worklogs updated or deleted since the server's watermarks.
+
+    The first sync of a server starts at `since`, the start of the report, rather
+    than reading every worklog ever logged; a later report starting earlier first
+    reads the worklogs updated between its start and the old one. Each page of
+    changes is stored together with the watermark it reaches, so a sync that
+    fails part way keeps what it fetched and the next one continues from there.
+
+    Args:
+        since: Epoch milliseconds from which the report needs worklogs
+
+    Returns:
+        Number of worklogs updated and deleted
+    """
+    store = get_worklogs()
+    floor, updated_since, deleted_since = store.watermarks(server) or (since, since, since)
+    synced = {'updated': 0, 'deleted': 0}
+
+    def store_updated(ids: List[str], watermarks: Tuple[int, int, int]) -> None:
+        worklogs = _fetch_worklogs(jira, ids)
+        # Issues of changed worklogs are described again, in case they moved to another project or epic
+        issue_ids = sorted({worklog[1] for worklog in worklogs}, key=int)
+        if issue_ids:
+            store.store_issues(server, _describe_issues(jira, issue_ids))
+        store.store(server, worklogs, [], watermarks)
+        synced['updated'] += len(worklogs)
+
+    if since < floor:
+        for ids, _ in _changed_pages(jira, 'updated', since, stop=floor):
+            store_updated(ids, (floor, updated_since, deleted_since))
+        floor = since
+    for ids, updated_since in _changed_pages(jira, 'updated', updated_since):
+        store_updated(ids, (floor, updated_since, deleted_since))
+    for ids, deleted_since in _changed_pages(jira, 'deleted', deleted_since):
+        store.store(server, [], ids, (floor, updated_since, deleted_since))
+        synced['deleted'] += len(ids)
+
+    # Issues a previous sync could not describe
+    unknown = sorted(store.unknown_issues(server), key=int)
+    if unknown:
+        store.store_issues(server, _describe_issues(jira, unknown))
+    return synced
+
+
+def _parse_day(value: str, name: str) -> date:
+    try:
+        return date.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"{name} must be a date like 2024-03-04, not '{value}'") from None
+
+
+def _period_index(days: np.ndarray, period: str) -> np.ndarray:
+    """Day, Monday-based week or month number of each day number since the epoch."""
+    if period == 'day':
+        return days
+    if period == 'week':
+        # 1970-01-05 was the first Monday after the epoch
+        return (days - 4) // 7
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _period_label(index: int, period: str) -> str:
+    if period == 'day':
+        return str(np.datetime64(index, 'D'))
+    if period == 'week':
+        return str(np.datetime64(index * 7 + 4, 'D'))
+    return str(np.datetime64(index, 'M'))
+
+
+def worklog_report(
+    start_date: str,
+    end_date: Optional[str] = None,
+    group_by: str = "user",
+    period: str = "week",
+    project: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Report the hours logged per user, project, epic or issue and per day, week or month.
+
+    Worklogs are kept in a local store. Each call first fetches only the
+    worklogs updated or deleted since the previous call, so repeated reports cost
+    only the changes. The first call reads the worklogs updated since start_date.
+
+    Args:
+        start_date: First day to report, e.g. "2024-03-04"
+        end_date: Last day to report (default: today)
+        group_by: "user", "project", "epic" or "issue" (default: "user")
+        period: "day", "week" (Monday to Sunday) or "month" (default: "week")
+        project: Only report worklogs on issues of this project key
+
+    Returns:
+        Dictionary containing the hours of every group per period, in UTC days
+    """
+    if group_by not in GROUPS:
+        raise ValueError(f"group_by must be one of: {', '.join(GROUPS)}")
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of: {', '.join(PERIODS)}")
+    first = _parse_day(start_date, 'start_date')
+    last = _parse_day(end_date, 'end_date') if end_date else datetime.now(timezone.utc).date()
+    if last < first:
+        raise ValueError("end_date cannot be before start_date")
+
+    # Initialize JIRA client
+    jira = initialize_jira()
+    server = jira._options['server']
+
+    start = datetime.combine(first, datetime.min.time(), timezone.utc).timestamp()
+    end = datetime.combine(last + timedelta(days=1), datetime.min.time(), timezone.utc).timestamp()
+
+    synced = _sync_worklogs(jira, server, int(start * 1000))
+    rows = get_worklogs().rows(server, start, end, project)
+
+    column = {'user': 0, 'issue': 3, 'project': 4, 'epic': 5}[group_by]
+    fallback = {'user': 'Unknown', 'issue': 'Unknown', 'project': 'Unknown', 'epic': 'No epic'}[group_by]
+    names = np.array([row[column] or fallback for row in rows], dtype=object)
+    started = np.array([row[1] for row in rows], dtype=np.float64)
+    seconds = np.array([row[2] for row in rows], dtype=np.float64)
+
+    # Accumulate seconds in a groups x periods array in one pass
+    first_period = int(_period_index(np.array([start // SECONDS_PER_DAY], dtype=np.int64), period)[0])
+    last_period = int(_period_index(np.array([(end - 1) // SECONDS_PER_DAY], dtype=np.int64), period)[0])
+    periods = last_period - first_period + 1
+    groups, group_index = np.unique(names, return_inverse=True)
+    period_index = _period_index((started // SECONDS_PER_DAY).astype(np.int64), period) - first_period
+    hours = np.bincount(
+        group_index * periods + period_index, weights=seconds, minlength=len(groups) * periods
+    ).reshape(len(groups), periods) / 3600.0
+
+    totals = hours.sum(axis=1)
+    order = np.argsort(-totals, kind='stable')
+    report = [
+        {
+            group_by: str(groups[index]),
+            'total_hours': round(float(totals[index]), 2),
+            'hours': [round(float(value), 2) for value in hours[index]]
+        }
+        for index in order
+    ]
+
+    return {
+        'status': 'success',
+        'message': f"{round(float(totals.sum()), 2)} hours logged in {len(rows)} worklogs from {first} to {last}",
+        'details': {
+            'group_by': group_by,
+            'period': period,
+            'periods': [_period_label(first_period + n, period) for n in range(periods)],
+            'groups': report,
+            'total_hours': round(float(totals.sum()), 2),
+            'worklogs': len(rows),
+            'synced': synced
+        }
+    }
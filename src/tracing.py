@@ -0,0 +1,285 @@
+"""Structured tracing of tool calls and the JIRA HTTP requests they make.
+
+Every tool call is a root span and every HTTP attempt made while it runs is
+a child span carrying the endpoint, status, bytes and duration. Trace and
+span ids are kept in a contextvar and added to every log record as
+`trace_id` / `span_id`, so log lines can be joined with spans.
+
+Spans are written as JSON lines to a rotating local file when
+JIRA_MCP_TRACE_FILE is set:
+
+    JIRA_MCP_TRACE_FILE       Path of the span file (tracing export is off when unset)
+    JIRA_MCP_TRACE_MAX_BYTES  Size at which the file is rotated (default: 10485760)
+    JIRA_MCP_TRACE_BACKUPS    Number of rotated files kept (default: 5)
+
+`python -m src.tracing FILE` prints each trace with the time spent in every
+HTTP step and between steps.
+"""
+import contextvars
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from src.http_hooks import RequestRecord, add_observer
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind", "start",
+        "duration", "status", "attributes",
+    )
+
+    def __init__(self, name: str, kind: str, parent: Optional["Span"] = None,
+                 start: Optional[float] = None):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.start = time.time() if start is None else start
+        self.duration = 0.0
+        self.status = "ok"
+        self.attributes: Dict[str, Any] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "jira_mcp_current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class FileSpanExporter:
+    """Append spans as JSON lines to a size-rotated file. Thread-safe."""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def export(self, span: Span) -> None:
+        record = logging.LogRecord(
+            "jira_mcp.spans", logging.INFO, __file__, 0,
+            json.dumps(span.to_dict(), default=str), None, None,
+        )
+        self._handler.handle(record)
+
+    def close(self) -> None:
+        self._handler.close()
+
+
+_exporter: Optional[FileSpanExporter] = None
+
+
+def set_exporter(exporter: Optional[FileSpanExporter]) -> None:
+    """Install (or with None, remove) the exporter spans are written to."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    if previous is not None and previous is not exporter:
+        previous.close()
+
+
+def configure_from_env() -> Optional[FileSpanExporter]:
+    """Install a FileSpanExporter if JIRA_MCP_TRACE_FILE is set."""
+    path = os.getenv("JIRA_MCP_TRACE_FILE")
+    if not path:
+        return None
+    exporter = FileSpanExporter(
+        path,
+        max_bytes=int(os.getenv("JIRA_MCP_TRACE_MAX_BYTES", str(10 * 1024 * 1024))),
+        backup_count=int(os.getenv("JIRA_MCP_TRACE_BACKUPS", "5")),
+    )
+    set_exporter(exporter)
+    return exporter
+
+
+def _export(span: Span) -> None:
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export(span)
+    except Exception:
+        # Tracing must never break a tool call
+        pass
+
+
+_log_factory_installed = False
+
+
+def install_log_correlation() -> None:
+    """Add `trace_id` and `span_id` attributes ("-" outside a trace) to every log record."""
+    global _log_factory_installed
+    if _log_factory_installed:
+        return
+    previous_factory = logging.getLogRecordFactory()
+
+    def factory(*args, **kwargs):
+        record = previous_factory(*args, **kwargs)
+        span = _current_span.get()
+        record.trace_id = span.trace_id if span else "-"
+        record.span_id = span.span_id if span else "-"
+        return record
+
+    logging.setLogRecordFactory(factory)
+    _log_factory_installed = True
+
+
+def _record_request(record: RequestRecord) -> None:
+    parent = _current_span.get()
+    if parent is None or _exporter is None:
+        return
+    # record.started is a perf_counter value; convert it to wall-clock time
+    start = time.time() - (time.perf_counter() - record.started)
+    span = Span(record.endpoint, "http", parent=parent, start=start)
+    span.duration = record.duration
+    span.attributes = {
+        "http.method": record.method,
+        "http.path": urlparse(record.url).path,
+        "http.status": record.status,
+        "http.attempt": record.attempt,
+        "http.bytes_sent": record.bytes_sent,
+        "http.bytes_received": record.bytes_received,
+    }
+    if record.error is not None or (record.status or 0) >= 400:
+        span.status = "error"
+    if record.error is not None:
+        span.attributes["error"] = repr(record.error)
+    _export(span)
+
+
+add_observer(_record_request)
+
+
+def trace_tool(fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Wrap a tool function so every call runs inside a root span.
+
+    When spans are exported, dictionary results get the trace id under
+    `_meta.trace_id` so a response can be matched with its spans.
+    """
+    tool_name = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        span = Span(tool_name, "tool")
+        span.attributes = {"tool": tool_name, "arguments": sorted(kwargs)}
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            span.status = "error"
+            span.attributes["error"] = repr(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            _export(span)
+        if _exporter is not None and isinstance(result, dict):
+            result.setdefault('_meta', {})['trace_id'] = span.trace_id
+        return result
+
+    return wrapper
+
+
+def load_spans(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """Read spans from one or more span files, skipping malformed lines."""
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    return spans
+
+
+def summarize(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group spans into traces and lay out the HTTP steps of each tool call in order.
+
+    For each step, `gap_ms` is the time since the previous step ended (time
+    spent in Python between requests), which makes the critical path of a
+    sequential tool call visible.
+    """
+    traces: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        trace = traces.setdefault(span["trace_id"], {"root": None, "children": []})
+        if span["parent_id"] is None:
+            trace["root"] = span
+        else:
+            trace["children"].append(span)
+
+    summaries = []
+    for trace_id, trace in traces.items():
+        root = trace["root"]
+        if root is None:
+            continue
+        cursor = root["start"]
+        steps = []
+        for child in sorted(trace["children"], key=lambda s: s["start"]):
+            steps.append({
+                "name": child["name"],
+                "status": child["attributes"].get("http.status"),
+                "duration_ms": child["duration_ms"],
+                "gap_ms": round(max(0.0, child["start"] - cursor) * 1000, 3),
+            })
+            cursor = max(cursor, child["start"] + child["duration_ms"] / 1000)
+        http_ms = sum(step["duration_ms"] for step in steps)
+        summaries.append({
+            "trace_id": trace_id,
+            "tool": root["name"],
+            "start": root["start"],
+            "duration_ms": root["duration_ms"],
+            "status": root["status"],
+            "http_ms": round(http_ms, 3),
+            "steps": steps,
+        })
+    summaries.sort(key=lambda s: s["start"])
+    return summaries
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    paths = (argv if argv is not None else sys.argv[1:])
+    if not paths:
+        print("usage: python -m src.tracing SPAN_FILE [SPAN_FILE ...]", file=sys.stderr)
+        return 2
+    for trace in summarize(load_spans(paths)):
+        print(f"{trace['tool']} {trace['duration_ms']:.1f}ms "
+              f"(http {trace['http_ms']:.1f}ms, {trace['status']}) trace={trace['trace_id']}")
+        for step in trace["steps"]:
+            print(f"    +{step['gap_ms']:7.1f}ms  {step['name']:<40} {step['status']} {step['duration_ms']:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Workflow graphs learned from transition responses.
+
+JIRA only reports the transitions available from an issue's current status,
+and reading a whole workflow definition needs admin rights. Instead, every
+transitions response is recorded as the outgoing edges of that status in a
+graph cached per (server, project, issue type). Transition ids are stable
+within a workflow, so a known path can be executed without asking for the
+transitions again at every hop.
+"""
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.cache import TTLCache
+from src.catalog import CATALOG_TTL, prime_field_cache, server_key
+
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$", re.IGNORECASE)
+
+_graphs = TTLCache("workflow_graph", CATALOG_TTL)
+_graphs_lock = threading.Lock()
+
+
+def target_status(transition: Any) -> Optional[str]:
+    """Name of the status a transition leads to (from a transitions response or a graph edge)."""
+    to = transition.get("to") if isinstance(transition, dict) else None
+    if isinstance(to, dict):
+        to = to.get("name")
+    return to if isinstance(to, str) else None
+
+
+def match_transition(transitions: Iterable[Dict[str, Any]], status: str) -> Optional[Dict[str, Any]]:
+    """Find the transition whose name or target status matches `status` (case-insensitive)."""
+    transitions = list(transitions)
+    wanted = status.lower()
+    for t in transitions:
+        if t['name'].lower() == wanted:
+            return t
+    for t in transitions:
+        to = target_status(t)
+        if to and to.lower() == wanted:
+            return t
+    return None
+
+
+class WorkflowGraph:
+    """Directed graph of the statuses (case-insensitive) of one project and issue type."""
+
+    def __init__(self, project: str, issue_type: str):
+        self.project = project
+        self.issue_type = issue_type
+        self._lock = threading.Lock()
+        self._edges: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._names: Dict[str, str] = {}
+
+    def learn(self, from_status: str, transitions: Iterable[Dict[str, Any]]) -> None:
+        """Replace the outgoing edges of a status with a fresh transitions response."""
+        edges = {}
+        for transition in transitions:
+            to_name = target_status(transition)
+            if to_name is not None:
+                edges[to_name.lower()] = {"id": str(transition["id"]), "name": transition.get("name", ""), "to": to_name}
+        with self._lock:
+            for name in [from_status] + [edge["to"] for edge in edges.values()]:
+                self._names.setdefault(name.lower(), name)
+            self._edges[from_status.lower()] = edges
+
+    def is_explored(self, status: str) -> bool:
+        with self._lock:
+            return status.lower() in self._edges
+
+    def transitions_from(self, status: str) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._edges.get(status.lower(), {}).values())
+
+    def name(self, status: str) -> str:
+        return self._names.get(status.lower(), status)
+
+    def statuses(self) -> List[str]:
+        with self._lock:
+            return sorted(self._names.values())
+
+    def _bfs(self, start: str, done) -> Optional[List[Dict[str, str]]]:
+        with self._lock:
+            edges = {status: dict(targets) for status, targets in self._edges.items()}
+        start = start.lower()
+        previous: Dict[str, Optional[tuple]] = {start: None}
+        queue = deque([start])
+        while queue:
+            status = queue.popleft()
+            if status != start and done(status):
+                path = []
+                while previous[status] is not None:
+                    parent, edge = previous[status]
+                    path.append(edge)
+                    status = parent
+                return list(reversed(path))
+            for target, edge in edges.get(status, {}).items():
+                if target not in previous:
+                    previous[target] = (status, edge)
+                    queue.append(target)
+        return None
+
+    def shortest_path(self, start: str, goal: str) -> Optional[List[Dict[str, str]]]:
+        """Fewest transitions from start to goal over the known edges, or None."""
+        if start.lower() == goal.lower():
+            return []
+        goal = goal.lower()
+        return self._bfs(start, lambda status: status == goal)
+
+
+def graph_for(jira, project: Any, issue_type: Any) -> Optional[WorkflowGraph]:
+    """Return the cached graph of a project and issue type, or None if either is unknown."""
+    server = server_key(jira)
+    if server is None or not isinstance(project, str) or not isinstance(issue_type, str):
+        return None
+    key = (server, project.upper(), issue_type.lower())
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = WorkflowGraph(project, issue_type)
+            _graphs.set(key, graph)
+    return graph
+
+
+def workflow_graph(jira, issue) -> Optional[WorkflowGraph]:
+    """Return the cached graph for an issue's project and issue type, or None if they are unknown."""
+    fields = getattr(issue, "fields", None)
+    project = getattr(getattr(fields, "project", None), "key", None)
+    issue_type = getattr(getattr(fields, "issuetype", None), "name", None)
+    return graph_for(jira, project, issue_type)
+
+
+def quote_jql(value: str) -> str:
+    """Quote a value for use in JQL."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def is_issue_key(value: str) -> bool:
+    """Whether a value is shaped like an issue key (e.g. "DEMO-12"), so it can go into JQL as is."""
+    return bool(_ISSUE_KEY.match(value))
+
+
+def discover(jira, graph: WorkflowGraph, max_rounds: int = 3) -> bool:
+    """
+    Learn the transitions of statuses not seen yet, without moving any issue.
+
+    Searches the project for issues of the same type in unexplored statuses
+    and reads the transitions of one issue per status.
+
+    Returns:
+        True if at least one new status was explored
+    """
+    learned = False
+    prime_field_cache(jira)
+    for _ in range(max_rounds):
+        explored = [name for name in graph.statuses() if graph.is_explored(name)]
+        jql = f"project = {quote_jql(graph.project)} AND issuetype = {quote_jql(graph.issue_type)}"
+        if explored:
+            jql += f" AND status not in ({', '.join(quote_jql(name) for name in explored)})"
+        result = jira.search_issues(jql_str=jql, maxResults=100, fields=["status"], json_result=True)
+        samples: Dict[str, str] = {}
+        for raw in result.get("issues", []) if isinstance(result, dict) else []:
+            status = ((raw.get("fields") or {}).get("status") or {}).get("name")
+            if isinstance(status, str) and not graph.is_explored(status):
+                samples.setdefault(status, raw["key"])
+        if not samples:
+            break
+        for status, key in samples.items():
+            graph.learn(status, jira.transitions(key))
+        learned = True
+    return learned
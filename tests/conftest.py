@@ -0,0 +1,46 @@
+"""Shared test fixtures."""
+import pytest
+
+import src.journal
+from src.stores import close_stores
+from src.breaker import reset_breakers
+from src.cache import clear_all
+from src.main import close_clients
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Start and end every test with empty in-process caches."""
+    clear_all()
+    yield
+    clear_all()
+
+
+@pytest.fixture(autouse=True)
+def isolated_journal(tmp_path, monkeypatch):
+    """Give every test its own write journal and stores instead of those in the user's state directory."""
+    monkeypatch.setenv("JIRA_MCP_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setenv("JIRA_MCP_JOURNAL", str(tmp_path / "writes.sqlite3"))
+    monkeypatch.setattr(src.journal, "_journal", None)
+    monkeypatch.setattr(src.journal, "_worker", None)
+    yield
+    if src.journal._worker is not None:
+        src.journal._worker.stop(timeout=5)
+    if src.journal._journal is not None:
+        src.journal._journal.close()
+    close_stores()
+
+
+@pytest.fixture(autouse=True)
+def closed_breakers():
+    """Start and end every test with closed circuit breakers."""
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Give every test its own shared JIRA clients."""
+    yield
+    close_clients()
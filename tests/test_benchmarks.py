@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Run every tool against the fake JIRA server and enforce round-trip budgets."""
+import ast
+import os
+import unittest
+import logging
+from benchmarks.bench_tools import SCENARIOS, format_report, run_benchmarks
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestRoundTripBudgets(unittest.TestCase):
+    """Each tool must stay within its declared number of HTTP round trips."""
+    
+    def test_tools_within_budget(self):
+        """Run all benchmark scenarios once with no injected latency."""
+        results = run_benchmarks(latency=0.0, iterations=1)
+        logger.info("\n" + format_report(results))
+        
+        # Every scenario ran
+        self.assertEqual(len(results), len(SCENARIOS))
+        
+        for result in results:
+            with self.subTest(tool=result['name']):
+                self.assertEqual(result['errors'], 0)
+                # Only tools that do not talk to JIRA have a budget of 0
+                if result['budget']:
+                    self.assertGreater(result['http_calls'], 0)
+                self.assertLessEqual(
+                    result['http_calls'], result['budget'],
+                    f"{result['name']} made {result['http_calls']} requests: {result['endpoints']}"
+                )
+
+
+    def test_every_registered_tool_has_a_budget(self):
+        """Every tool main.py registers has at least one benchmark scenario."""
+        path = os.path.join(os.path.dirname(__file__), '..', 'src', 'main.py')
+        with open(path) as f:
+            tree = ast.parse(f.read())
+        registered = {
+            keyword.value.value
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'add_tool'
+            for keyword in node.keywords if keyword.arg == 'name'
+        }
+        self.assertGreater(len(registered), 20)
+        benchmarked = {scenario.tool.rsplit('.', 1)[1] for scenario in SCENARIOS}
+        self.assertEqual(sorted(registered - benchmarked), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Test the bulk_transition tool and the shared rate limit."""
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from jira.exceptions import JIRAError
+from src.http_hooks import RateLimiter
+from src.tools.bulk import bulk_transition
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+def raw_issue(key, status, issue_type='Task'):
+    """Build a search result entry."""
+    return {'key': key, 'fields': {
+        'project': {'key': 'TEST'}, 'issuetype': {'name': issue_type}, 'status': {'name': status}
+    }}
+
+TRANSITIONS = {
+    'To Do': [{'id': '21', 'name': 'Start', 'to': {'name': 'In Progress'}}],
+    'In Review': [{'id': '41', 'name': 'Approve', 'to': {'name': 'Done'}}]
+}
+
+class TestBulkTransition(unittest.TestCase):
+    """Test cases for bulk_transition."""
+
+    def setUp(self):
+        self.issues = {
+            'TEST-1': raw_issue('TEST-1', 'To Do'),
+            'TEST-2': raw_issue('TEST-2', 'To Do'),
+            'TEST-3': raw_issue('TEST-3', 'To Do'),
+            'TEST-4': raw_issue('TEST-4', 'In Progress'),
+            'TEST-5': raw_issue('TEST-5', 'In Review')
+        }
+        self.mock_jira = MagicMock()
+        self.mock_jira._options = {'server': 'https://jira.example.com'}
+        self.mock_jira._fields_cache_value = {'status': 'status'}
+        self.mock_jira.search_issues.side_effect = self.search
+        self.mock_jira.transitions.side_effect = (
+            lambda key: TRANSITIONS[self.issues[key]['fields']['status']['name']]
+        )
+
+    def search(self, jql_str, startAt=0, **kwargs):
+        """Return the issues whose keys appear in the query."""
+        matches = [issue for key, issue in self.issues.items() if key in jql_str]
+        return {'total': len(matches), 'issues': matches[startAt:]}
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_transitions_resolved_once_per_group(self, mock_initialize_jira):
+        """Issues sharing project, type and status share one transitions lookup."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        result = bulk_transition(status='In Progress', issue_keys=['TEST-1', 'TEST-2', 'TEST-3', 'test-4', 'TEST-9'])
+
+        # One search for the keys and one transitions request for the To Do group
+        self.mock_jira.search_issues.assert_called_once()
+        self.assertFalse(self.mock_jira.search_issues.call_args[1]['validate_query'])
+        self.mock_jira.transitions.assert_called_once()
+        self.assertEqual(
+            sorted(call[0] for call in self.mock_jira.transition_issue.call_args_list),
+            [('TEST-1', '21'), ('TEST-2', '21'), ('TEST-3', '21')]
+        )
+
+        details = result['details']
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(details['counts'], {
+            'transitioned': 3, 'unchanged': 1, 'unavailable': 0, 'failed': 0, 'not_found': 1
+        })
+        by_key = {entry['key']: entry for entry in details['issues']}
+        self.assertEqual(by_key['TEST-1']['to'], 'In Progress')
+        self.assertEqual(by_key['TEST-4']['result'], 'unchanged')
+        self.assertEqual(by_key['TEST-9']['result'], 'not_found')
+
+        # The workflow graph is cached: a second batch needs no transitions lookup
+        self.mock_jira.reset_mock()
+        bulk_transition(status='In Progress', issue_keys=['TEST-1', 'TEST-2'])
+        self.mock_jira.transitions.assert_not_called()
+        self.assertEqual(self.mock_jira.transition_issue.call_count, 2)
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_dry_run(self, mock_initialize_jira):
+        """A dry run reports counts per group without transitioning anything."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        result = bulk_transition(status='Done', jql='TEST-1 TEST-2 TEST-5', dry_run=True)
+
+        self.mock_jira.transition_issue.assert_not_called()
+        self.assertEqual(result['details']['counts']['would_transition'], 1)
+        self.assertEqual(result['details']['counts']['unavailable'], 2)
+        groups = {group['from_status']: group for group in result['details']['groups']}
+        self.assertEqual(groups['In Review']['transition'], 'Approve')
+        self.assertEqual(groups['To Do']['available_transitions'], ['Start'])
+        self.assertNotIn('issues', result['details'])
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_failures_are_reported_per_issue(self, mock_initialize_jira):
+        """One failing issue does not stop the others."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        def transition(key, transition_id, comment=None):
+            if key == 'TEST-2':
+                raise JIRAError(status_code=403, text='You do not have permission to transition this issue')
+        self.mock_jira.transition_issue.side_effect = transition
+
+        result = bulk_transition(status='In Progress', issue_keys=['TEST-1', 'TEST-2', 'TEST-3'], comment='Go')
+
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual(result['details']['counts']['transitioned'], 2)
+        self.assertEqual(result['details']['counts']['failed'], 1)
+        failed = [entry for entry in result['details']['issues'] if entry['result'] == 'failed']
+        self.assertEqual(failed[0]['key'], 'TEST-2')
+        self.assertIn('permission', failed[0]['error'])
+        self.assertEqual(self.mock_jira.transition_issue.call_args[1]['comment'], 'Go')
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_malformed_keys_are_not_searched(self, mock_initialize_jira):
+        """Keys that are not shaped like issue keys fail on their own and never reach the JQL."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        result = bulk_transition(status='In Progress', issue_keys=['TEST-1', 'X-1) OR project is not EMPTY ORDER BY (key'])
+
+        jql = self.mock_jira.search_issues.call_args[1]['jql_str']
+        self.assertEqual(jql, 'key in (TEST-1)')
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual(result['details']['counts']['transitioned'], 1)
+        self.assertEqual(result['details']['counts']['failed'], 1)
+        failed = [entry for entry in result['details']['issues'] if entry['result'] == 'failed']
+        self.assertEqual(failed[0]['error'], 'Not a valid issue key')
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_requires_jql_or_keys(self, mock_initialize_jira):
+        """Exactly one of jql and issue_keys must be given."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        with self.assertRaises(ValueError):
+            bulk_transition(status='Done')
+        with self.assertRaises(ValueError):
+            bulk_transition(status='Done', jql='project = TEST', issue_keys=['TEST-1'])
+
+    def test_rate_limiter(self):
+        """The limiter allows a burst, then spaces requests at the configured rate."""
+        limiter = RateLimiter(rate=100, burst=2)
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.015)
+
+        limiter.pause(0.05)
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+
+if __name__ == '__main__':
+    unittest.main()
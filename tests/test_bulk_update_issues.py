@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Test the bulk_update_issues tool."""
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+import anyio
+from fastmcp import FastMCP
+from jira.exceptions import JIRAError
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+from src.deadline import with_deadline
+from src.offload import offload_tool
+from src.tools.bulk import bulk_update_issues
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+ISSUES = [{'id': str(10000 + n), 'key': f'TEST-{n}'} for n in range(1, 5)]
+
+class TestBulkUpdateIssues(unittest.TestCase):
+    """Test cases for bulk_update_issues."""
+
+    def setUp(self):
+        self.mock_jira = MagicMock()
+        self.mock_jira._options = {'server': 'https://jira.example.com'}
+        self.mock_jira._fields_cache_value = {'summary': 'summary'}
+        self.mock_jira._is_cloud = False
+        self.mock_jira._get_url.side_effect = lambda path: f'https://jira.example.com/rest/api/2/{path}'
+        self.mock_jira.search_issues.return_value = {'total': len(ISSUES), 'issues': ISSUES}
+        self.mock_jira.priorities.return_value = [
+            MagicMock(raw={'id': '2', 'name': 'High'}), MagicMock(raw={'id': '3', 'name': 'Medium'})
+        ]
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_single_updates(self, mock_initialize_jira):
+        """Without the bulk edit endpoint every issue gets one PUT with the whole change set."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        def put(url, data):
+            if url.endswith('TEST-3'):
+                raise JIRAError(status_code=400, text='components: Component name \'API\' is not valid')
+        self.mock_jira._session.put.side_effect = put
+
+        result = bulk_update_issues(
+            jql='project = TEST', add_labels=['triage'], remove_labels=['new'], priority='high', components=['API']
+        )
+
+        self.assertEqual(self.mock_jira._session.put.call_count, 4)
+        payload = json.loads(self.mock_jira._session.put.call_args[1]['data'])
+        self.assertEqual(payload['update'], {'labels': [{'add': 'triage'}, {'remove': 'new'}]})
+        self.assertEqual(payload['fields'], {'priority': {'name': 'High'}, 'components': [{'name': 'API'}]})
+
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual(result['details']['method'], 'single_updates')
+        self.assertEqual(result['details']['updated'], 3)
+        self.assertEqual(result['details']['failures'][0]['key'], 'TEST-3')
+        self.assertIn('Component', result['details']['failures'][0]['error'])
+
+    @patch('src.tools.bulk.time.sleep')
+    @patch('src.tools.bulk.initialize_jira')
+    def test_bulk_edit_endpoint(self, mock_initialize_jira, mock_sleep):
+        """On Cloud, label and priority changes run as one bulk edit task."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._is_cloud = True
+        self.mock_jira._session.post.return_value.json.return_value = {'taskId': '77'}
+        self.mock_jira._session.get.return_value.json.side_effect = [
+            {'status': 'RUNNING', 'processedAccessibleIssues': ['10001']},
+            {'status': 'COMPLETE', 'processedAccessibleIssues': ['10001', '10002', '10004'],
+             'failedAccessibleIssues': {'10003': ['Priority cannot be set']}}
+        ]
+
+        result = bulk_update_issues(issue_keys=['TEST-1', 'TEST-2', 'TEST-3', 'TEST-4'], add_labels=['triage'],
+                                    priority='Medium')
+
+        self.mock_jira._session.put.assert_not_called()
+        url = self.mock_jira._session.post.call_args[0][0]
+        self.assertTrue(url.endswith('bulk/issues/fields'))
+        body = json.loads(self.mock_jira._session.post.call_args[1]['data'])
+        self.assertEqual(body['selectedIssueIdsOrKeys'], ['TEST-1', 'TEST-2', 'TEST-3', 'TEST-4'])
+        self.assertEqual(body['editedFieldsInput']['priority'], {'priorityId': '3'})
+        self.assertEqual(body['editedFieldsInput']['labelsFields'][0]['bulkEditMultiSelectFieldOption'], 'ADD')
+        self.assertTrue(self.mock_jira._session.get.call_args[0][0].endswith('bulk/queue/77'))
+
+        self.assertEqual(result['details']['method'], 'bulk_edit')
+        self.assertEqual(result['details']['updated'], 3)
+        self.assertEqual(result['details']['failures'], [{'key': 'TEST-3', 'error': 'Priority cannot be set'}])
+
+    @patch('src.tools.bulk.BULK_EDIT_TIMEOUT', -1)
+    @patch('src.tools.bulk.BULK_EDIT_LIMIT', 2)
+    @patch('src.tools.bulk.initialize_jira')
+    def test_bulk_edit_task_still_running(self, mock_initialize_jira):
+        """A chunk whose task outlasts the timeout stops the run; the later chunks are reported as not submitted."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._is_cloud = True
+        self.mock_jira._session.post.return_value.json.return_value = {'taskId': '77'}
+        self.mock_jira._session.get.return_value.json.return_value = {
+            'status': 'RUNNING', 'processedAccessibleIssues': ['10001']
+        }
+
+        result = bulk_update_issues(issue_keys=['TEST-1', 'TEST-2', 'TEST-3', 'TEST-4'], add_labels=['triage'])
+
+        self.mock_jira._session.post.assert_called_once()
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual(result['details']['task_id'], '77')
+        self.assertEqual(result['details']['updated'], 1)
+        self.assertEqual([failure['key'] for failure in result['details']['failures']], ['TEST-3', 'TEST-4'])
+        self.assertTrue(all(failure['error'].startswith('Not submitted') for failure in result['details']['failures']))
+        self.assertIn('2 issues failed or were not submitted', result['message'])
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_bulk_edit_unavailable(self, mock_initialize_jira):
+        """A refused bulk edit request falls back to single PUTs."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._is_cloud = True
+        self.mock_jira._session.post.side_effect = JIRAError(status_code=403, text='Bulk change permission required')
+
+        result = bulk_update_issues(jql='project = TEST', remove_labels=['triage'])
+
+        self.assertEqual(self.mock_jira._session.put.call_count, 4)
+        self.assertEqual(result['details']['method'], 'single_updates')
+        self.assertEqual(result['status'], 'success')
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_invalid_priority(self, mock_initialize_jira):
+        """An unknown priority is rejected before any issue is touched."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        with self.assertRaises(ValueError) as context:
+            bulk_update_issues(jql='project = TEST', priority='Urgent')
+        self.assertIn('High, Medium', str(context.exception))
+        self.mock_jira.search_issues.assert_not_called()
+        self.mock_jira._session.put.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            bulk_update_issues(jql='project = TEST')
+
+    @patch('src.tools.bulk.initialize_jira')
+    def test_progress_reaches_the_client(self, mock_initialize_jira):
+        """A client that sends a progressToken receives progress notifications while the issues are updated."""
+        mock_initialize_jira.return_value = self.mock_jira
+        app = FastMCP(name='jira-tools')
+        app.add_tool(offload_tool(with_deadline(bulk_update_issues, 'bulk_update_issues'), 'bulk_update_issues'),
+                     name='bulk_update_issues', description='Bulk update')
+
+        async def main():
+            async with create_connected_server_and_client_session(app._mcp_server) as client:
+                notifications = []
+
+                async def listen():
+                    async for message in client.incoming_messages:
+                        if isinstance(message, types.ServerNotification):
+                            notifications.append(message.root)
+
+                listener = asyncio.ensure_future(listen())
+                request = types.ClientRequest(types.CallToolRequest(
+                    method='tools/call',
+                    params=types.CallToolRequestParams(
+                        name='bulk_update_issues',
+                        arguments={'jql': 'project = TEST', 'add_labels': ['triage']},
+                        _meta=types.RequestParams.Meta(progressToken='bulk-1')
+                    )
+                ))
+                result = await client.send_request(request, types.CallToolResult)
+                self.assertFalse(result.isError)
+                # Notifications sent before the result may still be on their way
+                with anyio.fail_after(5):
+                    while len(notifications) < 4:
+                        await asyncio.sleep(0.01)
+                listener.cancel()
+                return notifications
+
+        notifications = asyncio.run(main())
+        self.assertTrue(all(isinstance(n, types.ProgressNotification) for n in notifications))
+        self.assertEqual([n.params.progressToken for n in notifications], ['bulk-1'] * 4)
+        self.assertEqual([(n.params.progress, n.params.total) for n in notifications],
+                         [(1, 4), (2, 4), (3, 4), (4, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Test the create-metadata catalog and local validation in create_issue and update_issue."""
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from jira.exceptions import JIRAError
+from src.tools.issues import create_issue, update_issue
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+def field(name, required=False, has_default=False, allowed=None):
+    """Build one createmeta/editmeta field entry."""
+    entry = {'name': name, 'required': required, 'hasDefaultValue': has_default}
+    if allowed is not None:
+        entry['allowedValues'] = [{'name': value} for value in allowed]
+    return entry
+
+def create_meta(issue_types):
+    """Build a createmeta response for project TEST."""
+    return {'projects': [{'key': 'TEST', 'issuetypes': issue_types}]}
+
+BUG = {
+    'id': '1', 'name': 'Bug', 'subtask': False,
+    'fields': {
+        'summary': field('Summary', required=True),
+        'issuetype': field('Issue Type', required=True),
+        'project': field('Project', required=True),
+        'reporter': field('Reporter', required=True, has_default=True),
+        'priority': field('Priority', allowed=['High', 'Low'])
+    }
+}
+
+SUBTASK = {
+    'id': '2', 'name': 'Sub-task', 'subtask': True,
+    'fields': {
+        'summary': field('Summary', required=True),
+        'parent': field('Parent', required=True)
+    }
+}
+
+class TestCatalog(unittest.TestCase):
+    """Test cases for catalog-based validation."""
+
+    def setUp(self):
+        self.mock_jira = MagicMock()
+        self.mock_jira._options = {'server': 'https://jira.example.com'}
+        self.mock_jira.createmeta.return_value = create_meta([BUG, SUBTASK])
+        self.mock_jira.create_issue.return_value = MagicMock(key='TEST-1')
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_normalizes_names_and_caches(self, mock_initialize_jira):
+        """Issue type and priority are matched case-insensitively and the metadata is fetched once."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        create_issue(project_key='TEST', summary='One', issue_type='bug', priority='high')
+        create_issue(project_key='TEST', summary='Two', issue_type='BUG')
+
+        fields = self.mock_jira.create_issue.call_args_list[0][1]['fields']
+        self.assertEqual(fields['issuetype'], {'name': 'Bug'})
+        self.assertEqual(fields['priority'], {'name': 'High'})
+        self.mock_jira.createmeta.assert_called_once_with(
+            projectKeys='TEST', expand='projects.issuetypes.fields'
+        )
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_invalid_input_is_rejected_locally(self, mock_initialize_jira):
+        """Unknown issue types, invalid priorities and missing required fields never reach JIRA."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        with self.assertRaises(ValueError) as context:
+            create_issue(project_key='TEST', summary='x', issue_type='Epic')
+        self.assertIn('Available issue types: Bug, Sub-task', str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            create_issue(project_key='TEST', summary='x', issue_type='Bug', priority='Urgent')
+        self.assertIn('Allowed priorities: High, Low', str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            create_issue(project_key='TEST', summary='x', issue_type='Sub-task')
+        self.assertIn('requires these fields: Parent', str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            create_issue(project_key='TEST', summary='x', issue_type='Sub-task', priority='High')
+        self.assertIn('Priority cannot be set', str(context.exception))
+
+        self.mock_jira.create_issue.assert_not_called()
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_refresh_after_mismatch(self, mock_initialize_jira):
+        """A cached catalog that rejects the input is refreshed once before failing."""
+        mock_initialize_jira.return_value = self.mock_jira
+        create_issue(project_key='TEST', summary='x', issue_type='Bug')
+
+        # The project gained a new issue type after the catalog was cached
+        story = dict(BUG, id='3', name='Story')
+        self.mock_jira.createmeta.return_value = create_meta([BUG, story])
+        create_issue(project_key='TEST', summary='x', issue_type='Story')
+
+        self.assertEqual(self.mock_jira.createmeta.call_count, 2)
+        fields = self.mock_jira.create_issue.call_args[1]['fields']
+        self.assertEqual(fields['issuetype'], {'name': 'Story'})
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_server_rejection_invalidates_catalog(self, mock_initialize_jira):
+        """A 400 from JIRA drops the cached metadata so the next call reloads it."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira.create_issue.side_effect = JIRAError(status_code=400, text='bad')
+
+        with self.assertRaises(JIRAError):
+            create_issue(project_key='TEST', summary='x', issue_type='Bug')
+        with self.assertRaises(JIRAError):
+            create_issue(project_key='TEST', summary='x', issue_type='Bug')
+
+        self.assertEqual(self.mock_jira.createmeta.call_count, 2)
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_fails_open_without_metadata(self, mock_initialize_jira):
+        """When createmeta is unavailable the input is sent unchanged."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira.createmeta.side_effect = JIRAError(status_code=500, text='down')
+
+        create_issue(project_key='TEST', summary='x', issue_type='Anything', priority='Whatever')
+
+        fields = self.mock_jira.create_issue.call_args[1]['fields']
+        self.assertEqual(fields['issuetype'], {'name': 'Anything'})
+        self.assertEqual(fields['priority'], {'name': 'Whatever'})
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_update_validates_priority_with_editmeta(self, mock_initialize_jira):
+        """update_issue checks the priority against the issue's edit metadata before any update."""
+        mock_initialize_jira.return_value = self.mock_jira
+        mock_issue = MagicMock()
+        mock_issue.raw = {'editmeta': {'fields': {'priority': field('Priority', allowed=['High', 'Low'])}}}
+        self.mock_jira.issue.return_value = mock_issue
+
+        with self.assertRaises(ValueError) as context:
+            update_issue(issue_key='TEST-1', summary='New', priority='Urgent')
+        self.assertIn('Allowed priorities: High, Low', str(context.exception))
+        mock_issue.update.assert_not_called()
+
+        update_issue(issue_key='TEST-1', priority='low')
+        self.mock_jira.issue.assert_any_call('TEST-1', expand='editmeta')
+        mock_issue.update.assert_called_once_with(fields={'priority': {'name': 'Low'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
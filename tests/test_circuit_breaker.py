@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Test the circuit breakers and stale reads while JIRA is degraded."""
+import os
+import time
+import unittest
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer
+from src.breaker import CircuitBreaker, CircuitOpen, breakers, endpoint_class
+from src.http_hooks import RateLimiter
+from src.tools.issues import add_comment, get_issue_details
+from src.tools.projects import list_projects
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_on_errors_and_probes(self):
+        """Failures open the breaker; after the open period one probe decides whether it closes."""
+        breaker = CircuitBreaker('issue', window=4, min_calls=4, open_seconds=0.1)
+        for failed in (False, True, False, True):
+            breaker.before('GET', 'GET issue/{key}')
+            breaker.record(0.01, failed)
+        self.assertEqual(breaker.state, 'open')
+
+        with self.assertRaises(CircuitOpen) as context:
+            breaker.before('POST', 'POST issue/{key}/comment')
+        self.assertIn('write POST issue/{key}/comment was not sent', str(context.exception))
+        self.assertIn('2 of the last 4 failed', str(context.exception))
+
+        time.sleep(0.15)
+        self.assertEqual(breaker.state, 'half_open')
+        probe = breaker.before('GET', 'GET issue/{key}')
+        with self.assertRaises(CircuitOpen):
+            breaker.before('GET', 'GET issue/{key}')
+        breaker.record(0.01, failed=False, probe=probe)
+        self.assertEqual(breaker.state, 'closed')
+        self.assertEqual(breaker.times_opened, 1)
+
+    def test_late_response_is_not_the_probe(self):
+        """A request sent before the breaker opened that completes during the probe does not decide it."""
+        breaker = CircuitBreaker('issue', window=2, min_calls=2, open_seconds=0.1)
+        late = breaker.before('GET', 'GET issue/{key}')
+        for _ in range(2):
+            breaker.before('GET', 'GET issue/{key}')
+            breaker.record(0.01, failed=True)
+        self.assertEqual(breaker.state, 'open')
+
+        time.sleep(0.15)
+        probe = breaker.before('GET', 'GET issue/{key}')
+        self.assertIsNotNone(probe)
+        # The slow request sent while the breaker was closed fails only now
+        breaker.record(10.0, failed=True, probe=late)
+        self.assertEqual(breaker.state, 'half_open')
+        self.assertEqual(breaker.times_opened, 1)
+        breaker.record(0.01, failed=False, probe=probe)
+        self.assertEqual(breaker.state, 'closed')
+
+        # Likewise a late success does not close a breaker whose probe is still out
+        for _ in range(2):
+            breaker.record(0.01, failed=True)
+        time.sleep(0.15)
+        probe = breaker.before('GET', 'GET issue/{key}')
+        breaker.record(0.01, failed=False)
+        self.assertEqual(breaker.state, 'half_open')
+        breaker.record(0.01, failed=True, probe=probe)
+        self.assertEqual(breaker.state, 'open')
+
+    def test_released_probe_lets_another_through(self):
+        """A probe released without an outcome leaves the breaker half open for the next request."""
+        breaker = CircuitBreaker('issue', window=2, min_calls=2, open_seconds=0.1)
+        for _ in range(2):
+            breaker.before('GET', 'GET issue/{key}')
+            breaker.record(0.01, failed=True)
+
+        time.sleep(0.15)
+        probe = breaker.before('GET', 'GET issue/{key}')
+        breaker.release(probe)
+        self.assertEqual(breaker.state, 'half_open')
+        self.assertEqual(breaker.times_opened, 1)
+        probe = breaker.before('GET', 'GET issue/{key}')
+        self.assertIsNotNone(probe)
+        breaker.record(0.01, failed=False, probe=probe)
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_opens_on_slow_requests(self):
+        """Mostly slow requests open the breaker even when they succeed."""
+        breaker = CircuitBreaker('search', window=10, min_calls=5, slow_seconds=1.0)
+        for duration in (0.2, 1.5, 2.0, 0.3, 3.0):
+            breaker.record(duration, failed=False)
+        self.assertEqual(breaker.state, 'open')
+        self.assertIn('took over 1s', breaker.snapshot()['reason'])
+
+        self.assertEqual(endpoint_class('GET search'), 'search')
+        self.assertEqual(endpoint_class('POST issue/{key}/transitions'), 'issue')
+        self.assertEqual(endpoint_class('GET issue/createmeta/{key}/issuetypes'), 'metadata')
+        self.assertEqual(endpoint_class('GET serverInfo'), 'metadata')
+
+
+class TestStaleReads(unittest.TestCase):
+    """Test cases for serving cached reads while JIRA is degraded."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+
+    def trip(self, name):
+        """Open a breaker as if its recent requests had failed."""
+        breaker = breakers[name]
+        for _ in range(breaker.min_calls):
+            breaker.record(0.01, failed=True)
+
+    def test_failing_read_serves_last_result(self):
+        """A read failing with a 5xx returns its last good result marked stale."""
+        fresh = get_issue_details('DEMO-1')
+        self.assertNotIn('stale', fresh)
+
+        self.server.error_rate = 1.0
+        result = get_issue_details('DEMO-1')
+        self.assertTrue(result['stale'])
+        self.assertEqual(result['details'], fresh['details'])
+
+        with self.assertRaises(Exception):
+            get_issue_details('DEMO-2')
+
+    def test_open_breaker_serves_stale_and_fails_writes(self):
+        """While breakers are open, cached reads return at once and writes are refused."""
+        projects = list_projects(limit=5)
+        get_issue_details('DEMO-1')
+        self.trip('metadata')
+        self.trip('issue')
+        self.server.reset_stats()
+
+        self.assertEqual(list_projects(limit=5), [dict(project, stale=True) for project in projects])
+        self.assertTrue(get_issue_details('DEMO-1')['stale'])
+
+        with self.assertRaises(CircuitOpen) as context:
+            add_comment('DEMO-1', 'Deployed')
+        self.assertIn('not sent', str(context.exception))
+        self.assertEqual(self.server.stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
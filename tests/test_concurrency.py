@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Test run_concurrently."""
+import threading
+import unittest
+import logging
+from src.concurrency import run_concurrently
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestRunConcurrently(unittest.TestCase):
+    """Test cases for run_concurrently."""
+
+    def test_on_done_follows_completion(self):
+        """A slow first call does not hold back the callbacks of the calls behind it."""
+        release = threading.Event()
+        done = []
+
+        def work(item):
+            if item == 'slow':
+                # Only finishes once every other call was reported
+                self.assertTrue(release.wait(5))
+            if item == 'broken':
+                raise ValueError('broken')
+            return item.upper()
+
+        def on_done(index, item, result, error):
+            done.append((index, item))
+            if len(done) == 3:
+                release.set()
+
+        results = run_concurrently(work, ['slow', 'a', 'broken', 'b'], max_workers=4, on_done=on_done)
+
+        self.assertEqual(done[-1], (0, 'slow'))
+        self.assertEqual(sorted(done), [(0, 'slow'), (1, 'a'), (2, 'broken'), (3, 'b')])
+        # Results stay in input order
+        self.assertEqual([(item, result) for item, result, _ in results],
+                         [('slow', 'SLOW'), ('a', 'A'), ('broken', None), ('b', 'B')])
+        self.assertIsInstance(results[2][2], ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
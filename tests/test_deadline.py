@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test per-call deadlines and cancellation of tool calls."""
+import inspect
+import os
+import time
+import unittest
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer
+from src.breaker import breaker_states
+from src.deadline import CallCancelled, DeadlineExceeded, current_budget, tool_timeout, with_deadline
+from src.http_hooks import RateLimiter
+from src.tools.issues import get_issue_details
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for with_deadline and the deadline-aware HTTP hooks."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+
+    def test_timeout_parameter_and_defaults(self):
+        """Wrapped tools take an optional timeout_seconds; defaults come from the environment."""
+        tool = with_deadline(get_issue_details, 'get_issue_details')
+        parameter = inspect.signature(tool).parameters['timeout_seconds']
+        self.assertIsNone(parameter.default)
+
+        seen = []
+        probe = with_deadline(lambda: seen.append(current_budget().timeout), 'probe')
+        with patch.dict(os.environ, {'JIRA_MCP_TOOL_TIMEOUTS': 'probe=7, other=1', 'JIRA_MCP_TOOL_TIMEOUT': '30'}):
+            probe()
+            probe(timeout_seconds=2.5)
+            self.assertEqual(tool_timeout('search_issues'), 30.0)
+        self.assertEqual(seen, [7.0, 2.5])
+        self.assertEqual(tool_timeout('bulk_transition'), 300.0)
+        self.assertIsNone(current_budget())
+
+    def test_slow_jira_hits_deadline(self):
+        """A slow response is abandoned when the call's deadline passes."""
+        self.server.latency = 2.0
+        tool = with_deadline(get_issue_details, 'get_issue_details')
+
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded) as context:
+            tool(issue_key='DEMO-1', timeout_seconds=0.3)
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertIn('0.3 seconds', str(context.exception))
+
+    def test_deadline_timeouts_leave_breaker_closed(self):
+        """Requests cut short by a tight deadline are not counted as JIRA failures."""
+        self.server.latency = 0.5
+        tool = with_deadline(get_issue_details, 'get_issue_details')
+
+        for _ in range(10):
+            with self.assertRaises(DeadlineExceeded):
+                tool(issue_key='DEMO-1', timeout_seconds=0.1)
+        self.assertEqual({state['state'] for state in breaker_states().values()}, {'closed'})
+
+    def test_cancelled_call_sends_no_requests(self):
+        """Once a call is cancelled no further JIRA request is started."""
+        def cancel_then_read(issue_key):
+            current_budget().cancel()
+            return get_issue_details(issue_key)
+
+        tool = with_deadline(cancel_then_read, 'get_issue_details')
+        self.server.reset_stats()
+
+        with self.assertRaises(CallCancelled):
+            tool(issue_key='DEMO-1')
+        self.assertEqual(self.server.stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
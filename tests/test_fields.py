@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Test field name resolution and type-aware rendering in search_issues and the write tools."""
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from src.tools.issues import search_issues, create_issue, update_issue
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+FIELDS = [
+    {'id': 'summary', 'name': 'Summary', 'custom': False, 'clauseNames': ['summary'],
+     'schema': {'type': 'string', 'system': 'summary'}},
+    {'id': 'status', 'name': 'Status', 'custom': False, 'clauseNames': ['status'],
+     'schema': {'type': 'status', 'system': 'status'}},
+    {'id': 'assignee', 'name': 'Assignee', 'custom': False, 'clauseNames': ['assignee'],
+     'schema': {'type': 'user', 'system': 'assignee'}},
+    {'id': 'labels', 'name': 'Labels', 'custom': False, 'clauseNames': ['labels'],
+     'schema': {'type': 'array', 'items': 'string', 'system': 'labels'}},
+    {'id': 'customfield_10016', 'name': 'Story Points', 'custom': True,
+     'clauseNames': ['cf[10016]', 'Story Points'],
+     'schema': {'type': 'number', 'custom': 'com.atlassian.jira.plugin.system.customfieldtypes:float'}},
+    {'id': 'customfield_10020', 'name': 'Sprint', 'custom': True, 'clauseNames': ['cf[10020]', 'Sprint'],
+     'schema': {'type': 'array', 'items': 'json', 'custom': 'com.pyxis.greenhopper.jira:gh-sprint'}},
+    {'id': 'customfield_10030', 'name': 'Team', 'custom': True, 'clauseNames': ['cf[10030]', 'Team'],
+     'schema': {'type': 'option', 'custom': 'com.atlassian.jira.plugin.system.customfieldtypes:select'}},
+]
+
+RAW_ISSUE = {
+    'key': 'TEST-1',
+    'fields': {
+        'summary': 'First issue',
+        'status': {'name': 'In Progress'},
+        'assignee': {'displayName': 'Jane Doe', 'accountId': 'abc'},
+        'labels': ['backend'],
+        'customfield_10016': 5.0,
+        'customfield_10020': [
+            {'id': 3, 'name': 'Sprint 3'},
+            'com.atlassian.greenhopper.service.sprint.Sprint@1[id=4,state=CLOSED,name=Sprint 4,goal=]'
+        ],
+        'customfield_10030': {'value': 'Platform'}
+    }
+}
+
+class TestFields(unittest.TestCase):
+    """Test cases for the field index, projections and custom field encoding."""
+
+    def setUp(self):
+        self.mock_jira = MagicMock()
+        self.mock_jira._options = {'server': 'https://jira.example.com'}
+        self.mock_jira._fields_cache_value = {}
+        self.mock_jira.fields.return_value = FIELDS
+        self.mock_jira.search_issues.return_value = {'issues': [RAW_ISSUE]}
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_search_by_field_name(self, mock_initialize_jira):
+        """Custom fields can be requested by name and only requested fields are returned."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        result = search_issues(jql='project = TEST', fields='status, Story Points,sprint,cf[10030],assignee')
+
+        _, kwargs = self.mock_jira.search_issues.call_args
+        self.assertEqual(
+            kwargs['fields'],
+            ['status', 'customfield_10016', 'customfield_10020', 'customfield_10030', 'assignee']
+        )
+        self.assertTrue(kwargs['json_result'])
+        self.assertEqual(result['issues'], [{
+            'key': 'TEST-1',
+            'status': 'In Progress',
+            'Story Points': 5.0,
+            'sprint': ['Sprint 3', 'Sprint 4'],
+            'cf[10030]': 'Platform',
+            'assignee': 'Jane Doe'
+        }])
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_field_list_is_cached(self, mock_initialize_jira):
+        """The field list is fetched once and reused to prime each new client."""
+        mock_initialize_jira.return_value = self.mock_jira
+        search_issues(jql='project = TEST', fields='summary,labels')
+
+        second_client = MagicMock()
+        second_client._options = {'server': 'https://jira.example.com'}
+        second_client._fields_cache_value = {}
+        second_client.search_issues.return_value = {'issues': [RAW_ISSUE]}
+        mock_initialize_jira.return_value = second_client
+
+        result = search_issues(jql='project = TEST', fields='summary,labels')
+
+        self.mock_jira.fields.assert_called_once()
+        second_client.fields.assert_not_called()
+        self.assertEqual(second_client._fields_cache_value['Story Points'], 'customfield_10016')
+        self.assertEqual(result['issues'][0], {'key': 'TEST-1', 'summary': 'First issue', 'labels': ['backend']})
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_unknown_field(self, mock_initialize_jira):
+        """Unknown field names are reported instead of being dropped silently."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        with self.assertRaises(ValueError) as context:
+            search_issues(jql='project = TEST', fields='summary,Velocity')
+        self.assertIn('Velocity', str(context.exception))
+        self.mock_jira.search_issues.assert_not_called()
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_write_tools_encode_custom_fields(self, mock_initialize_jira):
+        """create_issue and update_issue resolve custom field names and encode values by type."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira.create_issue.return_value = MagicMock(key='TEST-2')
+
+        create_issue(project_key='TEST', summary='New', custom_fields={'Story Points': '3', 'team': 'Platform'})
+
+        fields = self.mock_jira.create_issue.call_args[1]['fields']
+        self.assertEqual(fields['customfield_10016'], 3.0)
+        self.assertEqual(fields['customfield_10030'], {'value': 'Platform'})
+
+        mock_issue = MagicMock()
+        self.mock_jira.issue.return_value = mock_issue
+        result = update_issue(issue_key='TEST-2', custom_fields={'Sprint': '7'})
+
+        mock_issue.update.assert_called_once_with(fields={'customfield_10020': 7})
+        self.assertIn('Fields updated: Sprint', result['changes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Test the flow_metrics tool."""
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer, _utcnow, format_timestamp
+from src.http_hooks import RateLimiter
+from src.tools.flow import flow_metrics
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestFlowMetrics(unittest.TestCase):
+    """Test cases for flow_metrics against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.state = self.server.state
+        self.now = _utcnow()
+
+    def issue(self, created_days_ago, *moves):
+        """Add an issue created some days ago that moved to each (status, days ago) in turn."""
+        state = self.state
+        issue = state.add_issue('DEMO', summary='Flow', labels=['flow'],
+                                created=self.now - timedelta(days=created_days_ago))
+        with state.lock:
+            previous = 'To Do'
+            for status, days_ago in moves:
+                moved = self.now - timedelta(days=days_ago)
+                state._next_history_id += 1
+                issue['changelog'].append({
+                    'id': str(state._next_history_id),
+                    'created': format_timestamp(moved),
+                    'items': [{'field': 'status', 'fieldtype': 'jira', 'fromString': previous, 'toString': status}]
+                })
+                issue['status'], issue['updated'], previous = status, moved, status
+        return issue
+
+    def test_lead_cycle_time_and_throughput(self):
+        """Times are computed from status changes; a repeated report reads no changelogs."""
+        self.issue(10, ('In Progress', 8), ('In Review', 5), ('Done', 2))
+        self.issue(6, ('In Progress', 4), ('Done', 1))
+        self.issue(3, ('In Progress', 2))
+
+        result = flow_metrics('labels = flow', weeks=4)
+        details = result['details']
+        self.assertEqual(details['analysed'], 3)
+        self.assertEqual(details['completed'], 2)
+        self.assertEqual(details['lead_time_days']['p50'], 6.5)
+        self.assertEqual(details['cycle_time_days']['p50'], 4.5)
+        self.assertEqual(details['time_in_status_days']['In Progress']['count'], 3)
+        self.assertAlmostEqual(details['time_in_status_days']['In Progress']['mean'], 2.67, places=1)
+        self.assertEqual(details['time_in_status_days']['To Do']['p50'], 2.0)
+        self.assertNotIn('Done', details['time_in_status_days'])
+        self.assertEqual(len(details['throughput']), 4)
+        self.assertEqual(sum(week['completed'] for week in details['throughput']), 2)
+        self.assertEqual(details['changelogs_fetched'], 3)
+
+        self.server.reset_stats()
+        again = flow_metrics('labels = flow', weeks=4)
+        self.assertEqual(again['details']['cycle_time_days'], details['cycle_time_days'])
+        self.assertEqual(again['details']['changelogs_fetched'], 0)
+        self.assertNotIn('GET issue/{key}/changelog', self.server.stats())
+
+    def test_concurrent_pages(self):
+        """Results beyond the first page are fetched and every issue is counted once."""
+        for _ in range(230):
+            self.issue(5, ('In Progress', 3), ('Done', 1))
+        details = flow_metrics('labels = flow', max_issues=500)['details']
+        self.assertEqual((details['total'], details['analysed'], details['completed']), (230, 230, 230))
+        self.assertEqual(self.server.stats()['GET search']['calls'], 3)
+        self.assertEqual(details['cycle_time_days']['p95'], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the get_comments tool."""
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer, _append_comment, format_timestamp
+from src.http_hooks import RateLimiter
+from src.tools.issues import get_comments
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestGetComments(unittest.TestCase):
+    """Test cases for get_comments against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.state = self.server.state
+        with self.state.lock:
+            self.issue = self.state.issues['DEMO-1']
+            del self.issue['comments'][:]
+
+    def comment(self, count, prefix='Update'):
+        """Post `count` comments, each a second after the previous one."""
+        with self.state.lock:
+            comments = [_append_comment(self.state, self.issue, f'{prefix} {n}') for n in range(count)]
+            for index, comment in enumerate(self.issue['comments']):
+                comment['created'] = comment['updated'] = comment['created'] - timedelta(
+                    seconds=len(self.issue['comments']) - index
+                )
+        return comments
+
+    def test_pages_and_order(self):
+        """Without a cursor, one page is read in the requested order and bodies can be truncated."""
+        self.comment(5, prefix='A long incident update')
+        first = get_comments('DEMO-1', max_results=2, max_body_length=6)
+        self.assertEqual([c['body'] for c in first['details']['comments']], ['A long…', 'A long…'])
+        self.assertTrue(first['details']['comments'][0]['truncated'])
+        self.assertEqual(first['details']['next_start_at'], 2)
+        self.assertEqual(first['details']['total'], 5)
+
+        last = get_comments('DEMO-1', max_results=2, start_at=4)
+        self.assertIsNone(last['details']['next_start_at'])
+
+        newest = get_comments('DEMO-1', max_results=2, order='desc')
+        self.assertEqual([c['body'] for c in newest['details']['comments']],
+                         ['A long incident update 4', 'A long incident update 3'])
+
+    def test_since_fetches_only_new_comments(self):
+        """Following a thread from a cursor reads only the new comments and one page of overlap at most."""
+        self.comment(200)
+        cursor = get_comments('DEMO-1', max_results=1, order='desc')['details']['cursor']
+        new = self.comment(3, prefix='New')
+
+        self.server.reset_stats()
+        result = get_comments('DEMO-1', since=cursor)
+        self.assertEqual([c['body'] for c in result['details']['comments']], ['New 0', 'New 1', 'New 2'])
+        self.assertEqual(result['details']['cursor'], new[-1]['id'])
+        self.assertFalse(result['details']['more'])
+        self.assertEqual(self.server.stats()['GET issue/{key}/comment']['calls'], 1)
+
+        capped = get_comments('DEMO-1', since=cursor, max_results=2)
+        self.assertEqual([c['body'] for c in capped['details']['comments']], ['New 0', 'New 1'])
+        self.assertTrue(capped['details']['more'])
+        self.assertEqual(get_comments('DEMO-1', since=capped['details']['cursor'])['details']['comments'][0]['body'],
+                         'New 2')
+
+        # A timestamp cursor, and an older comment edited after it
+        with self.state.lock:
+            since = format_timestamp(new[0]['created'])
+            edited = self.issue['comments'][10]
+            edited['body'] = 'Corrected'
+            edited['updated'] = new[-1]['created']
+        self.assertEqual(len(get_comments('DEMO-1', since=since)['details']['comments']), 2)
+        with_edits = get_comments('DEMO-1', since=since, include_edited=True)
+        self.assertEqual([c['body'] for c in with_edits['details']['comments']], ['Corrected', 'New 1', 'New 2'])
+
+        with self.assertRaises(ValueError):
+            get_comments('DEMO-1', since='yesterday')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Test create_issue retries and idempotency keys."""
+import json
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from jira.exceptions import JIRAError
+from requests.exceptions import ReadTimeout
+from benchmarks.fake_jira import FakeJira, FakeJiraServer
+from src.cache import clear_all
+from src.http_hooks import RateLimiter
+from src.main import initialize_jira
+from src.sessions import client_scope
+from src.stores.creates import get_creates
+from src.tools.issues import create_issue, IDEMPOTENCY_PROPERTY, _idempotency_marker, _post_issue
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+TASK = {
+    'id': '3', 'name': 'Task', 'subtask': False,
+    'fields': {
+        'summary': {'name': 'Summary', 'required': True},
+        'labels': {'name': 'Labels', 'required': False}
+    }
+}
+
+class TestIdempotentCreate(unittest.TestCase):
+    """Test cases for retried and repeated create_issue calls."""
+
+    def setUp(self):
+        self.mock_jira = MagicMock()
+        self.mock_jira._options = {'server': 'https://jira.example.com'}
+        self.mock_jira._fields_cache_value = {'summary': 'summary'}
+        self.mock_jira._session.max_retries = 3
+        self.mock_jira.createmeta.return_value = {'projects': [{'key': 'TEST', 'issuetypes': [TASK]}]}
+        self.mock_jira.search_issues.return_value = {'issues': []}
+
+    def stamped(self, markers):
+        """Serve the idempotency property of issues by key."""
+        def get_json(path):
+            key = path.split('/')[1]
+            if key not in markers:
+                raise JIRAError(status_code=404, text='The property does not exist.')
+            return {'key': IDEMPOTENCY_PROPERTY, 'value': {'key': markers[key]}}
+        self.mock_jira._get_json.side_effect = get_json
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_timeout_after_create_is_not_duplicated(self, mock_initialize_jira):
+        """A create that timed out but reached JIRA is found by its idempotency property instead of being repeated."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._session.post.side_effect = ReadTimeout('Read timed out')
+        self.mock_jira.search_issues.return_value = {'issues': [{'key': 'TEST-6'}, {'key': 'TEST-7'}]}
+        marker = _idempotency_marker('deploy-512')
+        # TEST-6 has the same summary but was created under another key
+        self.stamped({'TEST-6': _idempotency_marker('deploy-511'), 'TEST-7': marker})
+
+        result = create_issue(project_key='TEST', summary='Flaky', idempotency_key='deploy-512')
+
+        self.mock_jira._session.post.assert_called_once()
+        body = json.loads(self.mock_jira._session.post.call_args[1]['data'])
+        self.assertEqual(body['properties'], [{'key': IDEMPOTENCY_PROPERTY, 'value': {'key': marker}}])
+        self.assertNotIn('labels', body['fields'])
+        self.assertIn('reporter = currentUser()', self.mock_jira.search_issues.call_args[1]['jql_str'])
+        self.assertEqual(result['key'], 'TEST-7')
+        self.assertTrue(result['deduplicated'])
+        # The client's own retries are restored after the create
+        self.assertEqual(self.mock_jira._session.max_retries, 3)
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_timeout_without_key_is_not_retried(self, mock_initialize_jira):
+        """Without an idempotency key nothing marks the issue, so an ambiguous failure is neither searched nor retried."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira.create_issue.side_effect = ReadTimeout('Read timed out')
+
+        with self.assertRaises(ReadTimeout):
+            create_issue(project_key='TEST', summary='Flaky')
+        self.mock_jira.create_issue.assert_called_once()
+        self.assertNotIn('labels', self.mock_jira.create_issue.call_args[1]['fields'])
+        self.mock_jira.search_issues.assert_not_called()
+
+    @patch('src.tools.issues.time.sleep')
+    @patch('src.tools.issues.initialize_jira')
+    def test_transient_error_is_retried(self, mock_initialize_jira, mock_sleep):
+        """A 503 with no issue created behind it is retried after a backoff."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira.create_issue.side_effect = [
+            JIRAError(status_code=503, text='Service Unavailable'), MagicMock(key='TEST-8')
+        ]
+
+        result = create_issue(project_key='TEST', summary='Retried')
+
+        self.assertEqual(self.mock_jira.create_issue.call_count, 2)
+        mock_sleep.assert_called_once()
+        self.assertEqual(result['key'], 'TEST-8')
+        self.assertNotIn('deduplicated', result)
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_client_error_is_not_retried(self, mock_initialize_jira):
+        """JIRA rejecting the input is not a reason to try again."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira.create_issue.side_effect = JIRAError(status_code=403, text='Forbidden')
+
+        with self.assertRaises(JIRAError):
+            create_issue(project_key='TEST', summary='Denied')
+        self.mock_jira.create_issue.assert_called_once()
+        self.mock_jira.search_issues.assert_not_called()
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_repeated_key_returns_existing_issue(self, mock_initialize_jira):
+        """A second call with the same idempotency key returns the first call's issue."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._session.post.return_value.json.return_value = {'key': 'TEST-9'}
+
+        first = create_issue(project_key='TEST', summary='Once', idempotency_key='abc')
+        second = create_issue(project_key='TEST', summary='Once', idempotency_key='abc')
+
+        self.mock_jira._session.post.assert_called_once()
+        self.assertEqual(second['key'], first['key'])
+        self.assertTrue(second['deduplicated'])
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_key_is_scoped_to_server_and_client(self, mock_initialize_jira):
+        """The same key from another account or JIRA server is another create."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._session.post.return_value.json.side_effect = [{'key': 'TEST-1'}, {'key': 'TEST-2'}, {'key': 'TEST-3'}]
+
+        with patch.dict(os.environ, {'JIRA_EMAIL': 'first@example.com'}):
+            self.assertEqual(create_issue(project_key='TEST', summary='Once', idempotency_key='abc')['key'], 'TEST-1')
+        with patch.dict(os.environ, {'JIRA_EMAIL': 'second@example.com'}):
+            other = create_issue(project_key='TEST', summary='Once', idempotency_key='abc')
+            self.assertEqual(other['key'], 'TEST-2')
+            self.assertNotIn('deduplicated', other)
+            self.mock_jira._options = {'server': 'https://other.example.com'}
+            self.assertEqual(create_issue(project_key='TEST', summary='Once', idempotency_key='abc')['key'], 'TEST-3')
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_reused_key_for_another_issue_is_rejected(self, mock_initialize_jira):
+        """A key used for another project or summary is an error rather than someone else's issue."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._session.post.return_value.json.return_value = {'key': 'TEST-9'}
+        create_issue(project_key='TEST', summary='Once', idempotency_key='abc')
+
+        with self.assertRaises(ValueError):
+            create_issue(project_key='TEST', summary='Something else', idempotency_key='abc')
+        with self.assertRaises(ValueError):
+            create_issue(project_key='OTHER', summary='Once', idempotency_key='abc')
+        self.mock_jira._session.post.assert_called_once()
+
+    @patch('src.tools.issues.CREATE_WAIT_INTERVAL', 0.01)
+    @patch('src.tools.issues.initialize_jira')
+    def test_concurrent_calls_create_once(self, mock_initialize_jira):
+        """Two calls racing with the same key create one issue; the later one waits for it."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        def post(*args, **kwargs):
+            time.sleep(0.2)
+            return MagicMock(**{'json.return_value': {'key': 'TEST-9'}})
+
+        self.mock_jira._session.post.side_effect = post
+        results = []
+        calls = [threading.Thread(target=lambda: results.append(
+            create_issue(project_key='TEST', summary='Once', idempotency_key='abc')
+        )) for _ in range(2)]
+        for call in calls:
+            call.start()
+        for call in calls:
+            call.join(5)
+
+        self.mock_jira._session.post.assert_called_once()
+        self.assertEqual([result['key'] for result in results], ['TEST-9', 'TEST-9'])
+        self.assertEqual(sorted(bool(result.get('deduplicated')) for result in results), [False, True])
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_rejected_input_frees_the_key(self, mock_initialize_jira):
+        """A call that fails before sending the create leaves the key free for a corrected retry."""
+        mock_initialize_jira.return_value = self.mock_jira
+        self.mock_jira._session.post.return_value.json.return_value = {'key': 'TEST-9'}
+
+        with self.assertRaises(ValueError):
+            create_issue(project_key='TEST', summary='Once', issue_type='Epic', idempotency_key='abc')
+        result = create_issue(project_key='TEST', summary='Once', idempotency_key='abc')
+        self.assertEqual(result['key'], 'TEST-9')
+
+class TestInterruptedCreate(unittest.TestCase):
+    """Test resuming an interrupted create against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer(state=FakeJira(projects=1, issues_per_project=3))
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        clear_all()
+        self.addCleanup(clear_all)
+
+    def test_unfinished_create_is_found_by_its_property(self):
+        """An issue created by a call that died before recording it is returned to the next call with the same key."""
+        server = initialize_jira()._options['server']
+        get_creates().begin(server, client_scope(), 'nightly-7', 'DEMO', 'Nightly report', 0)
+        # Same summary, created without a key: not the issue being looked for
+        _post_issue(initialize_jira(), {'project': {'key': 'DEMO'}, 'summary': 'Nightly report',
+                                        'issuetype': {'name': 'Task'}}, None)
+        created = _post_issue(initialize_jira(), {'project': {'key': 'DEMO'}, 'summary': 'Nightly report',
+                                                  'issuetype': {'name': 'Task'}}, _idempotency_marker('nightly-7'))
+        issues = len(self.server.state.issues)
+
+        # The call that recorded the key is gone once its lease is over
+        with patch('src.tools.issues.CREATE_LEASE_SECONDS', 0):
+            result = create_issue(project_key='DEMO', summary='Nightly report', idempotency_key='nightly-7')
+
+        self.assertEqual(result['key'], created)
+        self.assertTrue(result['deduplicated'])
+        self.assertEqual(len(self.server.state.issues), issues)
+        self.assertEqual(self.server.state.find_issue(created)['labels'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
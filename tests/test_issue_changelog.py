@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the get_issue_changelog and get_issue_changelogs tools."""
+import os
+import unittest
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer
+from src.http_hooks import RateLimiter
+from src.stores.changelogs import get_changelogs
+from src.tools.history import get_issue_changelog, get_issue_changelogs
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestIssueChangelog(unittest.TestCase):
+    """Test cases for the changelog tools against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.state = self.server.state
+
+    def change(self, key, count, field='priority'):
+        """Record `count` changes to an issue's field, as edits in JIRA would."""
+        with self.state.lock:
+            issue = self.state.issues[key]
+            for n in range(count):
+                self.state.record_change(issue, field, f'old {n}', f'new {n}')
+
+    def test_fetches_only_new_entries(self):
+        """Repeat calls request the changelog from the last cached entry on."""
+        self.change('DEMO-1', 150)
+        first = get_issue_changelog('demo-1', max_entries=10)
+        self.assertEqual(first['details']['total'], 150)
+        self.assertEqual([e['items'][0]['to'] for e in first['details']['entries']][-1], 'new 149')
+        self.assertEqual(len(first['details']['entries']), 10)
+        self.assertEqual(self.server.stats()['GET issue/{key}/changelog']['calls'], 2)
+
+        self.change('DEMO-1', 2, field='status')
+        self.server.reset_stats()
+        second = get_issue_changelog('DEMO-1', fields=['Status'])
+        self.assertEqual(second['details']['total'], 2)
+        self.assertEqual(second['details']['entries'][0]['items'][0]['field'], 'status')
+        stats = self.server.stats()
+        self.assertEqual(stats['GET issue/{key}/changelog']['calls'], 1)
+        self.assertLess(stats['GET issue/{key}/changelog']['bytes_out'], 2000)
+
+        # A changelog that no longer continues the cached one is fetched again
+        with self.state.lock:
+            del self.state.issues['DEMO-1']['changelog'][-1]
+        self.assertEqual(get_issue_changelog('DEMO-1')['details']['total'], 151)
+
+    def test_batch_skips_unchanged_issues(self):
+        """The batched variant fetches only the changelogs of issues updated since they were cached."""
+        self.change('DEMO-1', 3)
+        self.change('DEMO-2', 1)
+        first = get_issue_changelogs(['DEMO-1', 'DEMO-2', 'DEMO-3', 'NOPE-1'])
+        self.assertEqual(first['details']['not_found'], ['NOPE-1'])
+        self.assertEqual([c['total'] for c in first['details']['changelogs']], [3, 1, 0])
+
+        self.change('DEMO-2', 1)
+        self.server.reset_stats()
+        second = get_issue_changelogs(['DEMO-1', 'DEMO-2', 'DEMO-3'])
+        self.assertEqual([c['total'] for c in second['details']['changelogs']], [3, 2, 0])
+        stats = self.server.stats()
+        self.assertEqual(stats['GET issue/{key}/changelog']['calls'], 1)
+        self.assertEqual(len(stats), 2)
+
+        server = self.server.url
+        self.assertEqual(get_changelogs().head(server, 'DEMO-2')['entries'], 2)
+
+    def test_rejects_malformed_keys(self):
+        """Keys not shaped like issue keys are reported, or refused for a single issue, without reaching the JQL."""
+        with self.assertRaises(ValueError):
+            get_issue_changelog('DEMO-1) OR (project = SECRET')
+
+        self.server.reset_stats()
+        result = get_issue_changelogs(['DEMO-1', 'DEMO-1 OR key != X'])
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual([c['key'] for c in result['details']['changelogs']], ['DEMO-1'])
+        self.assertEqual(result['details']['errors'], {'DEMO-1 OR KEY != X': 'Not a valid issue key'})
+        self.assertEqual(result['details']['not_found'], [])
+
+        result = get_issue_changelogs(['project = SECRET'])
+        self.assertEqual(result['details']['changelogs'], [])
+        self.assertEqual(list(result['details']['errors']), ['PROJECT = SECRET'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test the get_issue_graph tool."""
+import os
+import unittest
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer
+from src.http_hooks import RateLimiter
+from src.tools.graph import get_issue_graph
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestIssueGraph(unittest.TestCase):
+    """Test cases for get_issue_graph against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.state = self.server.state
+
+        # An epic with 30 stories of 9 sub-tasks each
+        self.epic = self.state.add_issue('DEMO', summary='Checkout', issue_type='Epic')['key']
+        self.stories = []
+        for n in range(30):
+            story = self.state.add_issue('DEMO', summary=f'Story {n}', issue_type='Story', parent=self.epic)['key']
+            self.stories.append(story)
+            for m in range(9):
+                self.state.add_issue('DEMO', summary=f'Sub-task {m}', issue_type='Sub-task', parent=story)
+
+    def test_tree_in_few_requests(self):
+        """A 300-issue tree takes a handful of searches per level instead of one request per issue."""
+        self.server.reset_stats()
+        details = get_issue_graph(self.epic, depth=2)['details']
+        self.assertEqual(len(details['nodes']), 1 + 30 + 270)
+        self.assertEqual(details['nodes'][self.stories[0]]['level'], 1)
+        self.assertEqual(len(details['edges'][self.epic]), 30)
+        self.assertEqual(details['edges'][self.stories[0]][0][1], 'parent of')
+        self.assertFalse(details['truncated'])
+        # The root, one page of stories, three pages of sub-tasks
+        self.assertEqual(self.server.stats()['GET search']['calls'], 5)
+
+        shallow = get_issue_graph(self.epic, depth=1, max_nodes=10)['details']
+        self.assertEqual(len(shallow['nodes']), 10)
+        self.assertTrue(shallow['truncated'])
+
+    def test_links_and_link_types(self):
+        """Linked issues are followed once, optionally only for some link types."""
+        self.state.link_issues(self.stories[0], 'DEMO-1')
+        self.state.link_issues('DEMO-2', self.stories[1], link_type='Relates', outward='relates to',
+                               inward='relates to')
+        self.state.link_issues('DEMO-1', 'DEMO-3')
+
+        details = get_issue_graph(self.epic, depth=2)['details']
+        self.assertEqual(details['nodes']['DEMO-1']['level'], 2)
+        self.assertIn(['DEMO-1', 'blocks'], details['edges'][self.stories[0]])
+        self.assertIn([self.stories[1], 'relates to'], details['edges']['DEMO-2'])
+        # DEMO-3 is three levels away
+        self.assertNotIn('DEMO-3', details['nodes'])
+
+        blocks = get_issue_graph(self.epic, depth=3, link_types=['Blocks'])['details']
+        self.assertIn('DEMO-3', blocks['nodes'])
+        self.assertNotIn('DEMO-2', blocks['nodes'])
+
+        with self.assertRaises(ValueError):
+            get_issue_graph('DEMO-9999')
+
+    def test_malformed_key_is_rejected(self):
+        """The root key goes into JQL, so anything not shaped like a key is refused before searching."""
+        self.server.reset_stats()
+        with self.assertRaises(ValueError):
+            get_issue_graph('X-1) OR project is not EMPTY ORDER BY (key')
+        self.assertNotIn('GET search', self.server.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
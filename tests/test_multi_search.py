@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Test the multi_search tool."""
+import os
+import unittest
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer
+from src.http_hooks import RateLimiter
+from src.tools.issues import multi_search
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestMultiSearch(unittest.TestCase):
+    """Test cases for multi_search against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer(latency=0.2)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+
+    def test_named_queries_share_issues(self):
+        """Queries run concurrently; an issue matched by several queries is returned once with all their fields."""
+        result = multi_search([
+            {'name': 'open', 'jql': 'project = DEMO AND status = "To Do"', 'fields': 'summary', 'max_results': 50},
+            {'name': 'bugs', 'jql': 'project = DEMO AND type = Bug', 'fields': 'status,priority', 'max_results': 50},
+            {'name': 'broken', 'jql': 'project = DEMO', 'fields': 'No Such Field'},
+        ])
+        self.assertEqual(result['status'], 'partial')
+        queries = result['details']['queries']
+        self.assertIn('No Such Field', queries['broken']['error'])
+
+        both = set(queries['open']['keys']) & set(queries['bugs']['keys'])
+        self.assertTrue(both)
+        issues = result['details']['issues']
+        self.assertEqual(len(issues), len(set(queries['open']['keys']) | set(queries['bugs']['keys'])))
+        shared = issues[sorted(both)[0]]
+        self.assertEqual(shared['status'], 'To Do')
+        self.assertIn('summary', shared)
+        self.assertIn('priority', shared)
+        self.assertGreaterEqual(self.server.peak_in_flight, 2)
+
+        with self.assertRaises(ValueError):
+            multi_search([{'name': 'a', 'jql': 'project = DEMO'}, {'name': 'a', 'jql': 'project = PRJ1'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
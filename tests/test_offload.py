@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test running tools on the worker pool with per-tool concurrency limits."""
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import logging
+from src.deadline import DeadlineExceeded, current_budget, with_deadline
+from src.metrics import registry
+from src.offload import ToolBusy, ToolSlots, offload_tool
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestOffload(unittest.TestCase):
+    """Test cases for offload_tool and ToolSlots."""
+
+    def setUp(self):
+        registry.reset()
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def make_tool(self, name, seconds=0.1):
+        """A blocking tool that records how many of its calls run at once."""
+        def slow_tool(value: int = 0):
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(seconds)
+            with self.lock:
+                self.running -= 1
+            return value
+        return offload_tool(with_deadline(slow_tool, name), name)
+
+    def test_concurrency_limit_and_queue_wait(self):
+        """Calls beyond the tool's limit wait their turn; waiting is recorded apart from execution."""
+        with patch.dict(os.environ, {'JIRA_MCP_TOOL_CONCURRENCY': 'limited_probe=2'}):
+            tool = self.make_tool('limited_probe')
+
+            async def main():
+                ticks = 0
+
+                async def ticker():
+                    nonlocal ticks
+                    while self.running or ticks == 0:
+                        ticks += 1
+                        await asyncio.sleep(0.01)
+
+                results = await asyncio.gather(*(tool(value=n) for n in range(6)), ticker())
+                return results[:6], ticks
+
+            results, ticks = asyncio.run(main())
+
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(self.peak, 2)
+        # The event loop kept running while the tools slept
+        self.assertGreater(ticks, 10)
+
+        stats = registry.snapshot()['tools']['limited_probe']
+        self.assertEqual(stats['queue_wait']['count'], 6)
+        self.assertGreater(stats['queue_wait']['p95_ms'], 50)
+
+    def test_full_queue_and_deadline(self):
+        """A call is turned away when the queue is full, and gives up waiting at its deadline."""
+        with patch.dict(os.environ, {'JIRA_MCP_TOOL_CONCURRENCY': 'busy_probe=1'}):
+            tool = self.make_tool('busy_probe', seconds=0.3)
+
+            async def main():
+                first = asyncio.ensure_future(tool())
+                await asyncio.sleep(0.05)
+                with self.assertRaises(DeadlineExceeded):
+                    await tool(timeout_seconds=0.1)
+                await first
+
+            asyncio.run(main())
+
+            slots = ToolSlots('queue_probe', limit=1, max_queued=1)
+
+            async def fill():
+                await slots.acquire(1)
+                waiting = asyncio.ensure_future(slots.acquire(1))
+                await asyncio.sleep(0.01)
+                with self.assertRaises(ToolBusy):
+                    await slots.acquire(1)
+                slots.release()
+                await waiting
+                slots.release()
+                self.assertEqual((slots.running, slots.queued), (0, 0))
+
+            asyncio.run(fill())
+
+    def test_cancel_running_call(self):
+        """Cancelling the coroutine cancels the call's budget; the slot is freed when the thread returns."""
+        budgets = []
+        released = threading.Event()
+
+        def blocking_tool():
+            budgets.append(current_budget())
+            while not budgets[0].cancelled:
+                time.sleep(0.01)
+            released.set()
+
+        tool = offload_tool(with_deadline(blocking_tool, 'cancel_probe'), 'cancel_probe')
+
+        async def main():
+            task = asyncio.ensure_future(tool())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.assertTrue(released.wait(1))
+        self.assertEqual(budgets[0].tool, 'cancel_probe')
+
+
+if __name__ == '__main__':
+    unittest.main()
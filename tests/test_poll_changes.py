@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Test the poll_changes tool."""
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+import logging
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from benchmarks.fake_jira import FakeJiraServer
+from src.http_hooks import RateLimiter
+from src.tools.polling import poll_changes
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+JQL = 'project = DEMO AND status != Done ORDER BY key'
+
+class Session:
+    """Stands in for the MCP session of one connected client."""
+
+class TestPollChanges(unittest.TestCase):
+    """Test cases for poll_changes against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.state = self.server.state
+
+    def open_keys(self):
+        with self.state.lock:
+            return sorted(key for key, issue in self.state.issues.items()
+                          if issue['project'] == 'DEMO' and issue['status'] != 'Done')
+
+    def touch(self, key, **changes):
+        """Change an issue the way an edit in JIRA would, bumping its updated time."""
+        with self.state.lock:
+            self.state.issues[key].update(changes, updated=datetime.now(timezone.utc))
+
+    def test_added_changed_and_removed(self):
+        """Later polls report only what changed, fetching only recently updated issues."""
+        first = poll_changes('board', JQL)
+        self.assertTrue(first['details']['baseline'])
+        self.assertEqual(first['details']['added'], self.open_keys())
+
+        edited, finished = self.open_keys()[:2]
+        self.touch(edited, summary='Edited')
+        self.touch(finished, status='Done')
+        created = self.state.add_issue('DEMO', summary='New work')['key']
+
+        self.server.reset_stats()
+        second = poll_changes('board', JQL)
+        details = second['details']
+        self.assertFalse(details['baseline'])
+        self.assertEqual(details['added'], [created])
+        self.assertEqual(details['changed'], [edited])
+        self.assertEqual(details['removed'], [finished])
+        self.assertEqual(details['matching'], len(self.open_keys()))
+        # One search for recent updates, one for the total and one to find the issue that left
+        self.assertEqual(self.server.stats()['GET search']['calls'], 3)
+
+        # Nothing changed: the overlap window sees the same issues again but reports nothing
+        third = poll_changes('board', JQL)
+        self.assertEqual((third['details']['added'], third['details']['changed'], third['details']['removed']),
+                         ([], [], []))
+
+    def test_watermark_persists_and_resets(self):
+        """Watermarks are kept per name and start over when the query changes or on reset."""
+        poll_changes('board', JQL)
+        self.assertFalse(poll_changes('board', JQL)['details']['baseline'])
+        self.assertTrue(poll_changes('other', JQL)['details']['baseline'])
+        self.assertTrue(poll_changes('board', 'project = DEMO')['details']['baseline'])
+        self.assertTrue(poll_changes('board', 'project = DEMO', reset=True)['details']['baseline'])
+
+        with self.state.lock:
+            deleted = next(key for key in self.state.issues if key.startswith('DEMO-'))
+            del self.state.issues[deleted]
+        self.assertEqual(poll_changes('board', 'project = DEMO')['details']['removed'], [deleted])
+
+    @patch('src.sessions._isolated', True)
+    def test_watermarks_are_per_session(self):
+        """Clients of a shared server polling the same name each see every change."""
+        first, second = Session(), Session()
+
+        def as_client(session):
+            token = request_ctx.set(RequestContext(1, None, session, None))
+            try:
+                return poll_changes('board', JQL)['details']
+            finally:
+                request_ctx.reset(token)
+
+        self.assertTrue(as_client(first)['baseline'])
+        self.assertTrue(as_client(second)['baseline'])
+
+        edited = self.open_keys()[0]
+        self.touch(edited, summary='Edited')
+        self.assertEqual(as_client(first)['changed'], [edited])
+        # The first client's poll did not advance the second client's watermark
+        self.assertEqual(as_client(second)['changed'], [edited])
+        self.assertEqual(as_client(first)['changed'], [])
+
+    def test_watermarks_are_per_account(self):
+        """Without sessions, watermarks are kept per JIRA account."""
+        poll_changes('board', JQL)
+        with patch.dict(os.environ, {'JIRA_EMAIL': 'other@example.com'}):
+            self.assertTrue(poll_changes('board', JQL)['details']['baseline'])
+        self.assertFalse(poll_changes('board', JQL)['details']['baseline'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test opt-in profiling of tool calls."""
+import os
+import pstats
+import tempfile
+import time
+import unittest
+import logging
+from unittest.mock import patch
+from src.profiling import classify, profile_tool
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+def sample_tool(issue_key: str) -> dict:
+    """Tool doing a little work so the profiler has something to record."""
+    time.sleep(0.03)
+    return {'key': issue_key, 'total': sum(range(1000))}
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for profile_tool."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _env(self, **values):
+        env = {'JIRA_MCP_PROFILE_DIR': self.directory.name}
+        env.update(values)
+        return patch.dict(os.environ, env)
+
+    def test_disabled_by_default(self):
+        """Without JIRA_MCP_PROFILE the result is unchanged and no file is written."""
+        with self._env(JIRA_MCP_PROFILE=''):
+            result = profile_tool(sample_tool, 'sample_tool')('TEST-1')
+
+        self.assertNotIn('_meta', result)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_only_selected_tools_are_profiled(self):
+        """A comma-separated list only profiles the named tools."""
+        with self._env(JIRA_MCP_PROFILE='other_tool, search_issues'):
+            result = profile_tool(sample_tool, 'sample_tool')('TEST-1')
+
+        self.assertNotIn('_meta', result)
+
+    def test_deterministic_profile(self):
+        """cProfile output is written as pstats and summarized in _meta.profile."""
+        with self._env(JIRA_MCP_PROFILE='sample_tool'):
+            result = profile_tool(sample_tool, 'sample_tool')('TEST-1')
+
+        self.assertEqual(result['key'], 'TEST-1')
+        profile = result['_meta']['profile']
+        self.assertEqual(profile['mode'], 'deterministic')
+        self.assertTrue(os.path.basename(profile['path']).startswith('sample_tool-'))
+        self.assertTrue(profile['path'].endswith('.prof'))
+        self.assertEqual(set(profile['spans_ms']), {'network', 'decode', 'format', 'other'})
+        self.assertGreaterEqual(profile['total_ms'], 30)
+
+        # The file is a valid pstats dump containing the tool function
+        stats = pstats.Stats(profile['path'])
+        self.assertTrue(any(name == 'sample_tool' for (_, _, name) in stats.stats))
+
+    def test_sampling_profile(self):
+        """Sampling mode writes collapsed stacks."""
+        with self._env(JIRA_MCP_PROFILE='all', JIRA_MCP_PROFILE_MODE='sampling'):
+            result = profile_tool(sample_tool, 'sample_tool')('TEST-1')
+
+        profile = result['_meta']['profile']
+        self.assertEqual(profile['mode'], 'sampling')
+        self.assertTrue(profile['path'].endswith('.folded'))
+        with open(profile['path']) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(any('sample_tool' in line for line in lines))
+        self.assertAlmostEqual(sum(profile['spans_ms'].values()), profile['total_ms'], delta=1)
+
+    def test_classify(self):
+        """Source files are attributed to network, decode and format spans."""
+        self.assertEqual(classify('/usr/lib/python3/socket.py'), 'network')
+        self.assertEqual(classify('/site-packages/urllib3/response.py'), 'network')
+        self.assertEqual(classify('/usr/lib/python3/json/decoder.py'), 'decode')
+        self.assertEqual(classify('/site-packages/jira/resources.py'), 'decode')
+        self.assertEqual(classify('/root/package/src/tools/issues.py'), 'format')
+        self.assertEqual(classify('/usr/lib/python3/threading.py'), 'other')
+
+
+if __name__ == '__main__':
+    unittest.main()
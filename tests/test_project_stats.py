@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test list_projects with include_stats."""
+import os
+import unittest
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJira, FakeJiraServer
+from src.cache import clear_all
+from src.http_hooks import RateLimiter
+from src.tools.projects import list_projects
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestProjectStats(unittest.TestCase):
+    """Test cases for project issue counts against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer(state=FakeJira(projects=12, issues_per_project=4))
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        clear_all()
+        self.addCleanup(clear_all)
+        self.state = self.server.state
+
+    def expected(self, project_key):
+        issues = [issue for issue in self.state.issues.values() if issue['project'] == project_key]
+        return {
+            'open': sum(issue['status'] != 'Done' for issue in issues),
+            'in_progress': sum(issue['status'] in ('In Progress', 'In Review') for issue in issues),
+        }
+
+    def test_counts_without_fetching_issues(self):
+        """Counts come from concurrent count-only searches and are reused while cached."""
+        self.server.reset_stats()
+        projects = list_projects(limit=12, include_stats=True)
+        self.assertEqual(len(projects), 12)
+        for project in projects:
+            self.assertEqual(project['stats'], self.expected(project['key']))
+        search = self.server.stats()['GET search']
+        self.assertEqual(search['calls'], 24)
+        # No issue is transferred, only totals
+        self.assertLess(search['bytes_out'], 24 * 200)
+
+        self.server.reset_stats()
+        list_projects(limit=12, include_stats=True)
+        self.assertNotIn('GET search', self.server.stats())
+
+        # Without include_stats the projects are unchanged
+        self.assertNotIn('stats', list_projects(limit=3)[0])
+
+    def test_failed_counts_are_reported_per_project(self):
+        """A project whose counts fail gets an error instead of failing the whole list."""
+        key = list_projects(limit=1)[0]['key']
+        with patch('src.tools.projects.PROJECT_STATS', {'open': 'status = ('}):
+            projects = list_projects(limit=2, include_stats=True)
+        self.assertIn('error', projects[0]['stats'])
+        self.assertEqual(projects[0]['key'], key)
+
+
+if __name__ == '__main__':
+    unittest.main()
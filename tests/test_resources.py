@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Test the issue and view resources and their subscriptions."""
+import asyncio
+import json
+import os
+import unittest
+from unittest.mock import patch
+import logging
+import anyio
+from fastmcp import FastMCP
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+from benchmarks.fake_jira import FakeJira, FakeJiraServer
+from src.cache import clear_all
+from src.http_hooks import RateLimiter
+from src.resources import ChangePoller, read_resource, register_resources
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+VIEWS = json.dumps({'demo-todo': 'project = DEMO AND status = "To Do" ORDER BY key'})
+
+class Subscriber:
+    """Stands in for an MCP session."""
+
+    def __init__(self, name):
+        self.name = name
+
+class TestResources(unittest.TestCase):
+    """Test cases for resources and subscriptions against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer(state=FakeJira(projects=2, issues_per_project=75))
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token',
+            'JIRA_MCP_VIEWS': VIEWS
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        clear_all()
+        self.addCleanup(clear_all)
+        self.state = self.server.state
+
+    def touch(self, key):
+        issue = self.state.find_issue(key)
+        self.state.record_change(issue, 'summary', issue['summary'], issue['summary'] + ' (edited)')
+
+    def test_reads_are_cached(self):
+        """Issues and views are read once and then served from the cache."""
+        issue = json.loads(read_resource('jira://issue/demo-1'))
+        self.assertEqual(issue['details']['key'], 'DEMO-1')
+        view = json.loads(read_resource('jira://search/demo-todo'))
+        self.assertEqual(view['view'], 'demo-todo')
+        self.assertTrue(all(found['status'] == 'To Do' for found in view['issues']))
+
+        self.server.reset_stats()
+        read_resource('jira://issue/demo-1')
+        read_resource('jira://search/demo-todo')
+        self.assertEqual(self.server.total_calls(), 0)
+
+        for uri in ('jira://search/unknown', 'jira://issue/DEMO-1) OR (key', 'https://issue/DEMO-1'):
+            with self.assertRaises(ValueError):
+                read_resource(uri)
+
+    def test_one_poll_for_all_subscribers(self):
+        """Every subscribed key is checked in a few batched searches, however many clients watch them."""
+        keys = sorted(self.state.issues)
+        poller = ChangePoller()
+        received = []
+        subscribers = [Subscriber('first'), Subscriber('second')]
+        for subscriber in subscribers:
+            for key in keys:
+                poller.subscribe(subscriber, f'jira://issue/{key}', lambda s, uri: received.append((s.name, uri)))
+            poller.subscribe(subscriber, 'jira://search/demo-todo', lambda s, uri: received.append((s.name, uri)))
+
+        # The first round takes the baseline
+        self.assertEqual(poller.poll_once(), [])
+        self.assertEqual(received, [])
+
+        todo = next(key for key in keys if key.startswith('DEMO') and self.state.issues[key]['status'] == 'To Do')
+        self.touch(todo)
+        self.server.reset_stats()
+        changed = poller.poll_once()
+        self.assertEqual(changed, ['jira://issue/' + todo, 'jira://search/demo-todo'])
+        self.assertEqual(sorted(received), sorted(
+            (subscriber.name, uri) for subscriber in subscribers for uri in changed
+        ))
+        # Two `key in (...)` searches for 150 issues, two for the view
+        self.assertEqual(self.server.stats()['GET search']['calls'], 4)
+
+        received.clear()
+        self.assertEqual(poller.poll_once(), [])
+        poller.unsubscribe(subscribers[0], 'jira://issue/' + todo)
+        self.touch(todo)
+        poller.poll_once()
+        self.assertIn(('second', 'jira://issue/' + todo), received)
+        self.assertNotIn(('first', 'jira://issue/' + todo), received)
+
+        # Departed subscribers are not polled for
+        del subscriber
+        subscribers.clear()
+        self.server.reset_stats()
+        self.assertEqual(poller.poll_once(), [])
+        self.assertEqual(self.server.total_calls(), 0)
+
+    def test_client_is_notified(self):
+        """A subscribed MCP client gets a resource updated notification once the issue changes."""
+        poller = ChangePoller()
+        poller.start = lambda: None
+        app = FastMCP(name='jira-tools')
+        register_resources(app)
+
+        async def main():
+            async with create_connected_server_and_client_session(app._mcp_server) as client:
+                uri = AnyUrl('jira://issue/DEMO-2')
+                read = await client.read_resource(uri)
+                self.assertEqual(json.loads(read.contents[0].text)['details']['key'], 'DEMO-2')
+                await client.subscribe_resource(uri)
+
+                self.touch('DEMO-2')
+                self.assertEqual(await asyncio.to_thread(poller.poll_once), ['jira://issue/DEMO-2'])
+                with anyio.fail_after(5):
+                    message = await client.incoming_messages.receive()
+                self.assertIsInstance(message.root, types.ResourceUpdatedNotification)
+                self.assertEqual(str(message.root.params.uri), 'jira://issue/DEMO-2')
+
+        with patch('src.resources._poller', poller):
+            asyncio.run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
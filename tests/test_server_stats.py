@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test the metrics registry and the server_stats tool."""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import logging
+import requests
+from requests.adapters import BaseAdapter
+from src.http_hooks import instrument_session, normalize_endpoint
+from src.metrics import instrument_tool, registry
+from src.tools.stats import server_stats
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class StubAdapter(BaseAdapter):
+    """Transport adapter answering every request with a canned response."""
+    
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+    
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0) if self.statuses else 200
+        response._content = b'{"ok": true}'
+        response.request = request
+        response.url = request.url
+        return response
+    
+    def close(self):
+        pass
+
+class TestServerStats(unittest.TestCase):
+    """Test cases for the metrics registry, HTTP hooks and server_stats."""
+    
+    def setUp(self):
+        """Start every test from an empty registry."""
+        registry.reset()
+        self.session = requests.Session()
+        self.session.mount('https://', StubAdapter([200, 429, 200]))
+        instrument_session(self.session)
+
+    def test_normalize_endpoint(self):
+        """Issue keys, ids and project keys are replaced by placeholders."""
+        self.assertEqual(
+            normalize_endpoint('get', 'https://x.atlassian.net/rest/api/2/issue/PROJ-12/transitions?expand=x'),
+            'GET issue/{key}/transitions'
+        )
+        self.assertEqual(
+            normalize_endpoint('GET', 'https://x.atlassian.net/rest/api/2/issue/10001/comment/20001'),
+            'GET issue/{id}/comment/{id}'
+        )
+        self.assertEqual(normalize_endpoint('GET', 'https://x/rest/api/2/project/DEMO'), 'GET project/{key}')
+
+    def test_tool_and_http_metrics(self):
+        """A tool call records its latency and the JIRA time of its HTTP requests."""
+        def fake_tool(issue_key: str) -> dict:
+            self.session.get(f'https://jira.example.com/rest/api/2/issue/{issue_key}')
+            self.session.get(f'https://jira.example.com/rest/api/2/issue/{issue_key}')
+            return {'key': issue_key}
+        
+        wrapped = instrument_tool(fake_tool, 'fake_tool')
+        self.assertEqual(wrapped('TEST-1'), {'key': 'TEST-1'})
+        
+        result = server_stats()
+        self.assertEqual(result['status'], 'success')
+        details = result['details']
+        
+        tool = details['tools']['fake_tool']
+        self.assertEqual(tool['count'], 1)
+        self.assertEqual(tool['errors'], 0)
+        self.assertEqual(tool['jira_calls'], 2)
+        
+        endpoint = details['http']['endpoints']['GET issue/{key}']
+        self.assertEqual(endpoint['count'], 2)
+        self.assertEqual(endpoint['rate_limited'], 1)
+        self.assertEqual(endpoint['statuses'], {'200': 1, '429': 1})
+        self.assertEqual(details['http']['rate_limited'], 1)
+
+    def test_tool_errors_and_cache_ratio(self):
+        """Failed calls are counted as errors and cache lookups produce a hit ratio."""
+        def failing_tool():
+            raise ValueError("boom")
+        
+        with self.assertRaises(ValueError):
+            instrument_tool(failing_tool, 'failing_tool')()
+        
+        registry.record_cache('issues', hit=True)
+        registry.record_cache('issues', hit=True)
+        registry.record_cache('issues', hit=False)
+        
+        details = server_stats(reset=True)['details']
+        self.assertEqual(details['tools']['failing_tool']['errors'], 1)
+        self.assertAlmostEqual(details['caches']['issues']['hit_ratio'], 0.667)
+        
+        # reset=True clears the registry after reading
+        self.assertEqual(server_stats()['details']['tools'], {})
+
+    def test_prometheus_export(self):
+        """The configured metrics file is rewritten in the Prometheus text format; callers cannot pick a path."""
+        instrument_tool(lambda: None, 'noop')()
+        with self.assertRaises(TypeError):
+            server_stats(export_path='/tmp/elsewhere.prom')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics.prom')
+            with patch.dict(os.environ, {'JIRA_MCP_METRICS_FILE': path}):
+                server_stats()
+            with open(path) as f:
+                text = f.read()
+        
+        self.assertIn('# TYPE jira_mcp_tool_duration_seconds histogram', text)
+        self.assertIn('jira_mcp_tool_duration_seconds_count{tool="noop"} 1', text)
+        self.assertIn('le="+Inf"', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
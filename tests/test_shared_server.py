@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Test sharing one JIRA client between calls and isolating the state of MCP clients."""
+import os
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from benchmarks.fake_jira import FakeJiraServer
+from src.http_hooks import RateLimiter, single_attempt
+from src.main import initialize_jira
+from src.tools.issues import add_comment
+from src.tools.stats import write_status
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class Session:
+    """Stands in for the MCP session of one connected client."""
+
+
+class TestSharedServer(unittest.TestCase):
+    """Test cases for the shared JIRA client and per-session state."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+
+    def test_client_is_shared(self):
+        """Every call gets the same client, checked against the server once."""
+        jira = initialize_jira()
+        self.assertIs(initialize_jira(), jira)
+        self.assertEqual(self.server.stats()['GET serverInfo']['calls'], 1)
+        self.assertTrue(jira._is_cloud)
+
+    def test_single_attempt_is_per_call(self):
+        """Turning the client's retries off in one call leaves other calls' retries alone."""
+        jira = initialize_jira()
+        retries = jira._session.max_retries
+        seen = []
+
+        with single_attempt():
+            self.assertEqual(jira._session.max_retries, 0)
+            other = threading.Thread(target=lambda: seen.append(jira._session.max_retries))
+            other.start()
+            other.join()
+
+        self.assertEqual(seen, [retries])
+        self.assertEqual(jira._session.max_retries, retries)
+
+    @patch('src.sessions._isolated', True)
+    def test_write_status_is_per_session(self):
+        """With several clients, write_status only lists the writes of the calling client."""
+        first, second = Session(), Session()
+
+        def as_client(session, fn, *args, **kwargs):
+            token = request_ctx.set(RequestContext(1, None, session, None))
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                request_ctx.reset(token)
+
+        with patch('src.journal._worker', MagicMock()):
+            receipt = as_client(first, add_comment, 'DEMO-1', 'Deployed', deferred=True)['details']['receipt']
+            as_client(second, add_comment, 'DEMO-2', 'Rolled back', deferred=True)
+
+            mine = as_client(first, write_status)
+            self.assertEqual(mine['details']['counts']['pending'], 1)
+            self.assertEqual([item['receipt'] for item in mine['details']['items']], [receipt])
+            self.assertEqual(as_client(second, write_status)['details']['items'][0]['issue_key'], 'DEMO-2')
+
+            # A receipt can still be looked up by whoever holds it
+            self.assertEqual(as_client(second, write_status, receipt=receipt)['details']['issue_key'], 'DEMO-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Test tracing spans around tool calls and JIRA HTTP requests."""
+import logging
+import os
+import tempfile
+import unittest
+import requests
+from requests.adapters import BaseAdapter
+from src.http_hooks import instrument_session
+from src.tracing import (
+    FileSpanExporter, install_log_correlation, load_spans, set_exporter,
+    summarize, trace_tool
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class StubAdapter(BaseAdapter):
+    """Transport adapter answering every request with a canned response."""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0) if self.statuses else 200
+        response._content = b'{"ok": true}'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+class CapturingHandler(logging.Handler):
+    """Logging handler keeping every record it receives."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+class TestTracing(unittest.TestCase):
+    """Test cases for trace_tool, HTTP child spans and the file exporter."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'spans.jsonl')
+        set_exporter(FileSpanExporter(self.path))
+        self.addCleanup(set_exporter, None)
+
+        self.session = requests.Session()
+        self.session.mount('https://', StubAdapter([200, 404]))
+        instrument_session(self.session)
+
+    def test_tool_and_http_spans(self):
+        """A tool call produces a root span with one child span per HTTP request."""
+        def fake_tool(issue_key: str) -> dict:
+            self.session.get(f'https://jira.example.com/rest/api/2/issue/{issue_key}')
+            self.session.post(f'https://jira.example.com/rest/api/2/issue/{issue_key}/comment', data='{"body": "x"}')
+            return {'key': issue_key}
+
+        result = trace_tool(fake_tool, 'fake_tool')(issue_key='TEST-1')
+
+        spans = load_spans([self.path])
+        self.assertEqual(len(spans), 3)
+        root = [s for s in spans if s['kind'] == 'tool'][0]
+        children = [s for s in spans if s['kind'] == 'http']
+
+        self.assertEqual(root['name'], 'fake_tool')
+        self.assertIsNone(root['parent_id'])
+        self.assertEqual(root['attributes']['arguments'], ['issue_key'])
+        self.assertEqual(result['_meta']['trace_id'], root['trace_id'])
+
+        self.assertEqual([c['name'] for c in children], ['GET issue/{key}', 'POST issue/{key}/comment'])
+        for child in children:
+            self.assertEqual(child['trace_id'], root['trace_id'])
+            self.assertEqual(child['parent_id'], root['span_id'])
+        self.assertEqual(children[0]['attributes']['http.status'], 200)
+        self.assertEqual(children[1]['attributes']['http.status'], 404)
+        self.assertEqual(children[1]['attributes']['http.bytes_sent'], 13)
+        self.assertEqual(children[1]['status'], 'error')
+
+        summary = summarize(spans)
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]['tool'], 'fake_tool')
+        self.assertEqual(len(summary[0]['steps']), 2)
+
+    def test_error_span(self):
+        """Exceptions mark the tool span as failed and are re-raised."""
+        def failing_tool():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            trace_tool(failing_tool, 'failing_tool')()
+
+        span = load_spans([self.path])[0]
+        self.assertEqual(span['status'], 'error')
+        self.assertIn('boom', span['attributes']['error'])
+
+    def test_requests_outside_tools_are_not_traced(self):
+        """HTTP requests made outside a tool call produce no spans."""
+        self.session.get('https://jira.example.com/rest/api/2/serverInfo')
+        self.assertEqual(load_spans([self.path]), [])
+
+    def test_trace_id_in_logs(self):
+        """Log records emitted during a tool call carry its trace id."""
+        install_log_correlation()
+        handler = CapturingHandler()
+        tool_logger = logging.getLogger('tests.tracing.tool')
+        tool_logger.setLevel(logging.INFO)
+        tool_logger.addHandler(handler)
+        self.addCleanup(tool_logger.removeHandler, handler)
+
+        def logging_tool() -> dict:
+            tool_logger.info("inside tool")
+            return {}
+
+        result = trace_tool(logging_tool, 'logging_tool')()
+        tool_logger.info("outside tool")
+
+        self.assertEqual(handler.records[0].trace_id, result['_meta']['trace_id'])
+        self.assertEqual(handler.records[1].trace_id, '-')
+
+    def test_rotation(self):
+        """The span file is rotated once it reaches its size limit."""
+        set_exporter(FileSpanExporter(self.path, max_bytes=2000, backup_count=2))
+        tool = trace_tool(lambda: {}, 'noop')
+        for _ in range(30):
+            tool()
+
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test multi-hop transitions over the cached workflow graph."""
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from jira.exceptions import JIRAError
+from src.tools.issues import transition_issue
+from src.workflow import WorkflowGraph
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+# Backlog -> Selected -> In Progress -> Done, with Done -> Backlog
+WORKFLOW = {
+    'Backlog': [('11', 'Select', 'Selected')],
+    'Selected': [('21', 'Start', 'In Progress'), ('12', 'Deselect', 'Backlog')],
+    'In Progress': [('31', 'Finish', 'Done')],
+    'Done': [('41', 'Reopen', 'Backlog')]
+}
+
+# Issues of the same type found by the discovery search, one per status
+SAMPLE_ISSUES = {'TEST-2': 'Selected', 'TEST-3': 'In Progress', 'TEST-4': 'Done'}
+
+def transitions_for(status):
+    """Build a transitions response for a status."""
+    return [{'id': tid, 'name': name, 'to': {'name': to}} for tid, name, to in WORKFLOW[status]]
+
+class TestWorkflow(unittest.TestCase):
+    """Test cases for the workflow graph and multi_hop in transition_issue."""
+
+    def setUp(self):
+        self.mock_issue = MagicMock()
+        self.mock_issue.key = 'TEST-1'
+        self.mock_issue.fields.status.name = 'Backlog'
+        self.mock_issue.fields.project.key = 'TEST'
+        self.mock_issue.fields.issuetype.name = 'Task'
+
+        self.mock_jira = MagicMock()
+        self.mock_jira._options = {'server': 'https://jira.example.com'}
+        self.mock_jira.issue.return_value = self.mock_issue
+        self.mock_jira.transitions.side_effect = lambda issue: transitions_for(
+            'Backlog' if issue is self.mock_issue else SAMPLE_ISSUES[issue]
+        )
+        self.mock_jira.search_issues.return_value = {'issues': [
+            {'key': key, 'fields': {'status': {'name': status}}} for key, status in SAMPLE_ISSUES.items()
+        ]}
+
+    def test_shortest_path(self):
+        """BFS finds the path with the fewest transitions over learned edges."""
+        graph = WorkflowGraph('TEST', 'Task')
+        for status in WORKFLOW:
+            graph.learn(status, transitions_for(status))
+
+        path = graph.shortest_path('backlog', 'DONE')
+        self.assertEqual([step['id'] for step in path], ['11', '21', '31'])
+        self.assertEqual(graph.shortest_path('Done', 'Done'), [])
+        self.assertIsNone(graph.shortest_path('Backlog', 'Unknown'))
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_direct_transition_required_by_default(self, mock_initialize_jira):
+        """Without multi_hop a status that is not directly reachable is still an error."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        with self.assertRaises(ValueError) as context:
+            transition_issue('TEST-1', 'Done')
+        self.assertIn('multi_hop=True', str(context.exception))
+        self.mock_jira.transition_issue.assert_not_called()
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_multi_hop_discovers_and_caches_workflow(self, mock_initialize_jira):
+        """The first call discovers the workflow read-only; later calls only post the transitions."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        result = transition_issue('TEST-1', 'Done', comment='Shipped', multi_hop=True)
+
+        self.assertEqual(
+            [call[0][1] for call in self.mock_jira.transition_issue.call_args_list], ['11', '21', '31']
+        )
+        # Only the final transition carries the comment
+        comments = [call[1]['comment'] for call in self.mock_jira.transition_issue.call_args_list]
+        self.assertEqual(comments, [None, None, 'Shipped'])
+        self.assertEqual(result['details']['new_status'], 'Done')
+        self.assertEqual(
+            [(step['from'], step['to']) for step in result['details']['path']],
+            [('Backlog', 'Selected'), ('Selected', 'In Progress'), ('In Progress', 'Done')]
+        )
+        # The new status comes from the transitions, so the issue is not fetched again
+        self.mock_jira.issue.assert_called_once_with('TEST-1')
+
+        # Second call: the cached graph makes every lookup unnecessary
+        self.mock_jira.reset_mock()
+        transition_issue('TEST-1', 'Done', multi_hop=True)
+        self.mock_jira.transitions.assert_not_called()
+        self.mock_jira.search_issues.assert_not_called()
+        self.assertEqual(self.mock_jira.transition_issue.call_count, 3)
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_stale_transition_is_reloaded(self, mock_initialize_jira):
+        """A cached transition rejected by JIRA is replaced by a fresh transitions response."""
+        mock_initialize_jira.return_value = self.mock_jira
+        transition_issue('TEST-1', 'Selected')
+
+        # The workflow changed: the transition to Selected now has a new id
+        original = WORKFLOW['Backlog']
+        WORKFLOW['Backlog'] = [('99', 'Select', 'Selected')]
+        self.addCleanup(WORKFLOW.__setitem__, 'Backlog', original)
+        self.mock_jira.transition_issue.side_effect = [JIRAError(status_code=400, text='invalid'), None]
+
+        result = transition_issue('TEST-1', 'Selected')
+
+        self.assertEqual(self.mock_jira.transition_issue.call_args[0][1], '99')
+        self.assertEqual(result['details']['new_status'], 'Selected')
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_unreachable_status(self, mock_initialize_jira):
+        """A status missing from the discovered workflow is reported without moving the issue."""
+        mock_initialize_jira.return_value = self.mock_jira
+
+        with self.assertRaises(ValueError) as context:
+            transition_issue('TEST-1', 'Archived', multi_hop=True)
+        self.assertIn('No path', str(context.exception))
+        self.mock_jira.transition_issue.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
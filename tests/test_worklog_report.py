@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Test the worklog_report tool."""
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+import logging
+from benchmarks.fake_jira import FakeJiraServer
+from src.http_hooks import RateLimiter
+from src.tools import worklogs
+from src.tools.worklogs import worklog_report
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestWorklogReport(unittest.TestCase):
+    """Test cases for worklog_report against the fake JIRA server."""
+
+    def setUp(self):
+        self.server = FakeJiraServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        environment = patch.dict(os.environ, {
+            'JIRA_SERVER': self.server.url, 'JIRA_EMAIL': 'test@example.com', 'JIRA_API_TOKEN': 'token'
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        limiter = patch('src.http_hooks._limiter', RateLimiter(0))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.state = self.server.state
+
+        epic = self.state.add_issue('DEMO', summary='Checkout', issue_type='Epic')
+        self.story = self.state.add_issue('DEMO', summary='Pay by card', issue_type='Story', parent=epic['key'])
+        subtask = self.state.add_issue('DEMO', summary='Card form', issue_type='Sub-task', parent=self.story['key'])
+        self.epic = epic['key']
+        self.first = self.state.add_worklog(self.story['key'], self.day(4), 2 * 3600, author='user-1')
+        self.state.add_worklog(subtask['key'], self.day(6), 3 * 3600, author='user-2')
+        self.state.add_worklog('PRJ1-1', self.day(12), 3600, author='user-1')
+        # Outside the reported range
+        self.state.add_worklog('PRJ1-1', self.day(20), 3600, author='user-1')
+
+    def day(self, number):
+        return datetime(2024, 3, number, 9, 30, tzinfo=timezone.utc)
+
+    def test_weekly_hours_per_user_and_epic(self):
+        """Worklogs are grouped by user or epic (a sub-task counts towards its story's epic) per week."""
+        by_user = worklog_report('2024-03-04', '2024-03-17')['details']
+        self.assertEqual(by_user['periods'], ['2024-03-04', '2024-03-11'])
+        self.assertEqual(by_user['groups'], [
+            {'user': 'User 1', 'total_hours': 3.0, 'hours': [2.0, 1.0]},
+            {'user': 'User 2', 'total_hours': 3.0, 'hours': [3.0, 0.0]},
+        ])
+        self.assertEqual(by_user['synced'], {'updated': 4, 'deleted': 0})
+
+        by_epic = worklog_report('2024-03-04', '2024-03-17', group_by='epic', period='month')['details']
+        self.assertEqual(by_epic['periods'], ['2024-03'])
+        self.assertEqual([(g['epic'], g['total_hours']) for g in by_epic['groups']],
+                         [(self.epic, 5.0), ('No epic', 1.0)])
+
+        demo = worklog_report('2024-03-01', '2024-03-31', group_by='project', project='demo')['details']
+        self.assertEqual([(g['project'], g['total_hours']) for g in demo['groups']], [('DEMO', 5.0)])
+
+    def test_repeat_reports_fetch_only_changes(self):
+        """Later reports read only worklogs updated or deleted since the previous one."""
+        worklog_report('2024-03-04', '2024-03-17')
+        self.state.add_worklog(self.story['key'], self.day(5), 1800, author='user-2')
+        self.state.delete_worklog(self.first['id'])
+
+        self.server.reset_stats()
+        details = worklog_report('2024-03-04', '2024-03-17', group_by='issue')['details']
+        self.assertEqual(details['synced'], {'updated': 1, 'deleted': 1})
+        self.assertEqual(details['total_hours'], 4.5)
+        stats = self.server.stats()
+        self.assertEqual(stats['POST worklog/list']['calls'], 1)
+        self.assertLess(stats['POST worklog/list']['bytes_out'], 1000)
+
+        self.server.reset_stats()
+        worklog_report('2024-03-04', '2024-03-17')
+        self.assertNotIn('POST worklog/list', self.server.stats())
+        self.assertNotIn('GET search', self.server.stats())
+
+        with self.assertRaises(ValueError):
+            worklog_report('last week')
+
+    def test_first_sync_starts_at_start_date(self):
+        """Worklogs updated before the first report's start are not read until a report reaches back to them."""
+        old = self.state.add_worklog(self.story['key'], datetime(2023, 6, 1, 9, 0, tzinfo=timezone.utc), 3600)
+        with self.state.lock:
+            old['updated'] = datetime(2023, 6, 1, 17, 0, tzinfo=timezone.utc)
+
+        details = worklog_report('2024-03-04', '2024-03-17')['details']
+        self.assertEqual(details['synced'], {'updated': 4, 'deleted': 0})
+
+        self.server.reset_stats()
+        details = worklog_report('2023-06-01', '2024-03-17')['details']
+        self.assertEqual(details['synced'], {'updated': 1, 'deleted': 0})
+        self.assertEqual(details['total_hours'], 7.0)
+        self.assertEqual(self.server.stats()['POST worklog/list']['calls'], 1)
+
+    def test_failed_sync_keeps_its_progress(self):
+        """Pages stored before a failure are not fetched again by the next report."""
+        fetch = worklogs._fetch_worklogs
+        calls = []
+
+        def fail_second_page(jira, ids):
+            calls.append(ids)
+            if len(calls) == 2:
+                raise ConnectionError('Connection reset')
+            return fetch(jira, ids)
+
+        # Pages end at a worklog's update time, so give every worklog its own
+        with self.state.lock:
+            for offset, worklog in enumerate(self.state.worklogs.values()):
+                worklog['updated'] = datetime(2024, 3, 20, 12, offset, tzinfo=timezone.utc)
+
+        with patch('benchmarks.fake_jira.WORKLOG_PAGE_SIZE', 2):
+            with patch('src.tools.worklogs._fetch_worklogs', fail_second_page):
+                with self.assertRaises(ConnectionError):
+                    worklog_report('2024-03-04', '2024-03-17')
+            details = worklog_report('2024-03-04', '2024-03-17')['details']
+        self.assertEqual(details['synced'], {'updated': 2, 'deleted': 0})
+        self.assertEqual(details['total_hours'], 6.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
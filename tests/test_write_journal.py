@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Test the write-behind journal, deferred add_comment and write_status."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from jira.exceptions import JIRAError
+from src.journal import LEASE_SECONDS, WriteJournal, drain_once, journal_path
+from src.stores import open_store
+from src.stores.watermarks import WatermarkStore
+from src.tools.issues import add_comment
+from src.tools.stats import write_status
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+class TestWriteJournal(unittest.TestCase):
+    """Test cases for deferred writes."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'writes.sqlite3')
+        self.journal = WriteJournal(self.path)
+        self.addCleanup(self.journal.close)
+
+        self.posted = []
+        self.mock_jira = MagicMock()
+        self.mock_jira.add_comment.side_effect = self.post_comment
+
+    def post_comment(self, issue_key, body):
+        """Record the comment and return a comment resource."""
+        self.posted.append((issue_key, body))
+        return MagicMock(id=str(len(self.posted)))
+
+    def test_drain_keeps_issue_order(self):
+        """Writes are performed in journal order within an issue and their results are kept."""
+        first = self.journal.enqueue('comment', 'test-1', {'body': 'first'})
+        self.journal.enqueue('comment', 'TEST-2', {'body': 'other'})
+        self.journal.enqueue('comment', 'TEST-1', {'body': 'second'})
+
+        self.assertEqual(drain_once(self.journal, self.mock_jira), 3)
+
+        self.assertEqual([body for key, body in self.posted if key == 'TEST-1'], ['first', 'second'])
+        self.assertEqual(self.journal.counts()['done'], 3)
+        self.assertIn('comment_id', self.journal.item(first)['result'])
+
+    def test_transient_failure_is_retried_in_order(self):
+        """A transient failure is retried later and holds back the later writes of its issue only."""
+        first = self.journal.enqueue('comment', 'TEST-1', {'body': 'first'})
+        second = self.journal.enqueue('comment', 'TEST-1', {'body': 'second'})
+        self.journal.enqueue('comment', 'TEST-2', {'body': 'other'})
+
+        def flaky(issue_key, body):
+            if body == 'first':
+                raise JIRAError(status_code=503, text='Service Unavailable')
+            return self.post_comment(issue_key, body)
+        self.mock_jira.add_comment.side_effect = flaky
+
+        drain_once(self.journal, self.mock_jira)
+
+        self.assertEqual(self.posted, [('TEST-2', 'other')])
+        item = self.journal.item(first)
+        self.assertEqual((item['state'], item['attempts']), ('pending', 1))
+        self.assertEqual(item['last_error'], 'Service Unavailable')
+        self.assertEqual(self.journal.item(second)['state'], 'pending')
+
+        # Nothing of TEST-1 is due before the first write's backoff has passed
+        self.assertEqual(self.journal.claim(10), [])
+
+    def test_permanent_failure(self):
+        """A client error fails the write at once; it can be queued again."""
+        receipt = self.journal.enqueue('comment', 'GONE-1', {'body': 'hello'})
+        self.mock_jira.add_comment.side_effect = JIRAError(status_code=404, text='Issue does not exist')
+
+        drain_once(self.journal, self.mock_jira)
+
+        self.assertEqual(self.journal.item(receipt)['state'], 'failed')
+        self.assertEqual(self.journal.retry_failed(), 1)
+        self.assertEqual(self.journal.item(receipt)['state'], 'pending')
+
+    def test_survives_restart(self):
+        """Writes claimed but not finished before a restart are due again once their lease expires."""
+        receipt = self.journal.enqueue('comment', 'TEST-1', {'body': 'hello'})
+        self.assertEqual(len(self.journal.claim(10)), 1)
+        self.journal.close()
+
+        later = time.time() + LEASE_SECONDS + 1
+        with patch('src.journal.time.time', return_value=later):
+            reopened = WriteJournal(self.path)
+            self.addCleanup(reopened.close)
+            self.assertEqual(reopened.item(receipt)['state'], 'pending')
+            drain_once(reopened, self.mock_jira)
+        self.assertEqual(self.posted, [('TEST-1', 'hello')])
+
+    def test_claims_are_exclusive_across_processes(self):
+        """A second journal on the same file neither takes back nor claims a write another one is sending."""
+        receipt = self.journal.enqueue('comment', 'TEST-1', {'body': 'hello'})
+        self.assertEqual([write['receipt'] for write in self.journal.claim(10)], [receipt])
+
+        other = WriteJournal(self.path)
+        self.addCleanup(other.close)
+        self.assertEqual(other.item(receipt)['state'], 'in_flight')
+        self.assertEqual(other.claim(10), [])
+        # Only the owner can give the write back
+        other.release(other.item(receipt)['id'])
+        self.assertEqual(other.item(receipt)['state'], 'in_flight')
+
+        # Once the lease expires, e.g. because the first process died, the write is due again
+        with patch('src.journal.time.time', return_value=time.time() + LEASE_SECONDS + 1):
+            self.assertEqual([write['receipt'] for write in other.claim(10)], [receipt])
+        self.assertEqual(self.journal.claim(10), [])
+
+    def test_state_is_private(self):
+        """By default the journal and stores live in a per-user state directory only their owner can read."""
+        home = os.path.join(self.directory, 'xdg')
+        with patch.dict(os.environ, {'XDG_STATE_HOME': home}):
+            os.environ.pop('JIRA_MCP_STATE_DIR', None)
+            os.environ.pop('JIRA_MCP_JOURNAL', None)
+            path = journal_path()
+            journal = WriteJournal(path)
+            self.addCleanup(journal.close)
+            store = open_store(WatermarkStore)
+
+        state = os.path.join(home, 'jira-mcp')
+        self.assertEqual(os.path.dirname(path), state)
+        self.assertEqual(os.path.dirname(store.path), state)
+        self.assertEqual(os.stat(state).st_mode & 0o777, 0o700)
+        for name in (path, store.path):
+            self.assertEqual(os.stat(name).st_mode & 0o777, 0o600)
+
+    @patch('src.tools.issues.initialize_jira')
+    def test_deferred_add_comment(self, mock_initialize_jira):
+        """A deferred comment returns a receipt without contacting JIRA and shows up in write_status."""
+        with patch('src.journal._journal', self.journal), patch('src.journal._worker', MagicMock()) as worker:
+            result = add_comment('TEST-1', 'Deployed', deferred=True)
+
+            mock_initialize_jira.assert_not_called()
+            worker.notify.assert_called_once()
+            self.assertEqual(result['status'], 'queued')
+            receipt = result['details']['receipt']
+
+            status = write_status()
+            self.assertEqual(status['details']['counts']['pending'], 1)
+            self.assertEqual(status['details']['items'][0]['receipt'], receipt)
+
+            drain_once(self.journal, self.mock_jira)
+            status = write_status(receipt=receipt)
+            self.assertEqual(status['details']['state'], 'done')
+            self.assertEqual(status['details']['result'], {'comment_id': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()